@@ -0,0 +1,113 @@
+"""마감 직전 명령어 폭주 벤치마크 (입장 제어 있음 / 없음)
+
+유저 N명이 몇 초 안에 !인증 을 보내는 상황을 흉내 냅니다. 명령어 하나는 실제처럼
+Firestore 호출 3번(executor 스레드에서 블로킹), GitHub 호출 1번(네트워크 대기), 응답 파싱(이벤트 루프 CPU)을 합니다.
+요청별 응답 시간 백분위수와, 게이트웨이 하트비트가 밀리는 정도를 보여주는 이벤트 루프 지연 최대값을 비교합니다.
+
+    python bench/admission.py --users 200 --burst 2
+    python bench/admission.py --users 200 --limit 16 --workers 8 --duplicates 0
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commitbot.admission import Admission, Rejected  # noqa: E402
+
+
+class FakeCommand:
+    qualified_name = "인증"
+    extras = {"heavy": True}
+
+
+class FakeAuthor:
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class FakeContext:
+    prefix = "!"
+    command = FakeCommand()
+
+    def __init__(self, user_id):
+        self.author = FakeAuthor(user_id)
+
+    async def send(self, content, **_):
+        await asyncio.sleep(0.001)
+
+
+async def certify(args, rng):
+    loop = asyncio.get_running_loop()
+    for _ in range(3):
+        await loop.run_in_executor(None, time.sleep, args.db_ms / 1000)
+    await asyncio.sleep(rng.uniform(0.5, 1.5) * args.github_ms / 1000)
+    deadline = time.perf_counter() + args.cpu_ms / 1000
+    while time.perf_counter() < deadline:  # 응답 JSON 파싱·임베드 생성
+        pass
+
+
+async def watch_lag(stop, lags):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + 0.01
+        await asyncio.sleep(0.01)
+        lags.append(loop.time() - expected)
+
+
+async def run(args, limit):
+    rng = random.Random(args.seed)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=args.workers))
+    admission = Admission(limit, args.users) if limit else None
+    latencies, lags, stop = [], [], asyncio.Event()
+    watcher = asyncio.create_task(watch_lag(stop, lags))
+
+    async def request(user_id, delay):
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        try:
+            if admission is None:
+                await certify(args, rng)
+            else:
+                async with admission.slot(FakeContext(user_id)):
+                    await certify(args, rng)
+        except Rejected:
+            return
+        latencies.append(time.perf_counter() - started)
+
+    # 일부는 응답이 늦다고 느껴 한 번 더 보냄 (중복)
+    arrivals = [(uid, rng.uniform(0, args.burst)) for uid in range(args.users)]
+    arrivals += [(uid, delay + 0.3) for uid, delay in arrivals if rng.random() < args.duplicates]
+    await asyncio.gather(*(request(uid, delay) for uid, delay in arrivals))
+    stop.set()
+    await watcher
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000  # noqa: E731
+    label = f"제한 {limit}" if limit else "제한 없음"
+    print(f"{label:<8} 처리 {len(latencies):>4}건 / 요청 {len(arrivals):>4}건  "
+          f"p50 {pick(0.5):7.0f}ms  p95 {pick(0.95):7.0f}ms  p99 {pick(0.99):7.0f}ms  루프 지연 최대 {max(lags) * 1000:5.0f}ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--users", type=int, default=200)
+    arg_parser.add_argument("--burst", type=float, default=2.0, help="요청이 몰리는 시간(초)")
+    arg_parser.add_argument("--limit", type=int, default=32, help="동시에 실행할 무거운 명령어 수 (HEAVY_COMMAND_LIMIT)")
+    arg_parser.add_argument("--workers", type=int, default=8, help="Firestore executor 스레드 수")
+    arg_parser.add_argument("--db-ms", type=float, default=40)
+    arg_parser.add_argument("--github-ms", type=float, default=300)
+    arg_parser.add_argument("--cpu-ms", type=float, default=4)
+    arg_parser.add_argument("--duplicates", type=float, default=0.3, help="한 번 더 보내는 유저 비율")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+    for limit in (0, args.limit):
+        asyncio.run(run(args, limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""시뮬레이션용 메모리 Firestore
+
+봇이 쓰는 만큼만 흉내 냅니다: document get/set/update/delete, 점(.) 경로 update, Increment,
+DELETE_FIELD, last_update_time 조건부 쓰기, where / order_by / start_after / limit / select, get_all, batch, 하위 컬렉션.
+down 을 켜면 모든 읽기·쓰기가 실제 연결 장애처럼 ServiceUnavailable 을 냅니다.
+읽고 쓸 때마다 deepcopy 해서 실제처럼 스냅샷과 저장본이 서로 영향을 주지 않게 합니다.
+"""
+import copy
+import operator
+import threading
+import uuid
+
+from google.api_core.exceptions import FailedPrecondition, ServiceUnavailable
+from google.cloud.firestore import DELETE_FIELD, Increment
+
+OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+
+_MISSING = object()
+
+
+def get_path(data, path):
+    for key in path.split("."):
+        if not isinstance(data, dict) or key not in data:
+            return _MISSING
+        data = data[key]
+    return data
+
+
+def set_path(data, path, value):
+    *parents, last = path.split(".")
+    for key in parents:
+        data = data.setdefault(key, {})
+    current = data.get(last)
+    if value is DELETE_FIELD:
+        data.pop(last, None)
+    elif isinstance(value, Increment):
+        data[last] = (current or 0) + value._value
+    else:
+        data[last] = copy.deepcopy(value)
+
+
+def merge_into(data, values):
+    """set(merge=True): 맵은 키 단위로 합치고 나머지는 덮어씀"""
+    for key, value in values.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            merge_into(data[key], value)
+        elif value is DELETE_FIELD:
+            data.pop(key, None)
+        else:
+            data[key] = copy.deepcopy(value)
+
+
+def project(data, field_paths):
+    if field_paths is None:
+        return copy.deepcopy(data)
+    result = {}
+    for path in field_paths:
+        value = get_path(data, path)
+        if value is not _MISSING:
+            set_path(result, path, value)
+    return result
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data, update_time=None):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.update_time = update_time
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return self._data
+
+    def get(self, path):
+        value = get_path(self._data or {}, path)
+        if value is _MISSING:
+            raise KeyError(path)
+        return value
+
+
+class FakeDocument:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def get(self, field_paths=None, **_):
+        self._db.check_up()
+        with self._db.lock:
+            self._db.reads += 1
+            data = self._db.docs.get(self.path)
+            return FakeSnapshot(self, None if data is None else project(data, field_paths), self._db.update_times.get(self.path))
+
+    def check(self, option):
+        if option is not None and self._db.update_times.get(self.path) != option:
+            raise FailedPrecondition(f"{self.path} was modified")
+
+    def set(self, data, merge=False):
+        self._db.check_up()
+        with self._db.lock:
+            self._db.writes += 1
+            doc = self._db.docs.get(self.path, {}) if merge else {}
+            if merge:
+                merge_into(doc, data)
+            else:
+                for key, value in data.items():
+                    set_path(doc, key, value)
+            self._db.docs[self.path] = doc
+            self._db.touch(self.path)
+
+    def update(self, data, option=None):
+        self._db.check_up()
+        with self._db.lock:
+            self.check(option)
+            self._db.writes += 1
+            if self.path not in self._db.docs:
+                raise KeyError(f"No document to update: {self.path}")
+            doc = self._db.docs[self.path]
+            for path, value in data.items():
+                set_path(doc, path, value)
+            self._db.touch(self.path)
+
+    def delete(self):
+        self._db.check_up()
+        with self._db.lock:
+            self._db.writes += 1
+            self._db.docs.pop(self.path, None)
+            self._db.update_times.pop(self.path, None)
+
+    def collection(self, name):
+        return FakeQuery(self._db, f"{self.path}/{name}")
+
+
+class FakeQuery:
+    def __init__(self, db, path, filters=(), orders=(), cursor=None, count=None, fields=None):
+        self._db = db
+        self._path = path
+        self._filters = filters
+        self._orders = orders
+        self._cursor = cursor
+        self._count = count
+        self._fields = fields
+
+    def _replace(self, **changes):
+        state = dict(filters=self._filters, orders=self._orders, cursor=self._cursor, count=self._count, fields=self._fields)
+        state.update(changes)
+        return FakeQuery(self._db, self._path, **state)
+
+    def document(self, doc_id=None):
+        return FakeDocument(self._db, f"{self._path}/{doc_id or uuid.uuid4().hex[:20]}")
+
+    def where(self, field_path=None, op_string=None, value=None, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._replace(filters=self._filters + ((field_path, OPS[op_string], value),))
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        return self._replace(orders=self._orders + ((field_path, direction == "DESCENDING"),))
+
+    def start_after(self, snapshot):
+        return self._replace(cursor=snapshot)
+
+    def limit(self, count):
+        return self._replace(count=count)
+
+    def select(self, field_paths):
+        return self._replace(fields=list(field_paths))
+
+    def stream(self, **_):
+        self._db.check_up()
+        with self._db.lock:
+            prefix = self._path + "/"
+            items = [(path, data) for path, data in self._db.docs.items()
+                     if path.startswith(prefix) and "/" not in path[len(prefix):]]
+            for field, op, value in self._filters:
+                items = [(p, d) for p, d in items if (v := get_path(d, field)) is not _MISSING and op(v, value)]
+            items.sort(key=lambda item: item[0])
+            for field, descending in reversed(self._orders):
+                items.sort(key=lambda item: get_path(item[1], field), reverse=descending)
+            if self._cursor is not None:
+                paths = [p for p, _ in items]
+                cursor_path = self._cursor.reference.path
+                items = items[paths.index(cursor_path) + 1:] if cursor_path in paths else []
+            if self._count is not None:
+                items = items[:self._count]
+            self._db.reads += max(1, len(items))
+            return [FakeSnapshot(FakeDocument(self._db, p), project(d, self._fields), self._db.update_times.get(p)) for p, d in items]
+
+    def get(self, **kwargs):
+        return self.stream(**kwargs)
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append((ref.set, (data, merge)))
+
+    def update(self, ref, data, option=None):
+        self._ops.append((ref.update, (data, option)))
+
+    def delete(self, ref):
+        self._ops.append((ref.delete, ()))
+
+    def commit(self):
+        self._db.check_up()
+        with self._db.lock:
+            # 조건이 하나라도 어긋나면 아무것도 쓰지 않음
+            for func, args in self._ops:
+                if func.__name__ == "update":
+                    func.__self__.check(args[1])
+            for func, args in self._ops:
+                func(*args)
+        self._ops = []
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.docs = {}  # "users/123" -> dict
+        self.update_times = {}  # 경로 -> 마지막으로 쓴 순번 (last_update_time 조건 비교용)
+        self.clock = 0
+        self.lock = threading.RLock()
+        self.reads = 0
+        self.writes = 0
+        self.down = False
+
+    def check_up(self):
+        if self.down:
+            raise ServiceUnavailable("firestore is unavailable")
+
+    def collection(self, name):
+        return FakeQuery(self, name)
+
+    def get_all(self, refs, field_paths=None):
+        # 실제 get_all 도 넘긴 순서를 보장하지 않으므로 일부러 거꾸로 돌려줌
+        return [ref.get(field_paths=field_paths) for ref in reversed(refs)]
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def write_option(self, last_update_time):
+        return last_update_time
+
+    def touch(self, path):
+        self.clock += 1
+        self.update_times[path] = self.clock
+
+    def dump(self, prefix=""):
+        with self.lock:
+            return {p: copy.deepcopy(d) for p, d in self.docs.items() if p.startswith(prefix)}
@@ -0,0 +1,66 @@
+"""인증 기록 저장 형식 비교 벤치마크 (예전 history 맵 vs 압축 hist)
+
+같은 기록을 두 형식으로 만들어 Firestore 문서(protobuf)로 인코딩했을 때의 크기와,
+클라이언트가 응답을 파이썬 딕셔너리로 디코딩하는 시간, 그 뒤 stats 를 계산하는 시간을 잽니다.
+
+    python bench/history_encoding.py                 # 1년치
+    python bench/history_encoding.py --days 1000 --runs 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.cloud.firestore_v1 import _helpers  # noqa: E402
+from google.cloud.firestore_v1.types import Document  # noqa: E402
+
+from commitbot.history import load_history, pack  # noqa: E402
+from commitbot.stats import rebuild_stats  # noqa: E402
+
+
+def sample_history(days, seed):
+    rng = random.Random(seed)
+    start = date(2026, 1, 1) - timedelta(days=days)
+    history = {}
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5 or rng.random() < 0.1:
+            continue
+        commits = rng.choice([0, 1, 1, 2, 3, 5, 8])
+        history[day.isoformat()] = {"commits": commits, "passed": commits >= 1}
+    return history
+
+
+def measure(doc, runs):
+    pb = Document(fields=_helpers.encode_dict(doc))
+    started = time.perf_counter()
+    for _ in range(runs):
+        decoded = _helpers.decode_dict(pb.fields, None)
+    decode = (time.perf_counter() - started) / runs
+    started = time.perf_counter()
+    for _ in range(runs):
+        rebuild_stats(load_history(decoded))
+    stats = (time.perf_counter() - started) / runs
+    return Document.pb(pb).ByteSize(), decode, stats
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--days", type=int, default=365)
+    arg_parser.add_argument("--runs", type=int, default=200)
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    history = sample_history(args.days, args.seed)
+    print(f"📅 {args.days}일 중 기록 {len(history)}건")
+    for name, doc in (("history 맵", {"history": history}), ("압축 hist", {"hist": pack(history)})):
+        size, decode, stats = measure(doc, args.runs)
+        print(f"{name:<10} 인코딩 {size:>7,}B  디코딩 {decode * 1000:7.3f}ms  stats 계산 {stats * 1000:7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
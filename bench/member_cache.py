@@ -0,0 +1,115 @@
+"""멤버 캐시 설정에 따른 메모리(RSS)와 준비 시간(time-to-ready) 비교 벤치마크
+
+디스코드에 접속하지 않고, 가짜 GUILD_CREATE / GUILD_MEMBERS_CHUNK 페이로드를
+discord.py의 ConnectionState에 직접 흘려 넣어 측정합니다.
+
+    python bench/member_cache.py --members 50000
+    python bench/member_cache.py --members 50000 --chunk-latency 0.05
+
+각 모드는 서로 영향을 주지 않도록 별도의 프로세스에서 실행됩니다.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import subprocess
+import sys
+import time
+
+CHUNK_SIZE = 1000  # 디스코드가 GUILD_MEMBERS_CHUNK 하나에 담아 보내는 최대 멤버 수
+GUILD_ID = 1
+SELF_ID = 2
+
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def member_payload(user_id):
+    return {
+        "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None},
+        "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0,
+    }
+
+
+def guild_payload(member_count):
+    # 큰 길드는 GUILD_CREATE에 봇 자신 정도만 담겨 오고, 나머지는 청크로 받아야 함
+    return {
+        "id": str(GUILD_ID), "name": "bench", "member_count": member_count, "large": True,
+        "members": [member_payload(SELF_ID)], "channels": [], "threads": [], "emojis": [], "stickers": [],
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False}],
+        "features": [], "premium_tier": 0, "verification_level": 0, "default_message_notifications": 0,
+        "explicit_content_filter": 0, "mfa_level": 0, "nsfw_level": 0, "owner_id": str(SELF_ID),
+    }
+
+
+async def run_mode(mode, members, chunk_latency):
+    import discord
+    from discord.state import ChunkRequest
+
+    lean = mode == "lean"
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = not lean
+    options = {"intents": intents}
+    if lean:
+        options.update(member_cache_flags=discord.MemberCacheFlags.none(), chunk_guilds_at_startup=False)
+    client = discord.Client(**options)
+    state = client._connection
+    state.loop = asyncio.get_running_loop()
+    state.user = discord.ClientUser(state=state, data=member_payload(SELF_ID)["user"])
+
+    gc.collect()
+    rss_before = rss_kb()
+    started = time.perf_counter()
+
+    guild = state._add_guild_from_data(guild_payload(members))
+    if state._guild_needs_chunking(guild):
+        request = ChunkRequest(guild.id, 0, state.loop, state._get_guild, cache=state.member_cache_flags.joined)
+        state._chunk_requests[request.nonce] = request
+        chunk_count = -(-members // CHUNK_SIZE)
+        for index in range(chunk_count):
+            ids = range(10 + index * CHUNK_SIZE, 10 + min(members, (index + 1) * CHUNK_SIZE))
+            state.parse_guild_members_chunk({
+                "guild_id": str(GUILD_ID), "members": [member_payload(i) for i in ids],
+                "chunk_index": index, "chunk_count": chunk_count, "nonce": request.nonce,
+            })
+            if chunk_latency:
+                await asyncio.sleep(chunk_latency)
+
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    return {
+        "mode": mode, "members": members, "cached_members": len(guild.members),
+        "time_to_ready_ms": round(elapsed * 1000, 1), "rss_delta_mb": round((rss_kb() - rss_before) / 1024, 1),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--members", type=int, default=50000)
+    arg_parser.add_argument("--chunk-latency", type=float, default=0.0, help="청크 하나당 가정할 게이트웨이 지연(초)")
+    arg_parser.add_argument("--mode", choices=["default", "lean"])
+    args = arg_parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(asyncio.run(run_mode(args.mode, args.members, args.chunk_latency))))
+        return
+
+    for mode in ("default", "lean"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--members", str(args.members), "--chunk-latency", str(args.chunk_latency)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(out)
+        print(f"{result['mode']:>8}: 캐시된 멤버 {result['cached_members']:>7}명, "
+              f"준비 시간 {result['time_to_ready_ms']:>8}ms, RSS 증가 {result['rss_delta_mb']:>6}MB")
+
+
+if __name__ == "__main__":
+    main()
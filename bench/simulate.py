@@ -0,0 +1,684 @@
+"""시간 가속 시뮬레이션
+
+가짜 시계(commitbot.clock), 메모리 Firestore(bench/fakestore.py), 가짜 GitHub 세션으로
+실제 명령어 핸들러(!등록 / !인증 / !체크 / !휴가 / !복귀)와 예약 작업(daily_check / weekly_reset / compact_log)을
+몇 주 ~ 몇 달치 돌립니다. 중간중간 오늘 커밋을 하나로 합치는 force-push 도 섞고, 일부 유저는 여러 레포 합산 모드(이벤트 피드)로 셉니다. 예약 작업은 실제처럼 1분마다 호출되고, 작업 안의 요일·시각 조건이 그대로 적용됩니다.
+주마다 GitHub 장애와 (다른 날) Firestore 장애가 한 번씩 있어, 재시도 큐와 로컬 스냅샷·쓰기 대기열 경로도 함께 검증합니다.
+
+끝나면 독립적으로 계산한 기대값과 유저별 history / weekly_fail / total_fail / stats, 매일·매주 발표 내용을
+비교하고(이벤트 로그 재생 결과 포함), 예약 작업 처리량을 출력합니다.
+
+    python bench/simulate.py --users 200 --weeks 8
+    python bench/simulate.py --users 1000 --weeks 4 --seed 7 --start 2026-03-05
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fakestore import FakeFirestore  # noqa: E402
+
+from commitbot import config, snapshot, storage  # noqa: E402
+from commitbot.clock import clock  # noqa: E402
+from commitbot.cogs.admin import Admin  # noqa: E402
+from commitbot.cogs.certify import Certify  # noqa: E402
+from commitbot.cogs.reports import Reports  # noqa: E402
+from commitbot.config import KST, REPORT_CHANNEL_ID  # noqa: E402
+from commitbot.events import verify_all  # noqa: E402
+from commitbot.github import to_github_time  # noqa: E402
+from commitbot.history import load_history  # noqa: E402
+from commitbot.retry import RETRY_MAX_ATTEMPTS, day_end, retry_delay  # noqa: E402
+from commitbot.stats import rebuild_stats  # noqa: E402
+
+CHANNEL_ID = 555  # 유저가 명령어를 치는 채널
+MENTION_PATTERN = re.compile(r"<@(\d+)>")
+WEEKLY_COUNT_PATTERN = re.compile(r"누적 \*\*(\d+)\*\*회")
+DAILY_DATE_PATTERN = re.compile(r"\*\*\[(\d{4}-\d{2}-\d{2})\]")
+LATE_FAIL_PATTERN = re.compile(r"\[(\d{4}-\d{2}-\d{2})\] 추가 기각:\*\* <@(\d+)>")
+
+
+# --- 가짜 GitHub ---
+
+class FakeStream:
+    def __init__(self, body):
+        self._body = body
+
+    async def read(self, n=-1):
+        return self._body if n < 0 else self._body[:n]
+
+
+class FakeResponse:
+    def __init__(self, status, data, headers=None):
+        self.status = status
+        self._data = data
+        self.headers = headers or {}
+        self.content = FakeStream(json.dumps(self._data).encode())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self._data
+
+    async def text(self):
+        return json.dumps(self._data)
+
+
+class FakeGitHub:
+    """레포별 커밋 시각 목록을 들고 있다가, clock.now() 까지 만들어진 커밋만 보여줌
+
+    커밋마다 같은 시각의 PushEvent 도 남겨 /users/{id}/events 피드(최신순, 최대 300건, ETag 조건부 요청)로 보여줌.
+    force-push 로 사라진 커밋의 push 도 실제처럼 피드에는 남음.
+    병합한 브랜치 커밋은 committer 시각보다 늦게(병합 커밋을 push 할 때) 보이기 시작함."""
+
+    def __init__(self):
+        self.commits = defaultdict(list)  # "id/repo" -> [(KST datetime, sha)] (오름차순)
+        self.pushes = defaultdict(list)  # "id" -> [(KST datetime, "id/repo", sha)]
+        self.outages = []  # [(시작, 끝)] 동안 커밋·이벤트 조회가 502
+        self.requests = 0
+        self.failed = 0
+        self.not_modified = 0  # 304 로 응답한 조건부 요청 수
+        self.items = 0  # 응답으로 내려준 커밋·이벤트 수
+        self.next_sha = 0
+        self.pushed_at = {}  # sha -> push 된 시각 (committer 시각과 다를 때만)
+        self.merges = set()  # 병합 커밋 sha
+
+    def add_commit(self, repo, when, pushed=None):
+        self.next_sha += 1
+        sha = f"{self.next_sha:040x}"
+        self.commits[repo].append((when, sha))
+        self.pushes[repo.split("/")[0]].append((pushed or when, repo, sha))
+        if pushed:
+            self.pushed_at[sha] = pushed
+        return sha
+
+    def visible(self, sha, when, now):
+        return self.pushed_at.get(sha, when) <= now
+
+    def merge_branch(self, repo, now, times):
+        """committer 시각이 now 보다 이른 브랜치 커밋들을 병합 커밋과 함께 now 에 push"""
+        for when in times:
+            self.add_commit(repo, when, pushed=now)
+        self.merges.add(self.add_commit(repo, now))
+        self.commits[repo].sort()
+        self.pushes[repo.split("/")[0]].sort()
+
+    def push_again(self, repo, when):
+        """마지막 커밋을 다른 곳(포크 등)에 한 번 더 push"""
+        self.pushes[repo.split("/")[0]].append((when, repo + "-fork", self.commits[repo][-1][1]))
+
+    def squash_today(self, repo, now):
+        """오늘 이미 올라온 커밋들을 커밋 하나로 합쳐 force-push"""
+        keep = [(when, sha) for when, sha in self.commits[repo] if not self.visible(sha, when, now) or when.date() != now.date()]
+        self.commits[repo] = keep
+        self.add_commit(repo, now)
+        self.commits[repo].sort()
+        self.pushes[repo.split("/")[0]].sort()
+
+    def is_down(self, now):
+        return any(start <= now < end for start, end in self.outages)
+
+    def get(self, url, headers=None):
+        self.requests += 1
+        parsed = urlparse(url)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        parts = parsed.path.strip("/").split("/")
+        if parts[-1] in ("commits", "events") and self.is_down(clock.now()):
+            self.failed += 1
+            return FakeResponse(502, {"message": "Server Error"})
+        if parts == ["rate_limit"]:
+            return FakeResponse(200, {"resources": {"core": {"remaining": 5000}}})
+        if len(parts) == 3 and parts[0] == "repos":
+            return FakeResponse(200, {"full_name": f"{parts[1]}/{parts[2]}"})
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] == "commits":
+            return FakeResponse(200, self.list_commits(f"{parts[1]}/{parts[2]}", query))
+        if len(parts) == 3 and parts[0] == "users" and parts[2] == "events":
+            events = self.list_events(parts[1], query)
+            etag = f'W/"{hash(tuple(e["id"] for e in events)) & 0xffffffff:08x}"'
+            if (headers or {}).get("If-None-Match") == etag:
+                self.not_modified += 1
+                return FakeResponse(304, None, {"ETag": etag})
+            self.items += len(events)
+            return FakeResponse(200, events, {"ETag": etag})
+        return FakeResponse(404, {"message": "Not Found"})
+
+    def list_commits(self, repo, query):
+        now = clock.now()
+        since = datetime.fromisoformat(query["since"].replace("Z", "+00:00")) if "since" in query else None
+        until = datetime.fromisoformat(query["until"].replace("Z", "+00:00")) if "until" in query else None
+        visible = [(when, sha) for when, sha in self.commits[repo]
+                   if self.visible(sha, when, now) and (since is None or when >= since) and (until is None or when <= until)]
+        visible.reverse()  # GitHub 은 최신순
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        self.items += len(visible[(page - 1) * per_page:page * per_page])
+        return [{"sha": sha, "commit": {"committer": {"date": when.astimezone(KST).isoformat()}},
+                 "parents": [{"sha": "0" * 40}] * (2 if sha in self.merges else 1)}
+                for when, sha in visible[(page - 1) * per_page:page * per_page]]
+
+    def list_events(self, github_id, query):
+        now = clock.now()
+        visible = [push for push in self.pushes[github_id] if push[0] <= now][-300:]
+        visible.reverse()
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        return [{"id": f"{github_id}-{when:%Y%m%d%H%M%S}-{sha[-8:]}-{repo}", "type": "PushEvent", "repo": {"name": repo},
+                 "created_at": to_github_time(when), "payload": {"head": sha, "commits": [{"sha": sha, "distinct": True}]}}
+                for when, repo, sha in visible[(page - 1) * per_page:page * per_page]]
+
+
+# --- 가짜 디스코드 ---
+
+class FakeAsset:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+
+class FakeMember:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.avatar = None
+        self.default_avatar = self.display_avatar = FakeAsset()
+
+
+class FakeTyping:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel:
+    id = CHANNEL_ID
+
+
+class FakeContext:
+    def __init__(self, author):
+        self.author = author
+        self.channel = FakeChannel()
+        self.prefix = "!"
+        self.sent = []
+
+    def typing(self):
+        return FakeTyping()
+
+    async def send(self, content=None, *, embed=None, **_):
+        self.sent.append(embed.description if embed is not None and embed.description else content)
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.messages = []
+
+    async def announce(self, channel_id, text):
+        self.messages.append((clock.now(), channel_id, text))
+
+    def reports(self):
+        return [(when, text) for when, channel_id, text in self.messages if channel_id == REPORT_CHANNEL_ID]
+
+
+class FakeHealth:
+    def __init__(self):
+        self.last_success = None  # 마지막으로 성공을 기록한 작업 이름
+
+    def job_succeeded(self, name):
+        self.last_success = name
+
+
+class FakeUser:
+    def __init__(self, bot, user_id):
+        self.bot = bot
+        self.id = user_id
+
+    async def send(self, content):
+        self.bot.dms.append((clock.now(), self.id, content))
+
+
+class FakeBot:
+    def __init__(self, session):
+        self.http_session = session
+        self.outbox = FakeOutbox()
+        self.health = FakeHealth()
+        self.draining = False
+        self.dms = []  # [(시각, 유저ID, 내용)]
+
+    def get_user(self, user_id):
+        return FakeUser(self, user_id)
+
+    async def wait_until_ready(self):
+        pass
+
+    @contextlib.asynccontextmanager
+    async def track(self):
+        yield
+
+
+# --- 시나리오 ---
+
+def dates(start, days):
+    return [start + timedelta(days=i) for i in range(days)]
+
+
+def build_scenario(rng, user_ids, start, days):
+    """유저별 목표, 휴가일, 여러 레포 합산 모드 유저, 이벤트 목록 [(시각, 종류, 유저ID)], 가짜 GitHub, Firestore 장애 구간"""
+    goals, vacations, cross_repo, events = {}, defaultdict(set), set(), []
+    github = FakeGitHub()
+    for uid in user_ids:
+        goals[uid] = rng.randint(1, 3)
+        if rng.random() < 0.25:
+            cross_repo.add(uid)
+        diligence = rng.uniform(0.5, 0.98)
+        day = 0
+        while day < days:
+            if rng.random() < 0.02:
+                length = rng.randint(1, 5)
+                vacations[uid].update(start + timedelta(days=day + i) for i in range(length))
+                day += length
+            day += 1
+        for date in dates(start, days):
+            midnight = KST.localize(datetime.combine(date, datetime.min.time()))
+            for _ in range(rng.choice([0, 0, 1, 2, 3, 4, 5])):
+                repo = f"gh{uid}/side" if uid in cross_repo and rng.random() < 0.4 else f"gh{uid}/repo"
+                when = midnight + timedelta(seconds=rng.randint(60, 86399))
+                github.add_commit(repo, when)
+                if uid in cross_repo and rng.random() < 0.2:
+                    github.push_again(repo, when)
+            if date.weekday() >= 5:
+                if rng.random() < 0.1:  # 주말에 !인증 하는 사람도 있음
+                    events.append((midnight + timedelta(hours=rng.randint(9, 22)), "certify", uid))
+                continue
+            if rng.random() < diligence:
+                for _ in range(rng.choice([1, 1, 1, 2])):
+                    events.append((midnight + timedelta(minutes=rng.randint(9 * 60, 23 * 60 + 50), seconds=30), "certify", uid))
+            if rng.random() < 0.1:
+                events.append((midnight + timedelta(hours=rng.randint(0, 23), minutes=rng.randint(0, 59), seconds=45), "check", uid))
+            if rng.random() < 0.05:
+                events.append((midnight + timedelta(minutes=rng.randint(9 * 60, 23 * 60), seconds=15), "force_push", uid))
+            if rng.random() < 0.05:  # 오전에 만든 브랜치를 오후에 병합 (병합된 커밋은 이미 센 커밋보다 committer 시각이 이름)
+                merged_at = midnight + timedelta(minutes=rng.randint(14 * 60, 22 * 60), seconds=20)
+                times = sorted(midnight + timedelta(minutes=rng.randint(9 * 60, 13 * 60)) for _ in range(rng.randint(1, 3)))
+                github.merge_branch(f"gh{uid}/repo", merged_at, times)
+                events.append((merged_at - timedelta(minutes=30), "certify", uid))  # 병합 전에 한 번 세어 두고
+                events.append((merged_at + timedelta(minutes=rng.randint(1, 60)), "certify", uid))  # 병합 뒤에 다시 인증
+        for date in dates(start, days + 1):
+            on, was = date in vacations[uid], (date - timedelta(days=1)) in vacations[uid]
+            if on != was:
+                events.append((KST.localize(datetime.combine(date, datetime.min.time())) + timedelta(hours=8), "vacation" if on else "return", uid))
+    db_outages = []
+    for week in range(days // 7):  # 주마다 한 번씩 GitHub 장애 (평일 9시 ~ 20시 사이, 10 ~ 90분)
+        github_day = week * 7 + rng.randint(0, 4)
+        midnight = KST.localize(datetime.combine(start + timedelta(days=github_day), datetime.min.time()))
+        outage_start = midnight + timedelta(minutes=rng.randint(9 * 60, 20 * 60))
+        github.outages.append((outage_start, outage_start + timedelta(minutes=rng.randint(10, 90))))
+        # 같은 주 다른 평일에 Firestore 장애 (10시 ~ 17시 사이 시작, 10 ~ 120분)
+        db_day = week * 7 + rng.choice([day for day in range(5) if week * 7 + day != github_day])
+        midnight = KST.localize(datetime.combine(start + timedelta(days=db_day), datetime.min.time()))
+        outage_start = midnight + timedelta(minutes=rng.randint(10 * 60, 17 * 60))
+        duration = rng.randint(10, 120)
+        db_outages.append((outage_start, outage_start + timedelta(minutes=duration)))
+        for uid in rng.sample(user_ids, min(10, len(user_ids))):  # 장애 중에 스냅샷으로 답하는 !체크
+            events.append((outage_start + timedelta(minutes=rng.randrange(duration), seconds=45), "check", uid))
+    for week in range(days // 7):  # 새벽 4시 30분 이벤트 로그 압축과 함께 시작하는 Firestore 장애 (명령어가 아니라 예약 작업이 먼저 만남)
+        midnight = KST.localize(datetime.combine(start + timedelta(days=week * 7 + rng.randint(0, 6)), datetime.min.time()))
+        outage_start = midnight + timedelta(hours=4, minutes=30)
+        db_outages.append((outage_start, outage_start + timedelta(minutes=rng.randint(5, 20))))
+    for week in range(days // 7):
+        weekdays = [start + timedelta(days=week * 7 + day) for day in range(7) if (start + timedelta(days=week * 7 + day)).weekday() < 5]
+        spanning, ending = rng.sample(weekdays, 2)
+        # 마감을 걸치는 GitHub 장애 (일일 체크가 건너뛴 확인 대기 건을 다음 날 기각 규칙대로 처리)
+        midnight = KST.localize(datetime.combine(spanning, datetime.min.time()))
+        outage_start = midnight + timedelta(hours=23, minutes=rng.randint(20, 45))
+        github.outages.append((outage_start, outage_start + timedelta(minutes=rng.randint(30, 90))))
+        # 마감 시각에 끝나는 GitHub 장애: 23:59 에 재시도 작업이 일일 체크보다 먼저 그날 건을 다시 확인함
+        midnight = KST.localize(datetime.combine(ending, datetime.min.time()))
+        github.outages.append((midnight + timedelta(hours=23, minutes=rng.randint(0, 20)), midnight + timedelta(hours=23, minutes=59)))
+        for uid in rng.sample(user_ids, min(3, len(user_ids))):  # 첫 재시도가 23:59 에 돌아오는 인증
+            events.append((midnight + timedelta(hours=23, minutes=57, seconds=30), "certify", uid))
+        # 마감(23:59)을 걸치는 Firestore 장애: 일일 체크는 복구된 뒤 그날 마감 기준으로 따라잡음 (장애 중 인증은 대기열에서 먼저 기록)
+        sweep_day = rng.choice([day for day in weekdays if day not in (spanning, ending) and day.weekday() != 2])
+        midnight = KST.localize(datetime.combine(sweep_day, datetime.min.time()))
+        outage_start = midnight + timedelta(hours=23, minutes=rng.randint(45, 55))
+        db_outages.append((outage_start, outage_start + timedelta(minutes=rng.randint(15, 30))))
+        for uid in rng.sample(user_ids, min(3, len(user_ids))):
+            events.append((outage_start + timedelta(seconds=30), "certify", uid))
+        # 이 주 수요일 다음의 목요일 0시를 걸치는 Firestore 장애 (수요일이 GitHub 장애 날이 아니면 수요일 마감도 함께 걸침)
+        wednesday = next(day for day in weekdays if day.weekday() == 2)
+        if (wednesday - start).days + 1 < days:
+            lead = rng.randint(0, 3) if wednesday not in (spanning, ending) else 0
+            outage_start = KST.localize(datetime.combine(wednesday + timedelta(days=1), datetime.min.time())) - timedelta(minutes=lead)
+            db_outages.append((outage_start, outage_start + timedelta(minutes=rng.randint(5, 20))))
+    for repo in github.commits:
+        github.commits[repo].sort()
+    for pushes in github.pushes.values():
+        pushes.sort()
+    events.sort(key=lambda e: (e[0], e[1], e[2]))
+    return goals, vacations, cross_repo, events, github, db_outages
+
+
+class Expected:
+    """봇 코드와 별개로 규칙만 보고 계산한 기대 상태"""
+
+    def __init__(self, goals, cross_repo, github):
+        self.goals = goals
+        self.cross_repo = cross_repo
+        self.github = github
+        self.history = defaultdict(dict)
+        self.weekly = Counter()
+        self.total = Counter()
+        self.on_vacation = set()
+        self.daily_failed = {}  # 날짜 -> 기각자 ID 집합
+        self.pending = {}  # (유저ID, 날짜) -> [재시도 횟수, 다음 재시도 시각]
+        self.dead = set()
+        self.late_failed = set()  # 일일 체크 뒤에 기각된 (유저ID, 날짜)
+        self.notices = 0  # 재시도 결과를 유저 채널에 알린 수 (기록했거나 dead)
+        self.passed_today = defaultdict(set)  # 날짜 -> 한 번이라도 통과가 기록된 유저
+        self.reminded = {}  # 시각 -> 리마인더 대상 유저
+        self.kings = {}  # 발표 날짜 -> 커피왕 ID 집합
+
+    def certify(self, uid, now):
+        if now.weekday() >= 5 or uid in self.on_vacation:
+            return
+        date_str = now.strftime("%Y-%m-%d")
+        if self.github.is_down(now):
+            self.pending[(uid, date_str)] = [0, now + retry_delay(0)]
+            return
+        self.record(uid, date_str, now)
+
+    def retry(self, now, date_str=None):
+        """재시도 규칙: 때가 된 건(또는 date_str 날짜 건)을 다시 조회. 장애 중이면 백오프, 횟수를 넘으면 dead.
+        그날 일일 체크 시각이 지난 건은 통과가 아니면 기각 규칙을 적용"""
+        for (uid, day), job in sorted(self.pending.items()):
+            if job[1] > now and day != date_str:
+                continue
+            late = day != date_str and day in self.daily_failed
+            entry = self.history[uid].get(day)
+            if uid in self.on_vacation:
+                del self.pending[(uid, day)]
+            elif self.github.is_down(now):
+                job[0] += 1
+                if job[0] >= RETRY_MAX_ATTEMPTS:
+                    del self.pending[(uid, day)]
+                    self.dead.add((uid, day))
+                    self.notices += 1
+                    if late:
+                        self.fail_late(uid, day, None)
+                else:
+                    job[1] = now + retry_delay(job[0])
+            else:
+                del self.pending[(uid, day)]
+                if entry and entry["passed"]:
+                    continue
+                self.notices += 1
+                when = now if now.strftime("%Y-%m-%d") == day else day_end(day)
+                commits = self.count(uid, when)
+                if late and commits < self.goals[uid]:
+                    self.fail_late(uid, day, commits)
+                else:
+                    self.record(uid, day, when)
+
+    def fail_late(self, uid, date_str, commits):
+        entry = self.history[uid].get(date_str)
+        if entry and entry["passed"]:
+            return
+        if entry is None:
+            self.history[uid][date_str] = {"commits": 0, "passed": False}
+            self.weekly[uid] += 1
+            self.total[uid] += 1
+        elif commits is not None:
+            self.history[uid][date_str] = {"commits": commits, "passed": False}
+        self.late_failed.add((uid, date_str))
+
+    def count(self, uid, now):
+        if uid in self.cross_repo:
+            return len({sha for when, _, sha in self.github.pushes[f"gh{uid}"] if when <= now and when.astimezone(KST).date() == now.date()})
+        return sum(1 for when, sha in self.github.commits[f"gh{uid}/repo"]
+                   if when <= now and self.github.visible(sha, when, now) and when.astimezone(KST).date() == now.date())
+
+    def record(self, uid, date_str, now):
+        commits = self.count(uid, now)
+        self.history[uid][date_str] = {"commits": commits, "passed": commits >= self.goals[uid]}
+        if commits >= self.goals[uid]:
+            self.passed_today[date_str].add(uid)
+
+    def remind(self, now):
+        date_str = now.strftime("%Y-%m-%d")
+        self.reminded[now] = {uid for uid in self.goals if uid not in self.on_vacation and uid not in self.passed_today[date_str]}
+
+    def daily(self, now):
+        date_str = now.strftime("%Y-%m-%d")
+        self.retry(now, date_str)
+        failed = set()
+        for uid in self.goals:
+            if uid in self.on_vacation or (uid, date_str) in self.pending:
+                continue
+            entry = self.history[uid].get(date_str)
+            if entry is None:
+                self.history[uid][date_str] = {"commits": 0, "passed": False}
+                self.weekly[uid] += 1
+                self.total[uid] += 1
+                failed.add(uid)
+            elif not entry["passed"]:
+                failed.add(uid)
+        self.daily_failed[date_str] = failed
+
+    def weekly_reset(self, now):
+        top = max(self.weekly.values(), default=0)
+        self.kings[now.strftime("%Y-%m-%d")] = {uid for uid, n in self.weekly.items() if n == top and n > 0}
+        self.weekly.clear()
+
+
+async def simulate(args):
+    rng = random.Random(args.seed)
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    days = args.weeks * 7
+    user_ids = [10_000 + i for i in range(args.users)]
+    goals, _, cross_repo, events, github, db_outages = build_scenario(rng, user_ids, start, days)
+
+    db = FakeFirestore()
+    storage._db = db
+    config.REMINDER_BATCH_SECONDS = 0  # 가속된 시계에서는 DM 묶음 사이를 기다리지 않음
+    config.SNAPSHOT_DIR = tempfile.mkdtemp(prefix="commitbot-snapshot-")
+    bot = FakeBot(github)
+    admin, certify, reports = Admin(bot), Certify(bot), Reports(bot)
+    members = {uid: FakeMember(uid) for uid in user_ids}
+    expected = Expected(goals, cross_repo, github)
+    errors = []
+
+    clock.set(KST.localize(datetime.combine(start, datetime.min.time())) - timedelta(minutes=1))
+    for uid in user_ids:
+        await admin.register_user.callback(admin, FakeContext(members[uid]), members[uid], f"gh{uid}", "repo", goals[uid])
+        if uid in cross_repo:
+            await admin.edit_user.callback(admin, FakeContext(members[uid]), members[uid], "count_mode", value="all")
+
+    job_times = defaultdict(list)
+    failed_ticks = Counter()  # 예외로 끝난 주기 수 (Firestore 장애 중에만 있어야 함)
+    stopped = set()  # tasks.loop 처럼 예외가 빠져나오면 그 루프는 다시 돌지 않음
+    command_count = Counter()
+    wall_started = time.perf_counter()
+    minute = clock.now() + timedelta(minutes=1)
+    end = minute + timedelta(days=days)
+    index = 0
+    daily_due = reset_due = None
+    while minute < end:
+        # 1) 실제 루프처럼 매분 예약 작업 본문을 호출 (요일·시각 조건은 작업 안에서 판단)
+        clock.set(minute)
+        db.down = any(outage_start <= minute < outage_end for outage_start, outage_end in db_outages)
+        for name, cog, loop in (("keep_snapshot", reports, reports.keep_snapshot), ("retry_checks", certify, certify.retry_checks), ("remind", reports, reports.remind), ("daily_check", reports, reports.daily_check),
+                                ("weekly_reset", reports, reports.weekly_reset), ("compact_log", reports, reports.compact_log)):
+            if name in stopped:
+                continue
+            before = len(bot.outbox.messages), len(bot.dms), db.writes, db.reads
+            started = time.perf_counter()
+            bot.health.last_success = None
+            try:
+                await loop.coro(cog)
+            except Exception as e:
+                stopped.add(name)
+                errors.append(f"{minute:%Y-%m-%d %H:%M} {name} 루프가 예외로 멈춤: {e!r}")
+            if bot.health.last_success is None:
+                failed_ticks[name] += 1
+                if not db.down:
+                    errors.append(f"{minute:%Y-%m-%d %H:%M} {name} 작업이 Firestore 장애가 아닌데 실패함")
+            if (len(bot.outbox.messages), len(bot.dms), db.writes, db.reads) != before:
+                job_times[name].append(time.perf_counter() - started)
+        # 기대값은 발표 여부와 상관없이 규칙(매분 재시도 / 평일 23:59 / 목요일 0:00)대로 계산.
+        # 일일 체크·주간 초기화는 Firestore 장애 중이면 복구된 첫 분에 원래 기준 시각으로 (주간 초기화는 수요일 체크 뒤에)
+        expected.retry(minute)
+        if minute.weekday() < 5 and (minute.hour, minute.minute) in reports.reminder_times:
+            expected.remind(minute)
+        if minute.weekday() < 5 and (minute.hour, minute.minute) == (23, 59):
+            daily_due = minute
+        if minute.weekday() == 3 and (minute.hour, minute.minute) == (0, 0):
+            reset_due = minute
+        if daily_due and not db.down:
+            expected.daily(daily_due)
+            daily_due = None
+        if reset_due and not daily_due and not db.down:
+            expected.weekly_reset(reset_due)
+            reset_due = None
+
+        # 2) 이번 1분 안에 일어나는 유저 행동
+        next_minute = minute + timedelta(minutes=1)
+        while index < len(events) and events[index][0] < next_minute:
+            when, kind, uid = events[index]
+            index += 1
+            clock.set(when)
+            ctx = FakeContext(members[uid])
+            command_count[kind] += 1
+            if db.down and kind in ("certify", "check"):
+                command_count["db_down"] += 1
+            if kind == "certify":
+                await certify.certify_commit.callback(certify, ctx)
+                expected.certify(uid, when)
+                if (ctx.sent[-1] or "").startswith("⏳"):
+                    command_count["pending"] += 1
+            elif kind == "check":
+                await certify.check_status.callback(certify, ctx)
+                match = WEEKLY_COUNT_PATTERN.search(ctx.sent[-1] or "")
+                if match and int(match.group(1)) != expected.weekly[uid]:
+                    errors.append(f"{when:%Y-%m-%d %H:%M} <@{uid}> !체크 {match.group(1)}회, 기대값 {expected.weekly[uid]}회")
+            elif kind == "force_push":
+                github.squash_today(f"gh{uid}/repo", when)
+            elif kind == "vacation":
+                await admin.set_vacation.callback(admin, ctx, members[uid])
+                expected.on_vacation.add(uid)
+            elif kind == "return":
+                await admin.unset_vacation.callback(admin, ctx, members[uid])
+                expected.on_vacation.discard(uid)
+        minute = next_minute
+    wall = time.perf_counter() - wall_started
+    clock.reset()
+    db.down = False
+
+    # 장애 중 쌓인 쓰기는 모두 기록됐고, 저장한 스냅샷 파일을 다시 읽으면 메모리의 것과 같아야 함
+    if snapshot.pending:
+        errors.append(f"기록하지 못한 쓰기 대기열 {len(snapshot.pending)}건")
+    saved_users, saved_time = snapshot.cached_users, snapshot.saved_at
+    snapshot.load()
+    if (snapshot.cached_users, snapshot.saved_at) != (saved_users, saved_time):
+        errors.append("스냅샷 파일을 다시 읽은 결과가 메모리의 스냅샷과 다름")
+
+    # --- 검증 ---
+    # 확인 대기 안내와 관리자 알림(설정이 없으면 보고 채널과 같음)은 발표 비교에서 뺌
+    reports_sent = [(when, text) for when, text in bot.outbox.reports() if "확인 대기" not in text and not text.startswith("💀")]
+    late_failed = {(int(uid), date_str) for when, text in reports_sent if "추가 기각" in text
+                   for date_str, uid in LATE_FAIL_PATTERN.findall(text)}
+    if late_failed != expected.late_failed:
+        errors.append(f"추가 기각 발표 불일치: {sorted(late_failed ^ expected.late_failed)}")
+    reports_sent = [(when, text) for when, text in reports_sent if "추가 기각" not in text]
+    for uid, date_str in sorted(late_failed):
+        if uid in expected.daily_failed.get(date_str, ()):
+            errors.append(f"<@{uid}> {date_str} 기각자 목록과 추가 기각에 모두 발표됨")
+    for when, text in reports_sent:
+        mentions = {int(m) for m in MENTION_PATTERN.findall(text)}
+        if "기각자 목록" in text or "전원 통과" in text:
+            date_str = DAILY_DATE_PATTERN.search(text).group(1)  # 늦게 따라잡은 체크는 다음 날 발표되므로 본문의 날짜로 맞춤
+            if mentions != expected.daily_failed.get(date_str):
+                errors.append(f"{date_str} 기각자 발표 불일치: {sorted(mentions ^ expected.daily_failed.get(date_str, set()))}")
+        else:
+            date_str = when.strftime("%Y-%m-%d")
+            if mentions != expected.kings.get(date_str):
+                errors.append(f"{date_str} 커피왕 발표 불일치: {sorted(mentions ^ expected.kings.get(date_str, set()))}")
+    if len(reports_sent) != len(expected.daily_failed) + len(expected.kings):
+        errors.append(f"발표 {len(reports_sent)}건, 기대값 {len(expected.daily_failed) + len(expected.kings)}건")
+    reminded = defaultdict(set)
+    for when, uid, _ in bot.dms:
+        reminded[when].add(uid)
+    for when in sorted(set(reminded) | set(expected.reminded)):
+        if reminded.get(when, set()) != expected.reminded.get(when, set()):
+            errors.append(f"{when:%Y-%m-%d %H:%M} 리마인더 대상 불일치: {sorted(reminded.get(when, set()) ^ expected.reminded.get(when, set()))}")
+    retried = [(when, text) for when, channel_id, text in bot.outbox.messages if channel_id == CHANNEL_ID]
+    if len(retried) != expected.notices:
+        errors.append(f"재시도 결과 알림 {len(retried)}건, 기대값 {expected.notices}건")
+    for uid in user_ids:
+        doc = db.docs[f"users/{uid}"]
+        history = dict(load_history(doc))
+        for field, actual, value in (("history", history, expected.history[uid]), ("weekly_fail", doc.get("weekly_fail"), expected.weekly[uid]),
+                                     ("total_fail", doc.get("total_fail"), expected.total[uid])):
+            if actual != value:
+                errors.append(f"<@{uid}> {field}: {actual!r} != 기대값 {value!r}")
+        if history and doc.get("stats") != rebuild_stats(history):
+            errors.append(f"<@{uid}> stats 롤업이 history 와 다름")
+    # 스냅샷 + 이벤트 재생 결과가 user 문서와 같은지
+    for uid, field, current, replayed in verify_all(db):
+        errors.append(f"<@{uid}> 이벤트 재생 {field}: 문서 {current!r} != 재생 {replayed!r}")
+
+    # --- 결과 ---
+    print(f"🕒 {args.weeks}주({days}일) × {args.users}명 시뮬레이션: {wall:.2f}s (시뮬레이션 {days / wall:.1f}일/초)")
+    print(f"💬 명령어 {sum(command_count.values())}회 ({dict(command_count)}), Firestore 장애 {len(db_outages)}회, GitHub 요청 {github.requests}회 (304 {github.not_modified}회, 장애 {github.failed}회, 커밋·이벤트 {github.items}개), "
+          f"Firestore 읽기 {db.reads} / 쓰기 {db.writes}")
+    if failed_ticks:
+        print(f"🔁 Firestore 장애로 실패하고 다음 주기에 계속 돈 작업: {dict(failed_ticks)}")
+    for name, samples in job_times.items():
+        total = sum(samples)
+        print(f"⏰ {name}: {len(samples)}회, 평균 {total / len(samples) * 1000:.1f}ms, 최대 {max(samples) * 1000:.1f}ms, "
+              f"{args.users * len(samples) / total:.0f} 유저/초")
+    if errors:
+        print(f"❌ 불일치 {len(errors)}건")
+        for line in errors[:args.show]:
+            print("   " + line)
+        return 1
+    print(f"✅ 총 기각 {sum(expected.total.values())}회, 발표 {len(reports_sent)}건, 재시도 결과 알림 {len(retried)}건, 리마인더 DM {len(bot.dms)}건 모두 기대값과 일치")
+    return 0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--users", type=int, default=200)
+    arg_parser.add_argument("--weeks", type=int, default=8)
+    arg_parser.add_argument("--start", default="2026-01-01", help="시작일 (YYYY-MM-DD)")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--workers", type=int, default=8, help="Firestore 호출을 돌릴 스레드 수")
+    arg_parser.add_argument("--show", type=int, default=20, help="출력할 불일치 최대 개수")
+    arg_parser.add_argument("-v", "--verbose", action="store_true")
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR, format='[%(asctime)s] [%(levelname)s] %(message)s')
+
+    async def run():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.workers))
+        return await simulate(args)
+
+    sys.exit(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""봇 콜드 스타트 벤치마크 (-X importtime 프로파일 + 실행 시간)
+
+가짜 서비스 계정 키와 토큰을 환경변수로 넣고, 디스코드에 접속하기 직전까지
+걸리는 시간을 별도 프로세스에서 여러 번 측정합니다.
+
+    python bench/startup.py                  # 패키지 구조 (commitbot)
+    python bench/startup.py --module main    # main.py 진입점
+    python bench/startup.py --top 15         # 누적 import 시간이 큰 모듈 15개 표시
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 디스코드 로그인 직전(setup_hook 완료)까지 진행. 부모 프로세스가 넘겨준 시작 시각 기준으로 경과 시간을 출력하고 바로 종료 (백그라운드 초기화는 기다리지 않음)
+STARTUP_SNIPPET = """
+import asyncio, importlib, os, sys, time
+module = importlib.import_module(sys.argv[1])
+bot = getattr(module, "bot", None) or module.create_bot()
+async def boot():
+    await bot._async_setup_hook()
+    await bot.setup_hook()
+    print(time.time() - float(sys.argv[2]), flush=True)
+    os._exit(0)
+asyncio.run(boot())
+"""
+
+
+def fake_env():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    service_account = {
+        "type": "service_account", "project_id": "bench", "private_key_id": "bench",
+        "private_key": pem.decode(), "client_email": "bench@bench.iam.gserviceaccount.com", "client_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+    env = dict(os.environ)
+    env.update(
+        DISCORD_TOKEN="bench", GITHUB_TOKEN="bench", REPORT_CHANNEL_ID="1", HEALTH_PORT="0",
+        FIREBASE_KEY_BASE64=base64.b64encode(json.dumps(service_account).encode()).decode(),
+    )
+    return env
+
+
+def import_profile(module, env):
+    """-X importtime 출력에서 (누적 마이크로초, 모듈명) 목록을 얻음"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--module", default="commitbot.bot")
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--top", type=int, default=10)
+    args = arg_parser.parse_args()
+    env = fake_env()
+
+    rows = import_profile(args.module, env)
+    total = next((us for us, name in rows if name == args.module), 0)
+    print(f"📦 import {args.module}: {total / 1000:.1f}ms (누적)")
+    for us, name in sorted((r for r in rows if r[1].count(".") == 0), reverse=True)[:args.top]:
+        print(f"   {us / 1000:>8.1f}ms  {name}")
+
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET, args.module, str(time.time())],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(float(out.split()[-1]))
+    print(f"🚀 프로세스 시작 → 로그인 직전: 중앙값 {statistics.median(samples) * 1000:.0f}ms "
+          f"(최소 {min(samples) * 1000:.0f}ms, {args.runs}회)")
+
+
+if __name__ == "__main__":
+    main()
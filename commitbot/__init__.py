@@ -0,0 +1 @@
+"""GitHub 커밋 인증 디스코드 봇"""
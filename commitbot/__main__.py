@@ -0,0 +1,32 @@
+import asyncio
+import logging
+import signal
+
+from . import config, logs
+from .bot import create_bot
+
+def main():
+    listener = logs.setup()
+    config.check_required_env()
+    bot = create_bot()
+
+    async def runner():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                # 진행 중인 작업을 마무리하고 닫도록 close() 로 넘김 (drain 포함)
+                loop.add_signal_handler(sig, lambda: asyncio.ensure_future(bot.close()))
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows 등 시그널 핸들러를 못 다는 환경은 KeyboardInterrupt 로 종료
+        async with bot:
+            await bot.start(config.DISCORD_TOKEN)
+
+    try:
+        asyncio.run(runner())
+    except KeyboardInterrupt:
+        logging.info("봇을 종료합니다.")
+    finally:
+        listener.stop()  # 큐에 남은 로그를 모두 출력한 뒤 종료
+
+if __name__ == "__main__":
+    main()
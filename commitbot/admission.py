@@ -0,0 +1,91 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict, deque
+
+from discord.ext import commands
+
+from .metrics import add_wait
+
+logger = logging.getLogger(__name__)
+
+# --- 무거운 명령어 입장 제어 ---
+# 마감 직전처럼 !인증 이 몰리면 Firestore executor 와 GitHub 커넥션을 모두가 나눠 쓰느라 전원이 느려짐.
+# extras={"heavy": True} 인 명령어는 동시에 limit 개까지만 실행하고, 나머지는 유저별 대기열에 넣어
+# 유저를 돌아가며(라운드 로빈) 하나씩 입장시킴. 한 유저가 같은 명령어를 연타하면 처리 중인 요청 하나만 남기고 버림.
+
+class Rejected(commands.CommandError):
+    """중복이거나 대기열이 가득 차 실행하지 않은 요청 (안내 메시지는 이미 보냄)"""
+
+def is_heavy(command):
+    return command is not None and command.extras.get("heavy", False)
+
+class Admission:
+    def __init__(self, limit, max_waiting):
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.running = 0
+        self.waiting = OrderedDict()  # user_id -> deque[Future] (입장 순서대로 유저를 돌아감)
+        self.keys = set()  # 대기 중이거나 실행 중인 (user_id, 명령어)
+        self.rejected = 0  # 지금까지 버린 요청 수
+
+    def depth(self):
+        return sum(len(queue) for queue in self.waiting.values())
+
+    def position(self, user_id):
+        """user_id 가 지금 요청을 넣으면 몇 번째로 입장하는지 (라운드 로빈 기준)"""
+        mine = len(self.waiting.get(user_id, ()))
+        return sum(min(len(queue), mine + 1) for uid, queue in self.waiting.items() if uid != user_id) + mine + 1
+
+    def release(self):
+        # 맨 앞 유저의 첫 요청을 입장시키고, 그 유저에게 남은 요청이 있으면 맨 뒤로 보냄
+        while self.waiting:
+            user_id, queue = next(iter(self.waiting.items()))
+            future = queue.popleft()
+            if queue:
+                self.waiting.move_to_end(user_id)
+            else:
+                del self.waiting[user_id]
+            if not future.done():  # 기다리다 취소된 요청은 건너뜀
+                future.set_result(None)
+                return
+        self.running -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, ctx):
+        key = (ctx.author.id, ctx.command.qualified_name)
+        if key in self.keys:
+            self.rejected += 1
+            await ctx.send(f"🙏 이전 `{ctx.prefix}{ctx.command.qualified_name}` 요청을 처리하고 있어요. 조금만 기다려주세요!", delete_after=10)
+            raise Rejected("duplicate")
+        if self.running >= self.limit and self.depth() >= self.max_waiting:
+            self.rejected += 1
+            await ctx.send("🚦 지금 요청이 너무 많아요. 잠시 후 다시 시도해주세요.", delete_after=10)
+            raise Rejected("full")
+
+        self.keys.add(key)
+        try:
+            if self.running < self.limit:
+                self.running += 1
+            else:
+                position = self.position(ctx.author.id)
+                future = asyncio.get_running_loop().create_future()
+                self.waiting.setdefault(ctx.author.id, deque()).append(future)
+                logger.info(f"🚦 !{ctx.command.qualified_name} 대기 ({position}번째, 실행 중 {self.running}개)")
+                await ctx.send(f"⏳ 요청이 몰려 대기 중이에요. (대기 {position}번째)", delete_after=30)
+                waiting_since = time.perf_counter()
+                try:
+                    await future  # release() 가 running 슬롯을 그대로 넘겨줌
+                except asyncio.CancelledError:
+                    if future.done() and not future.cancelled():
+                        self.release()  # 입장 직후 취소되면 받은 슬롯을 다음 사람에게 넘김
+                    raise
+                finally:
+                    add_wait("admission", time.perf_counter() - waiting_since)
+            try:
+                yield
+            finally:
+                self.release()
+        finally:
+            self.keys.discard(key)
@@ -0,0 +1,155 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import discord
+
+from .clock import clock
+from .config import KST
+from .events import commit_guarded, new_event
+from .github import count_commits_by_kst_day, fetch_commits_between
+from .history import counted_fail, history_write, load_history
+from .stats import rebuild_stats
+
+# --- 과거 기록 재계산 (백필) ---
+# 유저마다 기간 전체 커밋을 한 번에(페이지 단위로) 받아 KST 날짜별로 나눈 뒤, history 와 비교해 바뀐 날만 고침
+
+BACKFILL_CONCURRENCY = 4  # 동시에 GitHub 을 조회할 유저 수
+MAX_BACKFILL_DAYS = 366
+
+def week_start(today):
+    """주간 집계가 시작된 목요일"""
+    return today - timedelta(days=(today.weekday() - 3) % 7)
+
+def weekdays_between(start, end):
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+def recount(was_counted, old, new):
+    """기록을 old → new 로 바꾼 뒤 그날을 기각 횟수에 셀지 (일일 체크의 규칙: 기록이 없던 날의 실패만 셈).
+    !인증 으로 남은 기록은 원래 세지 않았으므로 그대로 세지 않음"""
+    return (old is None or was_counted) and not new["passed"]
+
+def plan_user(doc, counts, start, end, today, fill_missing=False):
+    """바뀌는 날짜 목록 [(날짜, 이전 기록, 새 기록)], 날짜별 새 counted 표시, 카운터 변화량 (total, weekly) 을 돌려줌"""
+    history = load_history(doc)
+    goal = doc.get("goal_per_day", 1)
+    this_week = week_start(today)
+    changes, counted, total_delta, weekly_delta = [], {}, 0, 0
+    for day in weekdays_between(start, end):
+        date_str = day.strftime("%Y-%m-%d")
+        old = history.get(date_str)
+        if old is None and (not fill_missing or doc.get("on_vacation", False)):
+            continue  # 기록이 없던 날(휴가 등)은 요청이 있을 때만, 휴가 중이 아닌 유저에게만 채움
+        commits = counts.get(date_str, 0)
+        new = {"commits": commits, "passed": commits >= goal}
+        if old is not None and old.get("commits") == new["commits"] and bool(old.get("passed")) == new["passed"]:
+            continue
+        was_counted = old is not None and counted_fail(doc, date_str)
+        counted[date_str] = recount(was_counted, old, new)
+        delta = int(counted[date_str]) - int(was_counted)
+        total_delta += delta
+        if day >= this_week:
+            weekly_delta += delta
+        changes.append((date_str, old, new))
+    # 카운터는 음수가 되지 않게 (관리자 조정 등으로 기록과 어긋나 있을 수 있음)
+    total_delta = max(total_delta, -doc.get("total_fail", 0))
+    weekly_delta = max(weekly_delta, -doc.get("weekly_fail", 0))
+    return changes, counted, total_delta, weekly_delta
+
+async def plan_backfill(session, snapshots, start, end, fill_missing=False):
+    """유저별 계획 목록. GitHub 조회는 BACKFILL_CONCURRENCY 명씩 동시에 진행"""
+    today = clock.now().date()
+    end = min(end, today - timedelta(days=1))  # 오늘은 아직 진행 중이라 제외
+    since = KST.localize(datetime.combine(start, datetime.min.time()))
+    until = KST.localize(datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+
+    async def plan(snapshot):
+        doc = snapshot.to_dict()
+        async with semaphore:
+            commits = await fetch_commits_between(session, doc.get("github_id"), doc.get("repo_name"), since, until)
+        if commits is None:
+            return {"user_id": snapshot.id, "error": "GitHub 조회 실패"}
+        counts = count_commits_by_kst_day(commits)
+        changes, _, total_delta, weekly_delta = plan_user(doc, counts, start, end, today, fill_missing)
+        return {"user_id": snapshot.id, "snapshot": snapshot, "counts": counts, "window": (start, end, today, fill_missing),
+                "changes": changes, "total_delta": total_delta, "weekly_delta": weekly_delta}
+
+    if start > end:
+        return []
+    return await asyncio.gather(*(plan(s) for s in snapshots))
+
+def apply_plan(db, plan, increment, actor=None):
+    """계획 하나를 적용 (executor 에서 실행). 미리보기 뒤 문서가 바뀌었으면 새 문서로 다시 계산해서 씀.
+    실제로 쓴 (update, 백필 이벤트) 또는 None 을 돌려줌"""
+    def build(doc):
+        changes, counted, total_delta, weekly_delta = plan_user(doc, plan["counts"], *plan["window"])
+        if not changes:
+            return None
+        entries = {date_str: new for date_str, _, new in changes}
+        update = {**history_write(doc, entries, counted), "stats": rebuild_stats({**load_history(doc), **entries})}
+        if total_delta:
+            update["total_fail"] = increment(total_delta)
+        if weekly_delta:
+            update["weekly_fail"] = increment(weekly_delta)
+        event = new_event("backfill", history=entries, total_delta=total_delta, weekly_delta=weekly_delta, actor=actor)
+        return update, event
+
+    return commit_guarded(db, plan["snapshot"].reference, plan["snapshot"], build)
+
+def format_entry(entry):
+    if entry is None:
+        return "기록없음"
+    return f"{entry.get('commits', 0)}커밋 {'✅' if entry.get('passed') else '❌'}"
+
+def format_plans(plans):
+    lines = []
+    for plan in plans:
+        if "error" in plan:
+            lines.append(f"<@{plan['user_id']}> ⚠️ {plan['error']}")
+            continue
+        for date_str, old, new in plan["changes"]:
+            lines.append(f"<@{plan['user_id']}> `{date_str}` {format_entry(old)} → {format_entry(new)}")
+    return lines
+
+CONFIRM_TIMEOUT = 120
+
+class ConfirmView(discord.ui.View):
+    """명령어를 실행한 관리자만 누를 수 있는 적용/취소 버튼.
+    명령어가 확인을 기다리며 붙잡혀 있으면 느린 명령어로 잡히므로, 적용은 버튼 콜백에서 on_confirm 으로 실행"""
+
+    def __init__(self, author_id, on_confirm):
+        super().__init__(timeout=CONFIRM_TIMEOUT)
+        self.author_id = author_id
+        self.on_confirm = on_confirm  # () -> 결과 메시지 문자열
+        self.message = None
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("명령어를 실행한 사람만 누를 수 있어요.", ephemeral=True)
+            return False
+        return True
+
+    def disable(self):
+        for item in self.children:
+            item.disabled = True
+        self.stop()
+
+    @discord.ui.button(label="적용", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction, button):
+        self.disable()
+        await interaction.response.edit_message(view=self)
+        await interaction.followup.send(await self.on_confirm())
+
+    @discord.ui.button(label="취소", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction, button):
+        self.disable()
+        await interaction.response.edit_message(content="🚫 취소했습니다.", view=self)
+
+    async def on_timeout(self):
+        if self.message:
+            self.disable()
+            await self.message.edit(content="⌛ 시간이 지나 취소되었습니다.", view=self)
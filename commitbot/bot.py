@@ -0,0 +1,169 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import discord
+from discord.ext import commands
+
+from . import config, logs, metrics, retry, snapshot, storage
+from .admission import Admission, Rejected, is_heavy
+from .health import HealthServer
+from .outbox import Outbox
+from .profiling import SlowCommandReport, TracedContext, format_trace, profiler
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = (
+    "commitbot.cogs.admin",
+    "commitbot.cogs.certify",
+    "commitbot.cogs.ops",
+    "commitbot.cogs.ranking",
+    "commitbot.cogs.reports",
+)
+
+class CommitBot(commands.Bot):
+    def __init__(self):
+        # 봇 인텐트 설정
+        intents = discord.Intents.default()
+        intents.message_content = True
+        intents.guilds = True
+        intents.members = not config.LEAN_MEMORY
+        options = {}
+        if config.LEAN_MEMORY:
+            options.update(member_cache_flags=discord.MemberCacheFlags.none(), chunk_guilds_at_startup=False)
+        super().__init__(command_prefix="!", intents=intents, **options)
+        self.http_session = None
+        self.executor = None
+        self.outbox = Outbox(self)
+        self.admission = Admission(config.HEAVY_COMMAND_LIMIT, config.ADMISSION_MAX_WAITING)
+        self.slow_commands = SlowCommandReport(self.outbox, config.ADMIN_CHANNEL_ID, config.SLOW_REPORT_SECONDS)
+        self.health = HealthServer(self)
+        self.draining = False
+        self.in_flight = set()  # 종료 전에 끝까지 기다려 줄 명령어·예약 작업 (블록마다 끝나면 완료되는 Future)
+        self.shutdown_task = None
+
+    async def setup_hook(self):
+        # 재접속 때마다 불리는 on_ready 대신, 로그인 직후 한 번만 리소스를 만듦
+        self.http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=config.HTTP_CONNECTION_LIMIT))
+        # Firestore 호출이 도는 기본 executor를 직접 만들어 대기열 길이를 계측함
+        self.executor = ThreadPoolExecutor(max_workers=config.DB_WORKERS, thread_name_prefix="db")
+        self.loop.set_default_executor(self.executor)
+        metrics.register_gauge("executor_queue_depth", lambda: self.executor._work_queue.qsize())
+        metrics.register_gauge("outbox_queue_depth", lambda: self.outbox.queue.qsize())
+        metrics.register_gauge("in_flight_tasks", lambda: len(self.in_flight))
+        metrics.register_gauge("admission_running", lambda: self.admission.running)
+        metrics.register_gauge("admission_queue_depth", self.admission.depth)
+        metrics.register_gauge("admission_rejected", lambda: self.admission.rejected)
+        metrics.register_gauge("github_retry_pending", retry.pending_count)
+        metrics.register_gauge("firestore_outage", lambda: int(storage.outage_since is not None))
+        metrics.register_gauge("snapshot_pending_writes", lambda: len(snapshot.pending))
+        if os.path.isdir("/proc/self/fd"):
+            # 오래 떠 있는 인스턴스에서 파일 디스크립터(커넥션) 누수를 지켜보기 위함
+            metrics.register_gauge("process_open_fds", lambda: len(os.listdir("/proc/self/fd")))
+        # 첫 Firestore 왕복 전에 로컬 스냅샷을 읽어 둠 (클라이언트 준비 전·장애 중 읽기 전용 명령어가 씀)
+        await self.loop.run_in_executor(None, snapshot.load)
+        # Firestore 초기화는 디스코드 접속과 병렬로 백그라운드에서 진행
+        self.firestore_warm_up = asyncio.create_task(storage.warm_up())
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
+        self.outbox.start()
+        await self.health.start()
+
+    @contextlib.asynccontextmanager
+    async def track(self):
+        """종료 시 drain 이 기다려 줄 작업으로 등록.
+        tasks.loop 태스크는 끝나지 않으므로 태스크가 아니라 이 블록이 끝날 때 완료되는 Future 를 기다림"""
+        done = self.loop.create_future()
+        self.in_flight.add(done)
+        try:
+            yield
+        finally:
+            self.in_flight.discard(done)
+            done.set_result(None)
+
+    async def drain(self, timeout):
+        """새 명령어를 받지 않고, 진행 중인 명령어·예약 작업과 보고 발송이 끝나기를 최대 timeout 초 기다림"""
+        self.draining = True
+        deadline = self.loop.time() + timeout
+        logger.info(f"🛑 종료 준비: 진행 중인 작업 {len(self.in_flight)}개, 발송 대기 보고 {self.outbox.queue.qsize()}건")
+        if self.in_flight:
+            _, pending = await asyncio.wait(set(self.in_flight), timeout=timeout)
+            if pending:
+                logger.warning(f"⚠️ 제한 시간 안에 끝나지 않은 작업 {len(pending)}개를 두고 종료합니다.")
+        if not await self.outbox.drain(max(0.0, deadline - self.loop.time())):
+            logger.warning("⚠️ 보내지 못한 보고는 Firestore outbox 에 남아 다음 실행 때 발송됩니다.")
+
+    async def close(self):
+        # 시그널 핸들러와 async with 종료가 겹쳐 여러 번 불려도 정리는 한 번만 함
+        if self.shutdown_task is None:
+            self.shutdown_task = asyncio.create_task(self.shutdown())
+        await asyncio.shield(self.shutdown_task)
+
+    async def shutdown(self):
+        if self.is_ready():
+            await self.drain(config.SHUTDOWN_TIMEOUT)
+        self.draining = True
+        await super().close()
+        await self.health.stop()
+        if self.http_session:
+            await self.http_session.close()
+            logger.info("📡 aiohttp 클라이언트 세션 종료됨")
+        if self.executor:
+            # 남은 Firestore 호출은 drain 에서 이미 기다렸으므로 대기열만 비우고 종료
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def get_context(self, origin, *, cls=TracedContext):
+        return await super().get_context(origin, cls=cls)
+
+    async def invoke(self, ctx):
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        if self.draining:
+            await ctx.send("🔧 봇이 곧 재시작됩니다. 잠시 후 다시 시도해주세요.")
+            return
+        name = ctx.command.qualified_name
+        trace = {}
+        metrics.current_trace.set(trace)
+        started = time.perf_counter()
+        admission = self.admission.slot(ctx) if is_heavy(ctx.command) else contextlib.nullcontext()
+        rejected = False
+        try:
+            async with self.track(), logs.context(command=name, user=ctx.author.id), admission, profiler.wrap(name):
+                await super().invoke(ctx)
+        except Rejected:
+            rejected = True  # 버린 요청(중복·대기열 초과)은 지연시간 지표에 넣지 않음
+        finally:
+            # 대기열에서 기다린 시간도 사용자가 체감하는 지연이므로 지표에는 포함
+            elapsed = time.perf_counter() - started
+            if not rejected:
+                metrics.observe("command", name, elapsed, error=ctx.command_failed)
+            # 느린 명령어 판단은 대기열 대기를 뺀 실행 시간으로 (몰릴 때 대기한 명령어가 전부 잡히지 않도록)
+            if elapsed - trace.get("admission", 0.0) >= config.SLOW_COMMAND_SECONDS:
+                detail = format_trace(trace, elapsed)
+                logger.warning(f"🐢 느린 명령어 !{name} ({elapsed:.2f}s): {detail}")
+                self.slow_commands.add(name, ctx.author.id, elapsed, detail)
+
+    async def on_ready(self):
+        logger.info(f"✅ 봇 로그인 완료: {self.user}")
+
+    async def on_command_error(self, ctx, error):
+        if isinstance(error, commands.CommandOnCooldown):
+            await ctx.send(f"😅 명령어를 너무 자주 사용했어요. **{int(error.retry_after) + 1}초** 뒤에 다시 시도해주세요.", delete_after=5)
+        elif isinstance(error, (commands.MissingRequiredArgument, commands.BadArgument)):
+            await ctx.send(f"🤔 인자가 잘못되었어요. `{ctx.prefix}{ctx.command.name} {ctx.command.signature}` 형식을 확인해주세요.")
+        elif isinstance(error, commands.CheckFailure):
+            await ctx.send("🚫 이 명령어를 사용할 권한이 없습니다.")
+        elif isinstance(error, commands.CommandInvokeError) and storage.is_unavailable(error.original):
+            logger.warning(f"🔌 명령어 '{ctx.command}' 처리 중 Firestore 연결 장애: {error.original}")
+            hint = " (`!체크` `!유저목록` `!커피왕` 은 저장본으로 볼 수 있어요)" if snapshot.saved_at else ""
+            await ctx.send(f"🔌 지금 데이터베이스에 연결할 수 없어요. 잠시 후 다시 시도해주세요.{hint}")
+        else:
+            logger.exception(f"명령어 '{ctx.command}' 처리 중 오류: {error}")
+            await ctx.send("❌ 명령 처리 중 오류가 발생했습니다. 관리자에게 문의해주세요.")
+
+def create_bot():
+    return CommitBot()
@@ -0,0 +1,67 @@
+"""관리용 CLI
+
+    python -m commitbot.cli rebuild-stats [유저ID ...]
+    python -m commitbot.cli export --format csv|jsonl [--out 경로]
+    python -m commitbot.cli compact [유저ID ...] [--retention-days 90]
+    python -m commitbot.cli replay [유저ID ...] [--fix]
+    python -m commitbot.cli migrate-history [유저ID ...]
+"""
+import argparse
+import logging
+import sys
+
+from . import config, storage
+from .events import EVENT_RETENTION_DAYS, compact_all, verify_all
+from .export import FORMATS, export_users
+from .maintenance import migrate_history, rebuild_all_stats
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [%(levelname)s] %(message)s')
+    arg_parser = argparse.ArgumentParser(prog="python -m commitbot.cli")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-stats", help="history 로부터 stats 롤업을 다시 계산")
+    rebuild.add_argument("user_ids", nargs="*", help="대상 디스코드 유저 ID (없으면 전체)")
+
+    export = commands.add_parser("export", help="전체 유저 기록을 CSV / gzip JSONL 로 내보내기")
+    export.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    export.add_argument("--out", help="저장할 경로 (기본값: users.csv / users.jsonl.gz, '-' 이면 표준출력)")
+
+    compact = commands.add_parser("compact", help="이벤트 로그를 유저별 스냅샷으로 합치고 오래된 이벤트 정리")
+    compact.add_argument("user_ids", nargs="*", help="대상 디스코드 유저 ID (없으면 전체)")
+    compact.add_argument("--retention-days", type=int, default=EVENT_RETENTION_DAYS)
+
+    replay = commands.add_parser("replay", help="스냅샷 + 이벤트를 다시 적용한 결과와 user 문서를 비교")
+    replay.add_argument("user_ids", nargs="*", help="대상 디스코드 유저 ID (없으면 전체)")
+    replay.add_argument("--fix", action="store_true", help="다른 값을 재생 결과로 고쳐 씀")
+
+    migrate = commands.add_parser("migrate-history", help="예전 history 맵을 압축 기록(hist)으로 변환")
+    migrate.add_argument("user_ids", nargs="*", help="대상 디스코드 유저 ID (없으면 전체)")
+
+    args = arg_parser.parse_args()
+    if not config.FIREBASE_KEY_BASE64:
+        raise ValueError("❌ FIREBASE_KEY_BASE64 환경변수가 필요합니다!")
+    db = storage.get_db()
+
+    if args.command == "rebuild-stats":
+        rebuild_all_stats(db, args.user_ids)
+    elif args.command == "export":
+        out = args.out or FORMATS[args.format]
+        if out == "-":
+            rows = export_users(db, args.format, sys.stdout.buffer)
+        else:
+            with open(out, "wb") as f:
+                rows = export_users(db, args.format, f)
+        logging.info(f"📤 내보내기 완료: {rows}줄 → {out}")
+    elif args.command == "migrate-history":
+        migrate_history(db, args.user_ids)
+    elif args.command == "compact":
+        compact_all(db, args.user_ids, args.retention_days)
+    elif args.command == "replay":
+        diffs = verify_all(db, args.user_ids, args.fix)
+        for user_id, field, current, replayed in diffs:
+            print(f"{user_id}\t{field}\t{current!r} → {replayed!r}")
+        logging.info(f"🔁 재생 비교 완료: 불일치 {len(diffs)}건" + (" (수정함)" if args.fix and diffs else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from .config import KST
+
+# --- 현재 시각 (KST) ---
+# 시간에 따라 동작이 바뀌는 코드(주말·목요일 주간 경계·23:59 체크)는 datetime.now 대신 clock.now() 를 씀.
+# 시뮬레이션(bench/simulate.py)에서는 set/advance 로 시각을 고정해 몇 주치를 몇 초 만에 돌림.
+
+class Clock:
+    def __init__(self):
+        self.fixed = None  # None 이면 실제 시각
+
+    def now(self):
+        return self.fixed if self.fixed is not None else datetime.now(KST)
+
+    def set(self, when):
+        self.fixed = when.astimezone(KST)
+
+    def advance(self, delta):
+        self.fixed = self.now() + delta
+
+    def reset(self):
+        self.fixed = None
+
+clock = Clock()
@@ -0,0 +1,299 @@
+import asyncio
+import csv
+import io
+from datetime import datetime
+from typing import Optional
+
+import discord
+from discord.ext import commands
+
+from ..backfill import MAX_BACKFILL_DAYS, ConfirmView, apply_plan, format_plans, plan_backfill
+from ..events import delete_log, record
+from ..github import COUNT_MODES, fetch_github_api, fetch_rate_limit_remaining
+from ..maintenance import HISTORY_FIELDS, commit_in_batches, rebuild_all_stats
+from ..members import MEMBER_ID_PATTERN, LazyMember, resolve_member
+from ..reminders import update_roster
+from ..storage import db_delete, db_get, db_get_all, db_set, db_stream, db_update, get_db, increment, run_db, user_ref, users
+
+BULK_MAX_ROWS = 500
+BULK_MAX_BYTES = 256 * 1024
+GITHUB_CONCURRENCY = 8  # 일괄 등록 때 동시에 보내는 레포 확인 요청 수
+MEMBER_CONCURRENCY = 8  # 일괄 등록 때 동시에 보내는 멤버 조회 요청 수
+
+def new_user_data(github_id, repo_name, goal_per_day):
+    return {
+        "github_id": github_id, "repo_name": repo_name, "goal_per_day": goal_per_day,
+        "hist": {}, "weekly_fail": 0, "total_fail": 0, "on_vacation": False
+    }
+
+def decode_csv(data):
+    """UTF-8(BOM 포함) 으로 읽고, 안 되면 한글 엑셀 기본 저장 형식인 CP949 로 읽음. 둘 다 아니면 None"""
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return None
+
+def parse_bulk_csv(text):
+    """CSV(멤버, github_id, 레포, 목표) 를 읽어 (행 목록, 오류 목록) 을 돌려줌. 첫 줄이 헤더면 건너뜀"""
+    rows, errors, seen = [], [], set()
+    for line_no, fields in enumerate(csv.reader(io.StringIO(text)), start=1):
+        fields = [field.strip() for field in fields]
+        if not any(fields):
+            continue
+        if len(fields) != 4:
+            errors.append((line_no, "열이 4개(멤버, github_id, 레포, 목표)가 아닙니다"))
+            continue
+        member, github_id, repo_name, goal = fields
+        match = MEMBER_ID_PATTERN.match(member)
+        if not match or not goal.isdigit() or int(goal) < 1:
+            if line_no == 1:
+                continue  # 헤더
+            errors.append((line_no, "멤버(멘션/ID) 또는 목표(1 이상 정수) 형식이 잘못되었습니다"))
+            continue
+        user_id = int(match.group(1) or match.group(2))
+        if user_id in seen:
+            errors.append((line_no, f"<@{user_id}> 가 파일에 중복되어 있습니다"))
+            continue
+        seen.add(user_id)
+        rows.append({"line": line_no, "user_id": user_id, "github_id": github_id, "repo_name": repo_name, "goal": int(goal)})
+    return rows, errors
+
+class Admin(commands.Cog):
+    """관리자 전용 유저 관리 명령어"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="등록")
+    @commands.has_permissions(administrator=True)
+    async def register_user(self, ctx, member: LazyMember, github_id: str, repo_name: str, goal_per_day: int):
+        async with ctx.typing():
+            repo_url = f"https://api.github.com/repos/{github_id}/{repo_name}"
+            if not await fetch_github_api(self.bot.http_session, repo_url):
+                await ctx.send("❌ 존재하지 않는 GitHub 레포지토리입니다. 사용자 ID와 레포지토리 이름을 확인해주세요.")
+                return
+
+            ref = user_ref(member.id)
+            if (await db_get(ref)).exists:
+                await ctx.send(f"⚠️ {member.mention}님은 이미 등록된 사용자입니다.")
+                return
+
+            await db_set(ref, new_user_data(github_id, repo_name, goal_per_day))
+            await update_roster({member.id: False})
+            await ctx.send(f"✅ {member.mention} 등록 완료: `{github_id}/{repo_name}`, 목표: **{goal_per_day}회/일**")
+
+    @commands.command(name="일괄등록")
+    @commands.has_permissions(administrator=True)
+    async def bulk_register(self, ctx):
+        """첨부한 CSV(멤버, github_id, 레포, 목표)로 여러 명을 한 번에 등록합니다."""
+        if not ctx.message.attachments:
+            await ctx.send("📎 `멤버,github_id,레포,목표` 형식의 CSV 파일을 첨부해주세요.")
+            return
+        attachment = ctx.message.attachments[0]
+        if attachment.size > BULK_MAX_BYTES:
+            await ctx.send(f"❌ 파일이 너무 큽니다. ({BULK_MAX_BYTES // 1024}KB 이하)")
+            return
+
+        async with ctx.typing():
+            text = decode_csv(await attachment.read())
+            if text is None:
+                await ctx.send("❌ CSV 파일의 인코딩을 읽을 수 없습니다. UTF-8 (엑셀의 `CSV UTF-8`) 로 저장해서 다시 올려주세요.")
+                return
+            rows, errors = parse_bulk_csv(text)
+            if len(rows) > BULK_MAX_ROWS:
+                await ctx.send(f"❌ 한 번에 최대 {BULK_MAX_ROWS}명까지 등록할 수 있습니다.")
+                return
+
+            # 0. !등록 처럼 서버 멤버인지 확인 (잘못 적은 ID 가 매일 기각·멘션되지 않도록)
+            member_semaphore = asyncio.Semaphore(MEMBER_CONCURRENCY)
+
+            async def is_member(row):
+                async with member_semaphore:
+                    try:
+                        return await resolve_member(ctx.guild, row["user_id"]) is not None
+                    except discord.HTTPException:
+                        return False
+
+            found_members = await asyncio.gather(*(is_member(row) for row in rows))
+            for row, found in zip(rows, found_members):
+                if not found:
+                    errors.append((row["line"], f"<@{row['user_id']}> 서버 멤버를 찾을 수 없습니다"))
+            rows = [row for row, found in zip(rows, found_members) if found]
+
+            # 1. 이미 등록된 유저를 한 번의 배치 읽기로 확인
+            snapshots = await db_get_all([user_ref(row["user_id"]) for row in rows], field_paths=["github_id"])
+            existing = {int(snapshot.id) for snapshot in snapshots if snapshot.exists}
+            skipped = [row for row in rows if row["user_id"] in existing]
+            rows = [row for row in rows if row["user_id"] not in existing]
+
+            # 2. 남은 API 호출 수 안에서 레포를 동시에 확인
+            remaining = await fetch_rate_limit_remaining(self.bot.http_session)
+            if remaining is not None and remaining < len(rows):
+                await ctx.send(f"⏳ GitHub API 잔여 호출 수({remaining})가 확인할 레포 수({len(rows)})보다 적습니다. 잠시 후 다시 시도해주세요.")
+                return
+            semaphore = asyncio.Semaphore(GITHUB_CONCURRENCY)
+
+            async def repo_exists(row):
+                async with semaphore:
+                    return await fetch_github_api(self.bot.http_session, f"https://api.github.com/repos/{row['github_id']}/{row['repo_name']}")
+
+            found = await asyncio.gather(*(repo_exists(row) for row in rows))
+            valid = []
+            for row, repo in zip(rows, found):
+                if repo:
+                    valid.append(row)
+                else:
+                    errors.append((row["line"], f"<@{row['user_id']}> `{row['github_id']}/{row['repo_name']}` 레포를 찾을 수 없습니다"))
+
+            # 3. 새 유저를 배치 쓰기로 한꺼번에 저장
+            writes = [(user_ref(row["user_id"]), new_user_data(row["github_id"], row["repo_name"], row["goal"])) for row in valid]
+            await run_db(commit_in_batches, get_db(), writes, "set")
+            if valid:
+                await update_roster({row["user_id"]: False for row in valid})
+
+            embed = discord.Embed(title="📥 일괄 등록 결과", color=discord.Color.green() if not errors else discord.Color.orange())
+            embed.add_field(name="✅ 등록", value=f"**{len(valid)}**명", inline=True)
+            embed.add_field(name="⚠️ 이미 등록됨", value=f"**{len(skipped)}**명", inline=True)
+            embed.add_field(name="❌ 실패", value=f"**{len(errors)}**건", inline=True)
+            lines = [f"{line}행: {reason}" for line, reason in sorted(errors)]
+            lines += [f"{row['line']}행: <@{row['user_id']}> 이미 등록된 사용자" for row in skipped]
+            details = "\n".join(lines)
+            if len(details) > 1000:
+                details = details[:1000].rsplit("\n", 1)[0] + "\n…"
+            if details:
+                embed.add_field(name="상세", value=details, inline=False)
+            await ctx.send(embed=embed)
+
+    @commands.command(name="삭제")
+    @commands.has_permissions(administrator=True)
+    async def delete_user(self, ctx, member: LazyMember):
+        async with ctx.typing():
+            ref = user_ref(member.id)
+            if not (await db_get(ref)).exists:
+                await ctx.send("❌ 해당 유저는 등록되어 있지 않습니다.")
+                return
+            await run_db(delete_log, get_db(), ref)
+            await db_delete(ref)
+            await update_roster({member.id: None})
+            await ctx.send(f"🗑️ {member.mention} 유저 정보를 삭제했습니다.")
+
+    @commands.command(name="수정")
+    @commands.has_permissions(administrator=True)
+    async def edit_user(self, ctx, member: LazyMember, key: str, *, value: str):
+        async with ctx.typing():
+            valid_keys = {"github_id", "repo_name", "goal_per_day", "count_mode"}
+            if key not in valid_keys:
+                await ctx.send(f"❌ 수정할 수 없는 항목입니다. (`{', '.join(valid_keys)}` 중 하나여야 합니다.)")
+                return
+            if key == "count_mode" and value not in COUNT_MODES:
+                await ctx.send("❌ `count_mode` 는 `repo`(등록한 레포만) 또는 `all`(모든 공개 레포 합산) 이어야 합니다.")
+                return
+
+            ref = user_ref(member.id)
+            if not (await db_get(ref)).exists:
+                await ctx.send("❌ 해당 유저는 등록되어 있지 않습니다.")
+                return
+
+            update_data = {key: int(value) if key == "goal_per_day" else value}
+            await db_update(ref, update_data)
+            await ctx.send(f"🔧 {member.mention}님의 `{key}` 정보를 `{value}`(으)로 수정했습니다.")
+
+    @commands.command(name="기각수정")
+    @commands.has_permissions(administrator=True)
+    async def edit_fails(self, ctx, member: LazyMember, amount: int):
+        async with ctx.typing():
+            ref = user_ref(member.id)
+            user_doc = await db_get(ref)
+            if not user_doc.exists:
+                await ctx.send("❌ 해당 유저는 등록되어 있지 않습니다.")
+                return
+
+            # Firestore.Increment를 사용하여 안전하게 값을 변경
+            await record(ref, {
+                "total_fail": increment(amount),
+                "weekly_fail": increment(amount)
+            }, "adjust", amount=amount, actor=ctx.author.id)
+            new_total = user_doc.to_dict().get("total_fail", 0) + amount
+            await ctx.send(f"🔧 {member.mention}님의 기각 횟수수수수퍼 노바")
+
+    @commands.command(name="휴가")
+    @commands.has_permissions(administrator=True)
+    async def set_vacation(self, ctx, member: LazyMember):
+        await record(user_ref(member.id), {"on_vacation": True}, "vacation", on=True, actor=ctx.author.id)
+        await update_roster({member.id: True})
+        await ctx.send(f"🏝️ {member.mention} 님을 휴가 상태로 전환했습니다.")
+
+    @commands.command(name="복귀")
+    @commands.has_permissions(administrator=True)
+    async def unset_vacation(self, ctx, member: LazyMember):
+        await record(user_ref(member.id), {"on_vacation": False}, "vacation", on=False, actor=ctx.author.id)
+        await update_roster({member.id: False})
+        await ctx.send(f"👋 {member.mention} 님이 복귀했습니다!")
+
+    @commands.command(name="통계재계산")
+    @commands.has_permissions(administrator=True)
+    async def rebuild_stats(self, ctx, member: LazyMember = None):
+        """history 로부터 연속 통과/월별 통계를 다시 계산합니다. (대상이 없으면 전체)"""
+        async with ctx.typing():
+            user_ids = [member.id] if member else None
+            written = await run_db(rebuild_all_stats, get_db(), user_ids)
+            await ctx.send(f"📈 {written}명의 통계를 다시 계산했습니다.")
+
+    @commands.command(name="백필")
+    @commands.has_permissions(administrator=True)
+    async def backfill(self, ctx, start: str, end: str, member: Optional[LazyMember] = None, mode: str = None):
+        """기간(YYYY-MM-DD) 동안의 기록을 GitHub 커밋으로 다시 계산합니다. 바뀌는 내용을 보여준 뒤 확인을 받고 적용합니다.
+        `채우기` 를 붙이면 기록이 없던 평일도 채웁니다. (휴가 중인 유저 제외, 대상 없이 `!백필 시작 끝 채우기` 도 가능)"""
+        try:
+            start_date = datetime.strptime(start, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end, "%Y-%m-%d").date()
+        except ValueError:
+            await ctx.send("❌ 날짜는 `YYYY-MM-DD` 형식으로 적어주세요.")
+            return
+        if start_date > end_date or (end_date - start_date).days >= MAX_BACKFILL_DAYS:
+            await ctx.send(f"❌ 시작일이 종료일보다 늦거나 기간이 {MAX_BACKFILL_DAYS}일을 넘습니다.")
+            return
+
+        async with ctx.typing():
+            fields = ["github_id", "repo_name", "goal_per_day", "on_vacation", "weekly_fail", "total_fail", "stats"] + HISTORY_FIELDS
+            if member:
+                snapshots = [s for s in await db_get_all([user_ref(member.id)], field_paths=fields) if s.exists]
+            else:
+                snapshots = await db_stream(users().select(fields))
+            if not snapshots:
+                await ctx.send("❌ 대상 유저가 없습니다.")
+                return
+            plans = await plan_backfill(self.bot.http_session, snapshots, start_date, end_date, mode == "채우기")
+
+        lines = format_plans(plans)
+        if not lines:
+            await ctx.send("✅ 바뀌는 기록이 없습니다.")
+            return
+        changed = sum(len(plan.get("changes", ())) for plan in plans)
+        embed = discord.Embed(
+            title=f"🧮 백필 미리보기 ({start_date} ~ {end_date})",
+            description=f"**{changed}**건의 기록이 바뀝니다.",
+            color=discord.Color.orange()
+        )
+        preview = "\n".join(lines)
+        kwargs = {}
+        if len(preview) > 1000:
+            kwargs["file"] = discord.File(io.BytesIO(preview.encode("utf-8")), filename="backfill-diff.txt")
+            preview = preview[:1000].rsplit("\n", 1)[0] + "\n… (전체는 첨부 파일)"
+        embed.add_field(name="변경 내용", value=preview, inline=False)
+
+        async def apply():
+            async with self.bot.track():
+                written = await asyncio.gather(*(
+                    run_db(apply_plan, get_db(), plan, increment, ctx.author.id) for plan in plans if plan.get("changes")
+                ))
+            written = [event for _, event in filter(None, written)]
+            return f"✅ {len(written)}명, {sum(len(event['history']) for event in written)}건의 기록을 고쳤습니다."
+
+        view = ConfirmView(ctx.author.id, apply)
+        view.message = await ctx.send(embed=embed, view=view, **kwargs)
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
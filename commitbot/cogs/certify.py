@@ -0,0 +1,245 @@
+import io
+import logging
+from datetime import timedelta
+
+import discord
+from discord.ext import commands, tasks
+
+from .. import logs, metrics, reminders, retry, snapshot, storage
+from ..clock import clock
+from ..events import new_event, record_guarded
+from ..github import count_today_commits
+from ..health import scheduled
+from ..heatmap import DEFAULT_WEEKS, MAX_WEEKS, heatmap_png
+from ..history import load_history
+from ..maintenance import HISTORY_FIELDS
+from ..members import LazyMember
+from ..profiling import profiler
+from ..stats import history_update, pass_rate, rebuild_stats
+from ..storage import db_get, db_update, user_ref
+
+logger = logging.getLogger(__name__)
+
+# 날짜를 '월', '화', '수'... 로 바꿔주는 도우미 함수
+def get_day_of_week_korean(date_obj):
+    days = ["월", "화", "수", "목", "금", "토", "일"]
+    return days[date_obj.weekday()]
+
+class Certify(commands.Cog):
+    """커밋 인증과 주간 현황 명령어"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        self.retry_checks.start()
+
+    async def cog_unload(self):
+        self.retry_checks.cancel()
+
+    @tasks.loop(minutes=1)
+    @scheduled("retry_checks")
+    async def retry_checks(self):
+        """GitHub 장애로 확인하지 못한 인증을 백오프에 따라 다시 확인"""
+        await self.bot.wait_until_ready()
+        # Firestore 장애 중에는 건너뜀 (복구 확인은 keep_snapshot 작업이 함)
+        if not self.bot.draining and storage.outage_since is None:
+            async with self.bot.track(), logs.context(job="retry_checks"), metrics.timed("job", "retry_checks"), profiler.wrap("retry_checks"):
+                await retry.process_due(self.bot, clock.now())
+
+    @commands.command(name="인증", extras={"heavy": True})
+    async def certify_commit(self, ctx):
+        async with ctx.typing():
+            if snapshot.pending and not snapshot.serving(warm_start=False):
+                # 장애 중 쌓인 결과를 먼저 써야 이번 결과가 옛 결과에 덮이지 않음.
+                # 다른 유저의 건이 막혀 실패해도 이 인증은 계속함 (막힌 건은 keep_snapshot 이 다시 쓰거나 따로 빼 둠)
+                try:
+                    await snapshot.flush()
+                except Exception as e:
+                    logger.warning(f"💾 쓰기 대기열을 비우지 못해 인증을 계속 진행: {type(e).__name__}: {e}")
+            ref = user_ref(ctx.author.id)
+            # Firestore 장애 중이면 스냅샷의 유저 정보로 확인하고, 기록은 쓰기 대기열에 넣음
+            user_doc, stale = await snapshot.read_user(ctx.author.id, warm_start=False)
+            if not user_doc.exists:
+                await ctx.send("❌ 먼저 `!등록` 명령어로 등록해주세요.")
+                return
+            user_data = user_doc.to_dict()
+
+            now_kst = clock.now()
+            if now_kst.weekday() >= 5:
+                await ctx.send("🌴 주말인디 살살하세요 행님 ☕")
+                return
+            if user_data.get("on_vacation", False):
+                await ctx.send("🏝️ 휴가 가서도 코테? 에밥니다 헴")
+                return
+
+            date_str = now_kst.strftime("%Y-%m-%d")
+            commits, sync = await count_today_commits(self.bot.http_session, user_data, now_kst)
+            if commits is None:
+                # GitHub 장애로 확인하지 못함 → 기각으로 기록하지 않고 재시도 큐에서 다시 확인
+                if stale:
+                    snapshot.queue_certify(ctx.author.id, date_str, ctx.channel.id, None, False)
+                else:
+                    await retry.enqueue(ctx.author.id, date_str, ctx.channel.id)
+                await ctx.send("⏳ GitHub 응답이 없어 결과를 아직 확인하지 못했어요. 확인되는 대로 이 채널에 알려드릴게요! (기각 아님)")
+                return
+            passed = commits >= user_data.get("goal_per_day", 1)
+
+            def build(doc):
+                update = history_update(doc, date_str, commits, passed)
+                if sync is not None:
+                    update["commit_sync"] = sync
+                return update, new_event("certify", date=date_str, commits=commits, passed=passed)
+
+            queued = stale or snapshot.has_pending(ctx.author.id)  # 내 결과가 대기열에 남았으면 그 뒤에 씀
+            if not queued:
+                try:
+                    await record_guarded(ref, user_doc, build)
+                except Exception as e:
+                    if not storage.is_unavailable(e):
+                        raise
+                    queued = True  # 읽은 뒤에 장애가 남
+                else:
+                    if passed:
+                        await reminders.mark_certified(ctx.author.id, date_str)
+            if queued:
+                snapshot.queue_certify(ctx.author.id, date_str, ctx.channel.id, commits, passed)
+
+            result_msg = "✅ 통과! 🎉" if passed else "❌ 커피 한 잔 할래요옹~ 😢"
+            embed = discord.Embed(
+                title=f"{ctx.author.display_name}님 인증 결과",
+                description=f"**{result_msg}**",
+                color=discord.Color.green() if passed else discord.Color.red()
+            )
+            embed.add_field(name="GitHub", value=f"`{user_data['github_id']}`", inline=True)
+            embed.add_field(name="오늘 커밋 / 목표", value=f"**{commits}** / {user_data['goal_per_day']}", inline=True)
+            if queued:
+                embed.set_footer(text="💾 DB 연결 장애로 결과를 잠시 보관 중이에요. 연결되는 대로 기록됩니다.")
+            await ctx.send(embed=embed)
+
+    @commands.command(name="체크", extras={"heavy": True})
+    async def check_status(self, ctx, view: str = None, weeks: int = DEFAULT_WEEKS):
+        """이번 주 자신의 기각 현황을 확인합니다. `!체크 이미지 [주]` 로 인증 히트맵을 볼 수 있습니다."""
+        if view == "이미지":
+            await self.send_heatmap(ctx, weeks)
+            return
+        async with ctx.typing():
+            # --- ✨ 추가된 예외 처리 ---
+            today = clock.now()
+            if today.weekday() == 3:  # 오늘이 목요일(weekday=3)인 경우
+                embed = discord.Embed(
+                    title="🐣 주간 집계 시작!",
+                    description=f"오늘은 이번 주 집계가 시작되는 첫날이에요.\n내일부터 현황 조회가 가능합니다!",
+                    color=discord.Color.from_rgb(173, 216, 230) # Light Blue
+                )
+                await ctx.send(embed=embed)
+                return
+            # --- 여기까지 ---
+
+            user_doc, stale = await snapshot.read_user(ctx.author.id)
+
+            if not user_doc.exists:
+                await ctx.send("❌ 먼저 `!등록` 명령어로 등록해주세요.")
+                return
+
+            user_data = user_doc.to_dict()
+            weekly_fail_count = user_data.get("weekly_fail", 0)
+
+            embed = discord.Embed(title="☕️ 이번 주 나의 기각 현황", color=discord.Color.dark_gold())
+            embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar.url if ctx.author.avatar else ctx.author.default_avatar.url)
+
+            if weekly_fail_count == 0:
+                embed.description = f"<@{ctx.author.id}> - 누적 **0**회\n\n🥳 우리 행님 코딩 좀 치는디 스벅 고? 행복회로 돌려잇~"
+                embed.color = discord.Color.green()
+            else:
+                history = load_history(user_data)
+                failed_dates = []
+
+                # 1. 이번 주의 시작(목요일) 날짜 계산
+                # 오늘 요일에서 목요일(3)까지 며칠이 지났는지 계산
+                days_since_thursday = (today.weekday() - 3 + 7) % 7
+                start_of_week = today.date() - timedelta(days=days_since_thursday)
+
+                # 2. 이번 주 목요일부터 오늘까지의 기록을 확인
+                for i in range(7):
+                    check_date = start_of_week + timedelta(days=i)
+                    # 미래의 날짜는 확인할 필요 없음
+                    if check_date > today.date():
+                        break
+
+                    date_str = check_date.strftime("%Y-%m-%d")
+                    day_record = history.get(date_str)
+
+                    # history에 기록이 있고, passed가 False인 경우
+                    if day_record and day_record.get("passed") is False:
+                        day_of_week_korean = get_day_of_week_korean(check_date)
+                        failed_dates.append(f"**{check_date.strftime('%m/%d')}({day_of_week_korean})**")
+
+                fail_dates_str = ", ".join(failed_dates) if failed_dates else "기록 없음"
+
+                embed.description = (
+                    f"<@{ctx.author.id}> - 누적 **{weekly_fail_count}**회\n\n"
+                    f"**누락 날짜:** {fail_dates_str}\n\n"
+                    "😢 행님 누구 하나 키보드 훔치는 건 어때유~"
+                )
+                embed.color = discord.Color.red()
+
+            if stale:
+                embed.set_footer(text=snapshot.stale_note())
+            await ctx.send(embed=embed)
+
+    async def send_heatmap(self, ctx, weeks):
+        async with ctx.typing():
+            user_doc = await db_get(user_ref(ctx.author.id), field_paths=HISTORY_FIELDS + ["goal_per_day"])
+            if not user_doc.exists:
+                await ctx.send("❌ 먼저 `!등록` 명령어로 등록해주세요.")
+                return
+            user_data = user_doc.to_dict()
+            weeks = max(1, min(weeks, MAX_WEEKS))
+            png, _ = await heatmap_png(load_history(user_data), clock.now().date(), weeks, user_data.get("goal_per_day", 1))
+
+            embed = discord.Embed(
+                title=f"🟩 최근 {weeks}주 인증 히트맵",
+                description="🟩 통과 (진할수록 커밋 많음) · 🟥 기각 · ⬛ 기록 없음",
+                color=discord.Color.green()
+            )
+            embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.display_avatar.url)
+            embed.set_image(url="attachment://heatmap.png")
+            await ctx.send(embed=embed, file=discord.File(io.BytesIO(png), filename="heatmap.png"))
+
+    @commands.command(name="통계", extras={"heavy": True})
+    async def show_stats(self, ctx, member: LazyMember = None):
+        """연속 통과 기록과 월별 통과율을 보여줍니다. (history 를 읽지 않고 롤업만 조회)"""
+        member = member or ctx.author
+        async with ctx.typing():
+            ref = user_ref(member.id)
+            user_doc = await db_get(ref, field_paths=["stats", "total_fail"])
+            if not user_doc.exists:
+                await ctx.send("❌ 등록되지 않은 유저입니다.")
+                return
+            user_data = user_doc.to_dict()
+            stats = user_data.get("stats")
+            if stats is None:
+                # 롤업이 생기기 전에 등록된 유저 → 한 번만 history 로 계산해서 저장
+                history = load_history((await db_get(ref, field_paths=HISTORY_FIELDS)).to_dict())
+                stats = rebuild_stats(history)
+                await db_update(ref, {"stats": stats})
+
+            embed = discord.Embed(title="📈 커밋 인증 통계", color=discord.Color.teal())
+            embed.set_author(name=member.display_name, icon_url=member.display_avatar.url)
+            embed.add_field(name="🔥 현재 연속 통과", value=f"**{stats['current_streak']}**일", inline=True)
+            embed.add_field(name="🏅 최장 연속 통과", value=f"**{stats['longest_streak']}**일", inline=True)
+            embed.add_field(name="☕ 누적 기각", value=f"**{user_data.get('total_fail', 0)}**회", inline=True)
+
+            lines = []
+            for month_key in sorted(stats["monthly"], reverse=True)[:6]:
+                month = stats["monthly"][month_key]
+                rate = pass_rate(month)
+                if rate is None:
+                    continue
+                lines.append(f"`{month_key}` {rate:.0%} (통과 {month['passed']} / 실패 {month['failed']})")
+            embed.add_field(name="📅 월별 통과율", value="\n".join(lines) or "기록 없음", inline=False)
+            await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Certify(bot))
@@ -0,0 +1,125 @@
+import asyncio
+import io
+import logging
+import tempfile
+import threading
+
+import discord
+from discord.ext import commands
+
+from .. import config, metrics
+from ..export import FORMATS, export_users
+from ..profiling import MAX_PROFILE_SECONDS, LoopSampler, profiler
+from ..storage import get_db, run_db
+
+logger = logging.getLogger(__name__)
+
+KIND_TITLES = {"command": "💬 명령어", "github": "🐙 GitHub", "firestore": "🔥 Firestore", "job": "⏰ 예약 작업"}
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.0f}"
+
+class Ops(commands.Cog):
+    """운영용 관리자 명령어 (성능 지표, 프로파일링, 내보내기)"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.background = set()  # 명령어 응답 후 백그라운드에서 도는 프로파일링 작업
+
+    def run_in_background(self, coro):
+        # 측정 시간 동안 명령어가 붙잡혀 있으면 느린 명령어로 잡히므로 분리해서 실행
+        task = asyncio.create_task(coro)
+        self.background.add(task)
+        task.add_done_callback(self.background.discard)
+
+    @commands.command(name="성능")
+    @commands.has_permissions(administrator=True)
+    async def performance(self, ctx):
+        """명령어/GitHub/Firestore/예약 작업별 p50·p95·p99 지연시간과 오류율을 보여줍니다."""
+        rows = metrics.summary()
+        if not rows:
+            await ctx.send("📊 아직 수집된 지표가 없습니다.")
+            return
+
+        embed = discord.Embed(title="📊 성능 지표 (최근 샘플 기준, ms)", color=discord.Color.blurple())
+        for kind, title in KIND_TITLES.items():
+            lines = [f"{'이름':<24} {'횟수':>5} {'p50':>6} {'p95':>6} {'p99':>6} {'오류':>5}"]
+            for k, label, count, p50, p95, p99, error_rate in rows:
+                if k == kind:
+                    lines.append(f"{label[:24]:<24} {count:>5} {format_ms(p50):>6} {format_ms(p95):>6} {format_ms(p99):>6} {error_rate:>5.0%}")
+            if len(lines) == 1:
+                continue
+            value = "\n".join(lines)
+            if len(value) > 1000:
+                value = value[:1000].rsplit("\n", 1)[0] + "\n…"
+            embed.add_field(name=title, value=f"```\n{value}\n```", inline=False)
+
+        gauges = ", ".join(f"{name}={func()}" for name, func in sorted(metrics.gauges.items()))
+        embed.set_footer(text=gauges)
+        await ctx.send(embed=embed)
+
+    async def upload(self, filename, text, message):
+        channel = self.bot.get_channel(config.ADMIN_CHANNEL_ID) or await self.bot.fetch_channel(config.ADMIN_CHANNEL_ID)
+        await channel.send(message, file=discord.File(io.BytesIO(text.encode("utf-8")), filename=filename))
+
+    @commands.group(name="프로파일", invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def profile(self, ctx):
+        """운영 중인 봇을 프로파일링합니다. 결과는 관리자 채널에 파일로 올라갑니다."""
+        await ctx.send(
+            "🔬 사용법\n"
+            f"`{ctx.prefix}프로파일 루프 [초]` - 이벤트 루프 스택 샘플링 (folded 형식)\n"
+            f"`{ctx.prefix}프로파일 명령 <초> <명령어/작업 이름...>` - 지정한 명령어·작업을 cProfile 로 감쌈 (예: `커피왕 daily_check`)"
+        )
+
+    @profile.command(name="루프")
+    async def profile_loop(self, ctx, seconds: int = 30):
+        seconds = max(1, min(seconds, MAX_PROFILE_SECONDS))
+        await ctx.send(f"🔬 {seconds}초 동안 이벤트 루프를 샘플링합니다.")
+        self.run_in_background(self.sample_loop(seconds))
+
+    async def sample_loop(self, seconds):
+        sampler = LoopSampler(threading.get_ident())
+        folded = await sampler.collect(seconds)
+        logger.info(f"🔬 이벤트 루프 샘플링 완료: {sampler.samples}개 샘플")
+        await self.upload("loop-profile.folded", folded, f"🔬 이벤트 루프 샘플링 결과 ({seconds}초, 샘플 {sampler.samples}개)")
+
+    @profile.command(name="명령")
+    async def profile_commands(self, ctx, seconds: int, *targets: str):
+        if not targets:
+            await ctx.send("🤔 프로파일링할 명령어나 작업 이름을 하나 이상 적어주세요.")
+            return
+        if profiler.is_running():
+            await ctx.send("⏳ 이미 프로파일링이 진행 중입니다.")
+            return
+        seconds = max(1, min(seconds, MAX_PROFILE_SECONDS))
+        profiler.start(targets, seconds)
+        await ctx.send(f"🔬 {seconds}초 동안 `{', '.join(targets)}` 호출을 cProfile 로 기록합니다.")
+        self.run_in_background(self.finish_profile(seconds, targets))
+
+    async def finish_profile(self, seconds, targets):
+        await asyncio.sleep(seconds)
+        report = profiler.finish()
+        await self.upload("command-profile.txt", report, f"🔬 cProfile 결과 ({', '.join(targets)}, {seconds}초)")
+
+    @commands.command(name="내보내기")
+    @commands.has_permissions(administrator=True)
+    async def export(self, ctx, fmt: str = "csv"):
+        """전체 유저의 기록과 카운터를 CSV 또는 gzip JSONL 파일로 내보냅니다."""
+        if fmt not in FORMATS:
+            await ctx.send(f"🤔 형식은 `{'`, `'.join(sorted(FORMATS))}` 중 하나여야 합니다.")
+            return
+        async with ctx.typing():
+            # 메모리 대신 임시 파일에 스트리밍으로 씀
+            with tempfile.TemporaryFile() as f:
+                rows = await run_db(export_users, get_db(), fmt, f)
+                size = f.tell()
+                limit = ctx.guild.filesize_limit if ctx.guild else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+                if size > limit:
+                    await ctx.send(f"📦 파일이 {size / 1024 / 1024:.1f}MB 라 업로드 한도를 넘습니다. `python -m commitbot.cli export --format {fmt}` 로 받아주세요.")
+                    return
+                f.seek(0)
+                await ctx.send(f"📤 {rows}줄을 내보냈습니다.", file=discord.File(f, filename=FORMATS[fmt]))
+
+async def setup(bot):
+    await bot.add_cog(Ops(bot))
@@ -0,0 +1,62 @@
+import discord
+from discord.ext import commands
+
+from .. import snapshot
+from ..pagination import PAGE_SIZE, FirestorePaginator, SnapshotPaginator
+from ..storage import DESCENDING, field_filter, users
+
+class Ranking(commands.Cog):
+    """유저 목록과 커피왕 랭킹"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def paginate(self, ctx, make_query, pick, title, color, format_line, empty_message, page_size=PAGE_SIZE):
+        """make_query() 를 Firestore 커서로 넘겨 보여줌. Firestore 를 쓸 수 없으면 로컬 스냅샷 문서에서 pick 으로 골라 보여줌
+        (클라이언트를 만드는 중에 이벤트 루프에서 get_db() 를 부르지 않도록 쿼리는 필요할 때 만듦)"""
+        if not snapshot.serving():
+            try:
+                paginator = FirestorePaginator(ctx.author.id, make_query(), title, color, format_line, page_size=page_size)
+                await paginator.start(ctx, empty_message)
+                return
+            except Exception as e:
+                if not snapshot.can_fall_back(e):
+                    raise
+        paginator = SnapshotPaginator(ctx.author.id, pick(snapshot.documents()), title, color, format_line, page_size, note=snapshot.stale_note())
+        await paginator.start(ctx, empty_message)
+
+    @commands.command(name="유저목록", extras={"heavy": True})
+    async def user_list(self, ctx):
+        def format_line(i, user_snapshot):
+            doc = user_snapshot.to_dict()
+            status = "🏝️ 휴가중" if doc.get("on_vacation") else "✅ 활동중"
+            return f"{i+1}. <@{user_snapshot.id}> (`{doc.get('github_id')}`) - {status}"
+
+        def make_query():
+            # 목록에 필요한 필드만 읽음 (기록·통계가 쌓여도 페이지당 비용이 일정)
+            return users().select(["github_id", "on_vacation"])
+
+        async with ctx.typing():
+            await self.paginate(ctx, make_query, list, "📋 등록된 유저 목록", discord.Color.blue(), format_line, "등록된 유저가 없습니다.")
+
+    @commands.command(name="커피왕", extras={"heavy": True})
+    async def coffee_king(self, ctx):
+        def format_line(i, user_snapshot):
+            return f"🏆 **{i+1}위**: <@{user_snapshot.id}> - 누적 **{user_snapshot.get('total_fail')}**회"
+
+        def pick(documents):
+            # Firestore 쿼리와 같은 순서 (누적 기각 내림차순, 같으면 문서 ID 순)
+            return sorted((d for d in documents if d.get("total_fail", 0) > 0), key=lambda d: -d.get("total_fail"))
+
+        def make_query():
+            return (users()
+                    .where(filter=field_filter("total_fail", ">", 0))
+                    .order_by("total_fail", direction=DESCENDING)
+                    .select(["total_fail"]))
+
+        async with ctx.typing():
+            await self.paginate(ctx, make_query, pick, "☕ 커피왕 랭킹 ☕", discord.Color.dark_gold(), format_line,
+                                "☕ **커피왕 랭킹** ☕\n\n🥳 모두 0잔!? 커피왕이 아니라 코딩왕이셈요 행님덜!", page_size=10)
+
+async def setup(bot):
+    await bot.add_cog(Ranking(bot))
@@ -0,0 +1,169 @@
+import logging
+from datetime import timedelta
+
+from discord.ext import commands, tasks
+
+from .. import logs, metrics, reminders, retry, schedule, snapshot
+from ..clock import clock
+from ..config import REMINDER_TIMES, REPORT_CHANNEL_ID
+from ..events import commit_with_events, compact_all, fail_write, new_event, record_guarded
+from ..health import scheduled
+from ..history import load_history
+from ..profiling import profiler
+from ..storage import db_stream, get_db, run_db, user_ref, users
+
+logger = logging.getLogger(__name__)
+
+class Reports(commands.Cog):
+    """평일 마감 전 리마인더 DM, 매일 23:59 기각자 체크, 목요일 0시 주간 커피왕 발표, 새벽 이벤트 로그 압축, 로컬 스냅샷 저장"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.reminder_times = reminders.parse_times(REMINDER_TIMES)
+
+    async def cog_load(self):
+        self.remind.start()
+        self.daily_check.start()
+        self.weekly_reset.start()
+        self.compact_log.start()
+        self.keep_snapshot.start()
+
+    async def cog_unload(self):
+        self.remind.cancel()
+        self.daily_check.cancel()
+        self.weekly_reset.cancel()
+        self.compact_log.cancel()
+        self.keep_snapshot.cancel()
+
+    @tasks.loop(minutes=1)
+    @scheduled("remind")
+    async def remind(self):
+        await self.bot.wait_until_ready()
+        now = clock.now()
+        # 평일 REMINDER_TIMES(기본 21:00, 23:00)에 아직 통과하지 못한 유저에게 DM
+        if now.weekday() < 5 and (now.hour, now.minute) in self.reminder_times and not self.bot.draining:
+            async with self.bot.track(), logs.context(job="remind"), metrics.timed("job", "remind"), profiler.wrap("remind"):
+                await reminders.send_reminders(self.bot, now)
+
+    @tasks.loop(minutes=1)
+    @scheduled("daily_check")
+    async def daily_check(self):
+        await self.bot.wait_until_ready()
+        now = clock.now()
+        # 평일(토요일=5, 일요일=6 제외) 오후 11시 59분에 실행. 그때 Firestore 장애로 실패했으면 복구될 때까지 매분 다시 시도 (그날 마감 기준으로 판정)
+        deadline = schedule.daily_deadline(now)
+        if not self.bot.draining and await schedule.missed("daily_check", deadline, now):
+            async with self.bot.track(), logs.context(job="daily_check"), metrics.timed("job", "daily_check"), profiler.wrap("daily_check"):
+                await self.check_daily(deadline)
+                await schedule.mark_done("daily_check", deadline)
+
+    async def check_daily(self, now):
+        """now: 그날 마감 시각 (늦게 따라잡을 때도 원래 마감 시각으로 판정)"""
+        logger.info(f"--- 🌙 {now.strftime('%Y-%m-%d')} 일일 기각자 체크 시작 ---")
+        date_str = now.strftime("%Y-%m-%d")
+        # 장애 중 쓰기 대기열에 남은 그날 !인증 을 먼저 기록 (기록이 없다고 기각하지 않게)
+        await snapshot.flush()
+        # GitHub 장애로 확인 대기 중인 오늘 인증을 먼저 다시 확인. 그래도 확인 못 한 유저는 기각하지 않음
+        pending_users = await retry.process_due(self.bot, now, date_str)
+        users_stream = await db_stream(users())
+        await reminders.write_roster(users_stream)  # 리마인더용 유저 목록을 매일 실제 문서와 맞춤
+        failed_users = []
+
+        for user_snapshot in users_stream:
+            user_id = user_snapshot.id
+            ref = user_ref(user_id)
+            doc = user_snapshot.to_dict()
+
+            if doc.get("on_vacation", False) or user_id in pending_users:
+                continue
+
+            today_data = load_history(doc).get(date_str)
+
+            # 1. !인증 기록이 있고, 통과(passed: True)한 경우 -> 통과 처리 (아무것도 안 함)
+            if today_data and today_data.get("passed", False):
+                continue
+
+            # 2. !인증 기록이 아예 없는 경우에만 DB 기록 및 실패 카운트 증가
+            if not today_data:
+                def build(current):
+                    if current.get("on_vacation", False) or load_history(current).get(date_str):
+                        return None  # 목록을 읽은 뒤 인증했거나 휴가로 바뀜
+                    # DB에 0커밋, 실패 기록 저장과 실패 횟수 증가를 한 번에 처리
+                    return fail_write(current, date_str)
+
+                if await record_guarded(ref, user_snapshot, build) is None:
+                    continue
+                logger.info(f"-> {doc.get('github_id')}님은 인증 기록이 없어 기각 처리됩니다.")
+
+            # 3. 기록이 없었거나, 인증했지만 실패(passed: False)한 경우 -> 기각자 목록에 추가
+            failed_users.append(user_id)
+
+        if failed_users:
+            mentions = " ".join([f"<@{uid}>" for uid in failed_users])
+            await self.bot.outbox.announce(REPORT_CHANNEL_ID, f"📢 **[{date_str}] 기각자 목록:**\n{mentions}")
+        else:
+            await self.bot.outbox.announce(REPORT_CHANNEL_ID, f"🎉 **[{date_str}] 전원 통과!** 굿보이 굿걸! 👏")
+        if pending_users:
+            mentions = " ".join([f"<@{uid}>" for uid in sorted(pending_users)])
+            await self.bot.outbox.announce(REPORT_CHANNEL_ID, f"⏳ **[{date_str}] GitHub 확인 대기:** {mentions} (확인되면 결과를 따로 알려드립니다)")
+
+        retry.mark_judged(date_str)
+        logger.info(f"--- ✅ 일일 체크 완료: 기각자 {len(failed_users)}명 ---")
+
+    @tasks.loop(minutes=1)
+    @scheduled("weekly_reset")
+    async def weekly_reset(self):
+        await self.bot.wait_until_ready()
+        now = clock.now()
+        # 목요일(weekday=3) 자정(00:00)에 실행. 그때 못 했으면 복구된 뒤 실행하되, 수요일 일일 체크가 끝난 다음에 집계함
+        reset_at = schedule.reset_time(now)
+        if (not self.bot.draining and await schedule.missed("weekly_reset", reset_at, now)
+                and not await schedule.missed("daily_check", schedule.daily_deadline(reset_at), now)):
+            async with self.bot.track(), logs.context(job="weekly_reset"), metrics.timed("job", "weekly_reset"), profiler.wrap("weekly_reset"):
+                await self.reset_weekly(reset_at)
+                await schedule.mark_done("weekly_reset", reset_at)
+
+    async def reset_weekly(self, now):
+        logger.info("--- ☕ 주간 커피왕 발표 및 초기화 시작 ---")
+        users_stream = await db_stream(users())
+
+        # 어제(수요일)까지의 데이터를 기준으로 집계
+        yesterday = now - timedelta(days=1)
+        weekly_fails = {s.id: s.to_dict().get("weekly_fail", 0) for s in users_stream}
+        max_fail = max(weekly_fails.values()) if weekly_fails else 0
+
+        if max_fail > 0:
+            kings = [uid for uid, fails in weekly_fails.items() if fails == max_fail]
+            mentions = " ".join([f"<@{uid}>" for uid in kings])
+            await self.bot.outbox.announce(REPORT_CHANNEL_ID, f"🥶 **이번 주({yesterday.strftime('%m/%d')} 마감) 커피 당첨자 (기각 {max_fail}회):**\n{mentions} !! 음 달다 달아~")
+        else:
+            await self.bot.outbox.announce(REPORT_CHANNEL_ID, f"🎉 **이번 주({yesterday.strftime('%m/%d')} 마감)는 커피왕 없음!** 모두 수고하셨습니다!")
+
+        # 주간 실패 횟수 초기화 (유저마다 초기화 이벤트를 남기며 배치로 씀)
+        resets = [(user_ref(user_id), {"weekly_fail": 0}, new_event("weekly_reset")) for user_id in weekly_fails]
+        await run_db(commit_with_events, get_db(), resets)
+
+        logger.info("--- 📅 주간 실패 횟수 초기화 완료 ---")
+
+    @tasks.loop(minutes=1)
+    @scheduled("compact_log")
+    async def compact_log(self):
+        await self.bot.wait_until_ready()
+        now = clock.now()
+        # 매일 새벽 4시 30분: 이벤트를 유저별 스냅샷으로 합치고 보존 기간이 지난 이벤트 정리
+        if now.hour == 4 and now.minute == 30 and not self.bot.draining:
+            async with self.bot.track(), logs.context(job="compact_log"), metrics.timed("job", "compact_log"), profiler.wrap("compact_log"):
+                await run_db(compact_all, get_db())
+
+    @tasks.loop(minutes=1)
+    @scheduled("snapshot")
+    async def keep_snapshot(self):
+        await self.bot.wait_until_ready()
+        now = clock.now()
+        # SNAPSHOT_MINUTES 마다 로컬 스냅샷 저장. Firestore 장애 중에는 매분 복구를 확인하고, 복구되면 쓰기 대기열부터 기록
+        if snapshot.needs_sync(now) and not self.bot.draining:
+            async with self.bot.track(), logs.context(job="snapshot"), metrics.timed("job", "snapshot"), profiler.wrap("snapshot"):
+                await snapshot.sync(now)
+
+async def setup(bot):
+    await bot.add_cog(Reports(bot))
@@ -0,0 +1,64 @@
+import os
+
+import pytz
+from dotenv import load_dotenv
+
+# --- 기본 설정 (환경변수) ---
+load_dotenv()
+DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+REPORT_CHANNEL_ID = int(os.getenv("REPORT_CHANNEL_ID", "0"))
+FIREBASE_KEY_BASE64 = os.getenv("FIREBASE_KEY_BASE64")
+# 느린 명령어 추적, 프로파일 결과 등 운영 메시지를 받을 채널 (없으면 보고 채널)
+ADMIN_CHANNEL_ID = int(os.getenv("ADMIN_CHANNEL_ID") or REPORT_CHANNEL_ID)
+SLOW_COMMAND_SECONDS = float(os.getenv("SLOW_COMMAND_SECONDS", "3"))
+# 느린 명령어 추적을 모아 관리자 채널에 보내는 간격(초)
+SLOW_REPORT_SECONDS = float(os.getenv("SLOW_REPORT_SECONDS", "300"))
+
+# LEAN_MEMORY=1(기본값)이면 길드 멤버 전체를 청크로 받아 캐시하지 않고, 명령어 인자로 필요한 멤버만 그때그때 조회함
+LEAN_MEMORY = os.getenv("LEAN_MEMORY", "1") == "1"
+MEMBER_LRU_SIZE = int(os.getenv("MEMBER_LRU_SIZE", "256"))
+
+# 헬스체크 HTTP 포트 (0이면 끔). 호스팅 환경이 넣어주는 PORT도 인식함
+HEALTH_PORT = int(os.getenv("HEALTH_PORT", os.getenv("PORT", "8080")))
+
+# Firestore 호출을 처리할 executor 스레드 수
+DB_WORKERS = int(os.getenv("DB_WORKERS", "8"))
+
+# 동시에 실행할 무거운 명령어(!인증, !체크 등) 수와, 그 이상 몰렸을 때 기다리게 할 최대 요청 수.
+# 명령어는 대부분 GitHub 응답을 기다리므로 DB 스레드 수보다 넉넉하게 둠 (bench/admission.py 로 조정)
+HEAVY_COMMAND_LIMIT = int(os.getenv("HEAVY_COMMAND_LIMIT", str(DB_WORKERS * 4)))
+ADMISSION_MAX_WAITING = int(os.getenv("ADMISSION_MAX_WAITING", "200"))
+# GitHub 등 외부 HTTP 동시 커넥션 상한
+HTTP_CONNECTION_LIMIT = int(os.getenv("HTTP_CONNECTION_LIMIT", "32"))
+
+# 마감 전 리마인더 DM 을 보낼 시각(KST, 평일)과, 한 번에 보낼 DM 수 / 묶음 사이 간격(초)
+REMINDER_TIMES = os.getenv("REMINDER_TIMES", "21:00,23:00")
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "10"))
+REMINDER_BATCH_SECONDS = float(os.getenv("REMINDER_BATCH_SECONDS", "2"))
+
+# SIGTERM 을 받은 뒤 진행 중인 명령어·작업·보고 발송을 기다려 주는 최대 시간(초)
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", "25"))
+
+# GitHub 조건부 요청(ETag)용으로 기억해 둘 응답 수
+ETAG_CACHE_SIZE = int(os.getenv("ETAG_CACHE_SIZE", "2048"))
+
+# Firestore 장애·재시작 대비 로컬 스냅샷: 저장 폴더, 전체 유저를 다시 읽어 저장하는 주기(분), 담아 둘 최근 인증 기록 일수
+# 저장할 때마다 유저 수만큼 문서를 읽으므로 (하루 24회 × 유저 수) 유저가 많으면 주기를 늘림
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data")
+SNAPSHOT_MINUTES = int(os.getenv("SNAPSHOT_MINUTES", "60"))
+SNAPSHOT_HISTORY_DAYS = int(os.getenv("SNAPSHOT_HISTORY_DAYS", "14"))
+
+# 로그: 형식(json / text), 전체 레벨, 모듈별 레벨("commitbot.github=WARNING,discord=INFO"),
+# 반복 성공 로그 샘플링 간격(N번에 한 번), 한 줄 최대 길이
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "discord=WARNING")
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "20"))
+LOG_MAX_CHARS = int(os.getenv("LOG_MAX_CHARS", "2000"))
+
+KST = pytz.timezone("Asia/Seoul")
+
+def check_required_env():
+    if not all([DISCORD_TOKEN, GITHUB_TOKEN, FIREBASE_KEY_BASE64, REPORT_CHANNEL_ID]):
+        raise ValueError("❌ DISCORD_TOKEN, GITHUB_TOKEN, FIREBASE_KEY_BASE64, REPORT_CHANNEL_ID 환경변수가 필요합니다!")
@@ -0,0 +1,242 @@
+import logging
+import uuid
+from datetime import timedelta
+
+import pytz
+
+from .clock import clock
+from .history import MAX_COMMITS, history_write, load_history
+from .maintenance import BATCH_LIMIT, rebuild_all_stats
+from .stats import history_update
+from .storage import field_filter, get_db, increment, run_db
+
+logger = logging.getLogger(__name__)
+
+# --- 인증 이벤트 로그 (users/{id}/events, 추가만 함) ---
+# 인증·기각·기각 수정·주간 초기화·휴가·백필을 모두 이벤트로 남기고, user 문서 갱신과 같은 배치로 씀.
+# user 문서는 조회·랭킹용 결과물이고, 카운터는 스냅샷(users/{id}/snapshots/latest)부터 이벤트를 다시 적용해 언제든 재계산할 수 있음.
+#
+# 이벤트 = {"seq": "20250612T145900123456-1a2b3c4d", "type": "fail", "at": datetime, "date": "2025-06-12", ...}
+# seq 는 문서 ID 와 같고 시각 순으로 정렬됨.
+
+EVENT_RETENTION_DAYS = 90  # 스냅샷에 반영된 뒤에도 감사용으로 남겨 둘 기간
+
+def empty_state():
+    return {"history": {}, "weekly_fail": 0, "total_fail": 0, "on_vacation": False}
+
+def state_from_doc(doc):
+    return {
+        "history": dict(load_history(doc)), "weekly_fail": doc.get("weekly_fail", 0),
+        "total_fail": doc.get("total_fail", 0), "on_vacation": doc.get("on_vacation", False),
+    }
+
+def apply_event(state, event):
+    kind = event["type"]
+    if kind == "certify":
+        state["history"][event["date"]] = {"commits": min(event["commits"], MAX_COMMITS), "passed": event["passed"]}
+    elif kind == "fail":
+        state["history"][event["date"]] = {"commits": 0, "passed": False}
+        state["weekly_fail"] += 1
+        state["total_fail"] += 1
+    elif kind == "adjust":
+        state["weekly_fail"] += event["amount"]
+        state["total_fail"] += event["amount"]
+    elif kind == "weekly_reset":
+        state["weekly_fail"] = 0
+    elif kind == "vacation":
+        state["on_vacation"] = event["on"]
+    elif kind == "backfill":
+        state["history"].update({d: {**e, "commits": min(e["commits"], MAX_COMMITS)} for d, e in event["history"].items()})
+        state["total_fail"] += event["total_delta"]
+        state["weekly_fail"] += event["weekly_delta"]
+    else:
+        logger.warning(f"⚠️ 알 수 없는 이벤트 종류: {kind} ({event.get('seq')})")
+    return state
+
+last_event_at = None
+
+def new_event(kind, **fields):
+    global last_event_at
+    at = clock.now().astimezone(pytz.utc)
+    if last_event_at is not None and at <= last_event_at:
+        at = last_event_at + timedelta(microseconds=1)  # 같은 시각에 이어 쓴 이벤트(대기열 기록 등)도 쓴 순서대로 재생되게
+    last_event_at = at
+    seq = f"{at:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    return {"seq": seq, "type": kind, "at": at, **fields}
+
+def events_of(user_ref):
+    return user_ref.collection("events")
+
+def snapshot_ref(user_ref):
+    return user_ref.collection("snapshots").document("latest")
+
+def commit_with_events(db, items):
+    """(user 문서 ref, update 딕셔너리 또는 None, 이벤트) 목록을 문서 갱신 + 이벤트 추가로 묶어 배치 커밋"""
+    batch, pending = db.batch(), 0
+    for ref, update, event in items:
+        if pending + 2 > BATCH_LIMIT:
+            batch.commit()
+            batch, pending = db.batch(), 0
+        if update:
+            batch.update(ref, update)
+            pending += 1
+        batch.set(events_of(ref).document(event["seq"]), event)
+        pending += 1
+    if pending:
+        batch.commit()
+    return len(items)
+
+def fail_write(current, date_str):
+    """기록이 없는 날의 기각 (일일 체크의 규칙): 0커밋 실패 기록 + 기각 횟수 증가 + fail 이벤트"""
+    update = {**history_update(current, date_str, 0, False, counted=True), "weekly_fail": increment(1), "total_fail": increment(1)}
+    return update, new_event("fail", date=date_str)
+
+async def record(ref, update, kind, **fields):
+    """user 문서 갱신과 이벤트 한 건을 한 번에 씀"""
+    await run_db(commit_with_events, get_db(), [(ref, update, new_event(kind, **fields))])
+
+GUARDED_ATTEMPTS = 5
+
+def commit_guarded(db, ref, snapshot, build):
+    """snapshot 을 읽은 뒤 문서가 바뀌지 않았을 때만 쓰고, 바뀌었으면 다시 읽어 build 부터 재시도
+    (압축 기록은 연도 묶음을 통째로 덮어쓰므로, 그 사이 다른 쓰기를 지우지 않게 함)
+
+    build(문서 딕셔너리) -> (update, 이벤트 또는 None) 또는 None(쓸 것 없음). 실제로 쓴 (update, 이벤트) 를 돌려줌"""
+    from google.api_core.exceptions import FailedPrecondition
+
+    for _ in range(GUARDED_ATTEMPTS):
+        built = build(snapshot.to_dict())
+        if built is None:
+            return None
+        update, event = built
+        batch = db.batch()
+        batch.update(ref, update, option=db.write_option(last_update_time=snapshot.update_time))
+        if event is not None:
+            batch.set(events_of(ref).document(event["seq"]), event)
+        try:
+            batch.commit()
+            return built
+        except FailedPrecondition:
+            snapshot = ref.get()
+            if not snapshot.exists:
+                return None
+    raise RuntimeError(f"{ref.id} 문서가 계속 바뀌어 {GUARDED_ATTEMPTS}번 만에 쓰지 못했습니다.")
+
+async def record_guarded(ref, snapshot, build):
+    return await run_db(commit_guarded, get_db(), ref, snapshot, build)
+
+# --- 재생 / 압축 (executor 스레드나 CLI 에서 동기로 실행) ---
+
+def load_snapshot(user_ref):
+    snapshot = snapshot_ref(user_ref).get()
+    if not snapshot.exists:
+        return None, ""
+    data = snapshot.to_dict()
+    return data["state"], data["seq"]
+
+def events_after(user_ref, seq):
+    return events_of(user_ref).where(filter=field_filter("seq", ">", seq)).stream()
+
+def replay(user_ref):
+    """(재계산한 상태, 마지막으로 적용한 이벤트 seq, 적용한 이벤트 수, 스냅샷 존재 여부)"""
+    state, seq = load_snapshot(user_ref)
+    has_snapshot = state is not None
+    state = state or empty_state()
+    applied = 0
+    for snapshot in events_after(user_ref, seq):
+        event = snapshot.to_dict()
+        apply_event(state, event)
+        seq = event["seq"]
+        applied += 1
+    return state, seq, applied, has_snapshot
+
+def compact_user(db, user_ref, retention_days=EVENT_RETENTION_DAYS):
+    """스냅샷 이후 이벤트를 스냅샷에 합치고, 보존 기간이 지난 이벤트를 지움. 지운 이벤트 수를 돌려줌
+
+    스냅샷이 아직 없는 유저(이벤트 로그 도입 전에 가입)는 현재 user 문서를 기준 스냅샷으로 삼음."""
+    state, seq, applied, has_snapshot = replay(user_ref)
+    if not has_snapshot:
+        doc = user_ref.get()
+        if not doc.exists:
+            return 0
+        state = state_from_doc(doc.to_dict())
+    if applied or not has_snapshot:
+        snapshot_ref(user_ref).set({"state": state, "seq": seq, "at": clock.now().astimezone(pytz.utc)})
+
+    cutoff = f"{clock.now().astimezone(pytz.utc) - timedelta(days=retention_days):%Y%m%dT%H%M%S%f}"
+    stale = events_of(user_ref).where(filter=field_filter("seq", "<", min(seq, cutoff))).stream()
+    batch, pending, deleted = db.batch(), 0, 0
+    for snapshot in stale:
+        batch.delete(snapshot.reference)
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            deleted += pending
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+        deleted += pending
+    return deleted
+
+def compact_all(db, user_ids=None, retention_days=EVENT_RETENTION_DAYS):
+    users = db.collection("users")
+    refs = [users.document(str(uid)) for uid in user_ids] if user_ids else [s.reference for s in users.select([]).stream()]
+    deleted = sum(compact_user(db, ref, retention_days) for ref in refs)
+    logger.info(f"🗜️ 이벤트 로그 압축 완료: {len(refs)}명, 이벤트 {deleted}건 정리")
+    return len(refs), deleted
+
+def diff_state(doc, state):
+    """user 문서와 재생 상태의 차이 ([(필드, 문서 값, 재생 값)], 재생 값으로 고치는 update 딕셔너리)"""
+    current = state_from_doc(doc)
+    diffs, update, entries = [], {}, {}
+    for field in ("weekly_fail", "total_fail", "on_vacation"):
+        if current[field] != state[field]:
+            diffs.append((field, current[field], state[field]))
+            update[field] = state[field]
+    for date_str in sorted(set(current["history"]) | set(state["history"])):
+        if current["history"].get(date_str) != state["history"].get(date_str):
+            diffs.append((f"history.{date_str}", current["history"].get(date_str), state["history"].get(date_str)))
+            entries[date_str] = state["history"].get(date_str)
+    if entries:
+        update.update(history_write(doc, entries))
+    return diffs, update
+
+def verify_all(db, user_ids=None, fix=False):
+    """이벤트 재생 결과와 user 문서 카운터를 비교해 [(유저ID, 필드, 문서 값, 재생 값)] 을 돌려줌. fix 면 재생 값으로 고침
+
+    고칠 때는 연도 묶음을 통째로 덮어쓰므로, 비교한 뒤 문서가 바뀌었으면 다시 읽어 비교부터 다시 함 (commit_guarded)"""
+    users = db.collection("users")
+    refs = [users.document(str(uid)) for uid in user_ids] if user_ids else [s.reference for s in users.select([]).stream()]
+    diffs, fixed = [], []
+    for ref in refs:
+        state, _, _, has_snapshot = replay(ref)
+        if not has_snapshot:
+            continue  # 기준 스냅샷이 없으면 로그 도입 전 기록을 알 수 없음 (compact 를 먼저 실행)
+        doc = ref.get()
+        if not doc.exists:
+            continue
+        found, update = diff_state(doc.to_dict(), state)
+        diffs.extend((ref.id, *diff) for diff in found)
+        if fix and update:
+            def build(current, state=state):
+                _, update = diff_state(current, state)
+                return (update, None) if update else None  # 재생 결과가 기준이므로 이벤트는 남기지 않음
+
+            if commit_guarded(db, ref, doc, build) is not None:
+                fixed.append(ref.id)
+    if fixed:
+        rebuild_all_stats(db, fixed)
+    return diffs
+
+def delete_log(db, user_ref):
+    """유저 삭제 시 하위 컬렉션(이벤트, 스냅샷)도 함께 지움"""
+    batch, pending = db.batch(), 0
+    for collection in (events_of(user_ref), user_ref.collection("snapshots")):
+        for snapshot in collection.select([]).stream():
+            batch.delete(snapshot.reference)
+            pending += 1
+            if pending == BATCH_LIMIT:
+                batch.commit()
+                batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
@@ -0,0 +1,53 @@
+import csv
+import gzip
+import io
+import json
+
+from .history import load_history
+
+# --- 전체 유저 기록 내보내기 (문서를 받는 대로 한 줄씩 쓰는 스트리밍 파이프라인) ---
+# collection.stream() 은 서버에서 페이지 단위로 받아오는 제너레이터이므로 전체 컬렉션을 메모리에 올리지 않음
+
+FORMATS = {"csv": "users.csv", "jsonl": "users.jsonl.gz"}
+USER_FIELDS = ["user_id", "github_id", "repo_name", "goal_per_day", "on_vacation", "weekly_fail", "total_fail"]
+CSV_FIELDS = USER_FIELDS + ["date", "commits", "passed"]
+
+def iter_users(db):
+    for snapshot in db.collection("users").stream():
+        doc = snapshot.to_dict()
+        user = {field: doc.get(field) for field in USER_FIELDS[1:]}
+        yield {"user_id": snapshot.id, **user}, load_history(doc)
+
+def iter_csv_rows(users):
+    """history 하루치당 한 줄. 기록이 없는 유저도 한 줄은 남김"""
+    for user, history in users:
+        if not history:
+            yield {**user, "date": "", "commits": "", "passed": ""}
+        for date_str in sorted(history):
+            entry = history[date_str]
+            yield {**user, "date": date_str, "commits": entry.get("commits"), "passed": entry.get("passed")}
+
+def write_csv(users, binary_file):
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="", write_through=True)
+    writer = csv.DictWriter(text, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    rows = 0
+    for row in iter_csv_rows(users):
+        writer.writerow(row)
+        rows += 1
+    text.detach()  # binary_file 은 호출한 쪽에서 닫음
+    return rows
+
+def write_jsonl_gz(users, binary_file):
+    """유저 한 명당 JSON 한 줄 (history 포함)"""
+    rows = 0
+    with gzip.GzipFile(fileobj=binary_file, mode="wb") as gz:
+        for user, history in users:
+            gz.write(json.dumps({**user, "history": dict(history)}, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+            rows += 1
+    return rows
+
+def export_users(db, fmt, binary_file):
+    """fmt(csv / jsonl) 형식으로 binary_file 에 쓰고, 쓴 줄 수를 돌려줌"""
+    writer = write_csv if fmt == "csv" else write_jsonl_gz
+    return writer(iter_users(db), binary_file)
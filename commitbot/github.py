@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from datetime import timedelta
+
+import aiohttp
+import pytz
+from dateutil import parser
+
+from . import config, metrics
+from .config import KST
+
+logger = logging.getLogger(__name__)
+
+GITHUB_PAGE_SIZE = 100
+
+# 조건부 요청용 캐시: URL -> (ETag, 응답 본문). 304 응답은 rate limit 에 포함되지 않음
+etag_cache = OrderedDict()
+
+def remember_etag(url, etag, data):
+    etag_cache[url] = (etag, data)
+    etag_cache.move_to_end(url)
+    while len(etag_cache) > config.ETAG_CACHE_SIZE:
+        etag_cache.popitem(last=False)
+
+# aiohttp를 사용한 비동기 GitHub API 호출
+async def fetch_github_api(session, url, conditional=False):
+    """conditional 이면 지난 응답의 ETag 로 If-None-Match 를 보내고, 304 면 캐시해 둔 본문을 돌려줌"""
+    headers = {"Accept": "application/vnd.github.v3+json", "Authorization": f"Bearer {config.GITHUB_TOKEN}"}
+    cached = etag_cache.get(url) if conditional else None
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    started = time.perf_counter()
+    ok = False
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status in (200, 304):  # 성공 로그는 표본만 남김 (지연·오류율은 metrics 에 전부 기록)
+                logger.info("📡 GitHub API 요청 → URL: %s, 상태: %s", url, response.status, extra={"sample": "github_ok"})
+            if response.status == 304 and cached:
+                etag_cache.move_to_end(url)
+                ok = True
+                return cached[1]
+            if response.status == 200:
+                data = await response.json()
+                if conditional and response.headers.get("ETag"):
+                    remember_etag(url, response.headers["ETag"], data)
+                ok = True
+                return data
+            # 오류 페이지가 커도 로그에는 앞부분만 읽어 남김
+            text = (await response.content.read(config.LOG_MAX_CHARS)).decode("utf-8", errors="replace")
+            logger.warning("❌ GitHub API 호출 실패 (URL: %s, 상태: %s)\n응답: %s", url, response.status, text)
+            return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # 연결 실패·끊김·타임아웃도 오류 응답처럼 None (호출한 쪽에서 재시도 큐로 넘김)
+        logger.warning("❌ GitHub API 연결 실패 (URL: %s): %r", url, e)
+        return None
+    finally:
+        metrics.observe("github", metrics.github_endpoint(url), time.perf_counter() - started, error=not ok)
+
+async def fetch_rate_limit_remaining(session):
+    """남은 core API 호출 수 (/rate_limit 호출 자체는 사용량에 포함되지 않음)"""
+    data = await fetch_github_api(session, "https://api.github.com/rate_limit")
+    try:
+        return data["resources"]["core"]["remaining"]
+    except (KeyError, TypeError):
+        return None
+
+def to_github_time(dt):
+    return dt.astimezone(pytz.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+async def fetch_commits_between(session, github_id, repo_name, since, until=None):
+    """since ~ until 사이의 커밋(최신순)을 페이지를 넘기며 모두 가져옴. 실패하면 None"""
+    commits = []
+    page = 1
+    window = f"since={to_github_time(since)}" + (f"&until={to_github_time(until)}" if until else "")
+    while True:
+        url = (f"https://api.github.com/repos/{github_id}/{repo_name}/commits"
+               f"?{window}&per_page={GITHUB_PAGE_SIZE}&page={page}")
+        data = await fetch_github_api(session, url)
+        if data is None:
+            return None
+        commits.extend(data)
+        if len(data) < GITHUB_PAGE_SIZE:
+            return commits
+        page += 1
+
+def count_commits_by_kst_day(commits):
+    """커밋 목록을 KST 날짜("YYYY-MM-DD")별 개수로 묶음"""
+    counts = Counter()
+    for c in commits:
+        try:
+            commit_time_utc = parser.isoparse(c['commit']['committer']['date'])
+            counts[commit_time_utc.astimezone(KST).strftime("%Y-%m-%d")] += 1
+        except (KeyError, TypeError):
+            continue
+    return counts
+
+# --- 오늘 커밋 수 증분 동기화 ---
+# user_data["commit_sync"] = {"repo": "id/레포", "date": "YYYY-MM-DD", "head_sha": ..., "head_time": ..., "count": n}
+# 마지막으로 센 커밋(head) 이후만 받아서 count 에 더함. head 가 목록에서 사라졌으면 히스토리가
+# 다시 쓰인 것(force-push, amend, squash)이므로 자정부터 다시 셈.
+# committer 시각이 head 보다 이른 커밋이 나중에 올라오는 경우(브랜치 병합 등)는 since 조회에 잡히지 않으므로,
+# 새 커밋 중에 병합 커밋이 있거나 증분으로 센 결과가 목표에 못 미치면 자정부터 다시 셈 (빠뜨린 커밋 때문에 기각되지 않게).
+
+def make_sync_state(repo, date_str, commits, count):
+    head = commits[0] if commits else {}
+    try:
+        head_time = head["commit"]["committer"]["date"]
+    except (KeyError, TypeError):
+        head_time = None
+    return {"repo": repo, "date": date_str, "head_sha": head.get("sha"), "head_time": head_time, "count": count}
+
+async def sync_today_commits(session, user_data, now_kst):
+    """(오늘 KST 커밋 수, 새 동기화 상태). 조회에 실패하면 (None, None)"""
+    github_id = user_data.get("github_id")
+    repo_name = user_data.get("repo_name")
+    repo = f"{github_id}/{repo_name}"
+    date_str = now_kst.strftime("%Y-%m-%d")
+
+    state = user_data.get("commit_sync") or {}
+    if state.get("repo") == repo and state.get("date") == date_str and state.get("head_sha") and state.get("head_time"):
+        # since 경계에서 head 가 빠지지 않도록 1초 여유를 둠
+        since = parser.isoparse(state["head_time"]) - timedelta(seconds=1)
+        commits = await fetch_commits_between(session, github_id, repo_name, since)
+        if commits is None:
+            return None, None
+        shas = [c.get("sha") for c in commits]
+        if state["head_sha"] in shas:
+            new_commits = commits[:shas.index(state["head_sha"])]
+            count = state.get("count", 0) + count_commits_by_kst_day(new_commits).get(date_str, 0)
+            merged = any(len(c.get("parents") or ()) > 1 for c in new_commits)
+            if not merged and count >= user_data.get("goal_per_day", 1):
+                return count, make_sync_state(repo, date_str, commits, count)
+        else:
+            logger.info(f"🔀 {repo} 의 마지막 커밋({state['head_sha'][:7]})이 사라져 오늘 커밋을 처음부터 다시 셉니다.")
+
+    start_of_day_kst = now_kst.replace(hour=0, minute=0, second=0, microsecond=0)
+    commits = await fetch_commits_between(session, github_id, repo_name, start_of_day_kst)
+    if commits is None:
+        return None, None
+    count = count_commits_by_kst_day(commits).get(date_str, 0)
+    return count, make_sync_state(repo, date_str, commits, count)
+
+
+# --- 여러 레포 합산 모드 (user_data["count_mode"] == "all") ---
+# /users/{id}/events 피드 하나로 그날 모든 공개 레포에 push 한 커밋을 셈. 피드는 최신순이고 최대 300건(3페이지)까지만 제공됨.
+# push 시각(created_at)이 오늘(KST)인 PushEvent 의 커밋을 SHA 로 중복 제거 (같은 커밋을 여러 브랜치·포크에 push 한 경우).
+# 커밋 목록이 빠진 페이로드는 head 커밋 하나로 셈.
+
+COUNT_MODES = {"repo", "all"}
+EVENTS_MAX_PAGES = 3
+
+def event_kst_date(event):
+    try:
+        return parser.isoparse(event["created_at"]).astimezone(KST).strftime("%Y-%m-%d")
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def count_push_commits(events, date_str):
+    """이벤트 피드(기록해 둔 페이로드 포함)에서 date_str(KST) 에 push 된 고유 커밋 수"""
+    shas = set()
+    for event in events:
+        if event.get("type") != "PushEvent" or event_kst_date(event) != date_str:
+            continue
+        payload = event.get("payload") or {}
+        commits = payload.get("commits")
+        if commits:
+            shas.update(c["sha"] for c in commits if c.get("sha") and c.get("distinct", True))
+        elif payload.get("head"):
+            shas.add(payload["head"])
+    return len(shas)
+
+async def fetch_events_since(session, github_id, since_kst):
+    """since_kst 이후의 이벤트를 페이지를 넘기며 가져옴 (조건부 요청). 실패하면 None"""
+    events = []
+    since_str = since_kst.strftime("%Y-%m-%d")
+    for page in range(1, EVENTS_MAX_PAGES + 1):
+        url = f"https://api.github.com/users/{github_id}/events?per_page={GITHUB_PAGE_SIZE}&page={page}"
+        data = await fetch_github_api(session, url, conditional=True)
+        if data is None:
+            return None
+        events.extend(data)
+        if len(data) < GITHUB_PAGE_SIZE or (event_kst_date(data[-1]) or since_str) < since_str:
+            break
+    return events
+
+async def count_today_commits(session, user_data, now_kst):
+    """(오늘 KST 커밋 수, 레포 모드의 새 동기화 상태 또는 None). 조회에 실패하면 (None, None)"""
+    if user_data.get("count_mode") != "all":
+        return await sync_today_commits(session, user_data, now_kst)
+    start_of_day_kst = now_kst.replace(hour=0, minute=0, second=0, microsecond=0)
+    events = await fetch_events_since(session, user_data.get("github_id"), start_of_day_kst)
+    if events is None:
+        return None, None
+    return count_push_commits(events, now_kst.strftime("%Y-%m-%d")), None
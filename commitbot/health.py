@@ -0,0 +1,135 @@
+import asyncio
+import functools
+import logging
+import time
+
+from aiohttp import ClientTimeout, web
+
+from . import config, metrics, storage
+
+logger = logging.getLogger(__name__)
+
+# --- 봇 프로세스 안에서 도는 헬스체크 서버 (/healthz, /readyz) ---
+
+LOOP_LAG_INTERVAL = 1.0    # 이벤트 루프 지연 측정 주기(초)
+LOOP_LAG_LIMIT = 5.0       # 이 이상 밀리면 liveness 실패
+JOB_STALE_AFTER = 180      # 1분 주기 작업이 이 시간(초) 넘게 성공 기록이 없으면 readiness 실패
+DEPENDENCY_CACHE_TTL = 30  # 의존성 점검 결과 재사용 시간(초)
+DEPENDENCY_TIMEOUT = 5
+
+def scheduled(name):
+    """tasks.loop 본문을 감싸는 데코레이터. tasks.loop 는 예외 하나로 루프가 영영 멈추므로 주기마다 예외를 잡아
+    로그만 남기고 다음 주기에 다시 돌게 함. 예외 없이 끝난 주기만 성공으로 기록 (계속 실패하면 readiness 실패)"""
+    def decorate(func):
+        @functools.wraps(func)
+        async def run(cog):
+            try:
+                await func(cog)
+            except Exception:
+                logger.exception(f"❌ 예약 작업 {name} 실패 (다음 주기에 다시 실행)")
+                return
+            cog.bot.health.job_succeeded(name)
+        return run
+    return decorate
+
+class HealthServer:
+    def __init__(self, bot):
+        self.bot = bot
+        self.started_at = time.time()
+        self.loop_lag = 0.0
+        self.job_success = {}  # 작업 이름 -> 마지막 성공 시각
+        self.dependency_cache = {}  # 이름 -> (점검 시각, 결과)
+        self.runner = None
+        self.lag_task = None
+
+        metrics.register_gauge("event_loop_lag_seconds", lambda: self.loop_lag)
+
+    def job_succeeded(self, name):
+        self.job_success[name] = time.time()
+
+    async def start(self):
+        self.lag_task = asyncio.create_task(self.measure_loop_lag())
+        if not config.HEALTH_PORT:
+            return
+        app = web.Application()
+        app.router.add_get("/", self.handle_liveness)
+        app.router.add_get("/healthz", self.handle_liveness)
+        app.router.add_get("/readyz", self.handle_readiness)
+        app.router.add_get("/metrics", self.handle_metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "0.0.0.0", config.HEALTH_PORT).start()
+        logger.info(f"🩺 헬스체크 서버 시작: 포트 {config.HEALTH_PORT}")
+
+    async def stop(self):
+        if self.lag_task:
+            self.lag_task.cancel()
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def measure_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.loop_lag = max(0.0, loop.time() - expected)
+
+    async def check_dependency(self, name, probe):
+        checked_at, result = self.dependency_cache.get(name, (0, None))
+        if result is not None and time.time() - checked_at < DEPENDENCY_CACHE_TTL:
+            return result
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), DEPENDENCY_TIMEOUT)
+            result = {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
+        self.dependency_cache[name] = (time.time(), result)
+        return result
+
+    async def probe_github(self):
+        # /rate_limit 호출은 API 사용량에 포함되지 않음
+        headers = {"Authorization": f"Bearer {config.GITHUB_TOKEN}"}
+        timeout = ClientTimeout(total=DEPENDENCY_TIMEOUT)
+        async with self.bot.http_session.get("https://api.github.com/rate_limit", headers=headers, timeout=timeout) as response:
+            response.raise_for_status()
+
+    async def probe_firestore(self):
+        await storage.db_probe(DEPENDENCY_TIMEOUT)
+
+    def liveness(self):
+        alive = not self.bot.is_closed() and self.loop_lag < LOOP_LAG_LIMIT
+        return alive, {"alive": alive, "uptime_s": round(time.time() - self.started_at), "loop_lag_ms": round(self.loop_lag * 1000, 1)}
+
+    async def readiness(self):
+        now = time.time()
+        jobs = {name: round(now - ts) for name, ts in self.job_success.items()}
+        github, firestore = await asyncio.gather(
+            self.check_dependency("github", self.probe_github),
+            self.check_dependency("firestore", self.probe_firestore),
+        )
+        latency = self.bot.latency
+        gateway_ok = self.bot.is_ready() and not self.bot.is_closed() and latency == latency  # latency가 nan이면 하트비트 전
+        jobs_ok = bool(jobs) and all(age < JOB_STALE_AFTER for age in jobs.values())
+        alive, body = self.liveness()
+        ready = alive and gateway_ok and jobs_ok and github["ok"] and firestore["ok"] and not self.bot.draining
+        body.update(
+            ready=ready,
+            draining=self.bot.draining,
+            gateway={"ok": gateway_ok, "latency_ms": round(latency * 1000, 1) if gateway_ok else None},
+            jobs_since_last_success_s=jobs,
+            github=github,
+            firestore=firestore,
+        )
+        return ready, body
+
+    async def handle_liveness(self, request):
+        alive, body = self.liveness()
+        return web.json_response(body, status=200 if alive else 503)
+
+    async def handle_readiness(self, request):
+        ready, body = await self.readiness()
+        return web.json_response(body, status=200 if ready else 503)
+
+    async def handle_metrics(self, request):
+        return web.Response(text=metrics.render_prometheus(), content_type="text/plain", charset="utf-8")
@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import json
+import struct
+import zlib
+from collections import OrderedDict
+from datetime import timedelta
+
+# --- GitHub 스타일 인증 히트맵 (외부 의존성 없는 PNG 인코더 + history 해시 기반 캐시) ---
+
+CELL = 14
+GAP = 3
+MARGIN = 8
+DEFAULT_WEEKS = 12
+MAX_WEEKS = 52
+CACHE_SIZE = 128
+
+# 팔레트 PNG(color type 3) 라서 픽셀당 1바이트
+PALETTE = [
+    (13, 17, 23),     # 0 배경
+    (33, 38, 45),     # 1 기록 없음 / 미래
+    (22, 27, 34),     # 2 주말
+    (218, 54, 51),    # 3 실패
+    (14, 68, 41),     # 4 통과 (목표 근처)
+    (38, 166, 65),    # 5 통과 (목표의 2배 이상)
+    (57, 211, 83),    # 6 통과 (목표의 3배 이상)
+]
+
+def _chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+def encode_png(width, height, pixels):
+    """팔레트 인덱스 바이트열(width * height)을 PNG 바이트로 인코딩"""
+    raw = b"".join(b"\x00" + pixels[y * width:(y + 1) * width] for y in range(height))
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)),
+        _chunk(b"PLTE", bytes(c for rgb in PALETTE for c in rgb)),
+        _chunk(b"IDAT", zlib.compress(raw, 9)),
+        _chunk(b"IEND", b""),
+    ])
+
+def window_start(end_date, weeks):
+    """히트맵 첫 칸(가장 오래된 주의 월요일)"""
+    return end_date - timedelta(days=end_date.weekday() + 7 * (weeks - 1))
+
+def cell_color(date, entry, goal):
+    if entry is None:
+        return 2 if date.weekday() >= 5 else 1
+    if not entry.get("passed"):
+        return 3
+    commits = entry.get("commits", 0)
+    return 6 if commits >= goal * 3 else 5 if commits >= goal * 2 else 4
+
+def render_heatmap(history, end_date, weeks, goal=1):
+    start = window_start(end_date, weeks)
+    width = MARGIN * 2 + weeks * CELL + (weeks - 1) * GAP
+    height = MARGIN * 2 + 7 * CELL + 6 * GAP
+    pixels = bytearray(width * height)
+    for week in range(weeks):
+        for weekday in range(7):
+            date = start + timedelta(days=week * 7 + weekday)
+            color = cell_color(date, history.get(date.strftime("%Y-%m-%d")), goal)
+            x0 = MARGIN + week * (CELL + GAP)
+            y0 = MARGIN + weekday * (CELL + GAP)
+            for y in range(y0, y0 + CELL):
+                pixels[y * width + x0:y * width + x0 + CELL] = bytes([color]) * CELL
+    return encode_png(width, height, bytes(pixels))
+
+# 캐시 키에는 히트맵 범위 안의 기록만 들어가므로, 새 날짜가 기록되거나 주가 넘어갈 때만 다시 그림
+_cache = OrderedDict()
+
+async def heatmap_png(history, end_date, weeks=DEFAULT_WEEKS, goal=1):
+    """(PNG 바이트, 캐시 적중 여부). 캐시에 없을 때만 executor 에서 그림"""
+    start = window_start(end_date, weeks)
+    start_str = start.strftime("%Y-%m-%d")
+    end_str = (start + timedelta(days=weeks * 7 - 1)).strftime("%Y-%m-%d")
+    window = {d: history[d] for d in history if start_str <= d <= end_str}
+    key = hashlib.sha1(json.dumps([start_str, weeks, goal, window], sort_keys=True, default=str).encode()).hexdigest()
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key], True
+    png = await asyncio.get_running_loop().run_in_executor(None, render_heatmap, window, end_date, weeks, goal)
+    _cache[key] = png
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return png, False
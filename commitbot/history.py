@@ -0,0 +1,154 @@
+from collections.abc import Mapping
+from datetime import date, timedelta
+
+# --- 압축한 인증 기록 (user 문서의 "hist" 필드) ---
+# 예전 형식: "history": {"2025-06-12": {"commits": 3, "passed": True}, ...}  → 하루에 수십 바이트 + 맵 파싱 비용
+# 새 형식:   "hist": {"2025": {"rec": bytes(46), "pass": bytes(46), "counted": bytes(46), "commits": bytes(366)}}
+#   rec / pass  : 1월 1일부터의 일련번호(0~365)를 비트 위치로 쓰는 비트셋 (기록 있음 / 통과)
+#   counted     : 일일 체크가 기록이 없어 기각 횟수를 올린 날 (!인증 으로 남은 실패는 세지 않으므로 따로 표시).
+#                 이 비트가 생기기 전에 쓴 연도 묶음은 0커밋 실패를 센 날로 보고 처음 다시 쓸 때 채움
+#   commits     : 하루 1바이트 커밋 수 (255 에서 포화). 통과 여부는 pass 비트로 따로 저장하므로 포화돼도 판정에는 영향 없음
+# 연도 묶음은 통째로 덮어쓰므로, 쓰는 쪽은 읽은 뒤 문서가 바뀌지 않았을 때만 씀 (events.commit_guarded)
+
+YEAR_DAYS = 366
+BITSET_BYTES = (YEAR_DAYS + 7) // 8
+MAX_COMMITS = 255
+
+def empty_year():
+    return {"rec": bytes(BITSET_BYTES), "pass": bytes(BITSET_BYTES), "counted": bytes(BITSET_BYTES), "commits": bytes(YEAR_DAYS)}
+
+def day_of_year(day):
+    return day.timetuple().tm_yday - 1
+
+def bit(bits, index):
+    return bits[index >> 3] >> (index & 7) & 1
+
+class PackedHistory(Mapping):
+    """압축 기록을 {"YYYY-MM-DD": {"commits", "passed"}} 매핑처럼 읽게 해 줌 (읽기 전용)"""
+
+    def __init__(self, hist):
+        self.hist = hist or {}
+
+    def __getitem__(self, date_str):
+        year = self.hist.get(date_str[:4])
+        if year is None:
+            raise KeyError(date_str)
+        try:
+            index = day_of_year(date.fromisoformat(date_str))
+        except ValueError:
+            raise KeyError(date_str) from None
+        if not bit(year["rec"], index):
+            raise KeyError(date_str)
+        return {"commits": year["commits"][index], "passed": bool(bit(year["pass"], index))}
+
+    def __iter__(self):
+        for year_key in sorted(self.hist):
+            rec = self.hist[year_key]["rec"]
+            start = date(int(year_key), 1, 1)
+            for byte_index, byte in enumerate(rec):
+                while byte:
+                    low = byte & -byte
+                    yield (start + timedelta(days=byte_index * 8 + low.bit_length() - 1)).isoformat()
+                    byte ^= low
+
+    def __len__(self):
+        return sum(bin(int.from_bytes(year["rec"], "little")).count("1") for year in self.hist.values())
+
+def guess_counted(year):
+    """counted 비트가 없던 연도 묶음: 0커밋 실패 기록을 일일 체크가 센 날로 봄"""
+    counted = bytearray(BITSET_BYTES)
+    for index in range(YEAR_DAYS):
+        if bit(year["rec"], index) and not bit(year["pass"], index) and year["commits"][index] == 0:
+            counted[index >> 3] |= 1 << (index & 7)
+    return bytes(counted)
+
+def counted_fail(doc, date_str):
+    """일일 체크가 그날 기록이 없어 기각 횟수를 올렸는지"""
+    year = (doc.get("hist") or {}).get(date_str[:4])
+    if year is None or not bit(year["rec"], day_of_year(date.fromisoformat(date_str))):
+        entry = (doc.get("history") or {}).get(date_str)  # 아직 옮기지 않은 예전 맵
+        return entry is not None and not entry.get("passed") and entry.get("commits", 0) == 0
+    counted = year.get("counted") or guess_counted(year)
+    return bool(bit(counted, day_of_year(date.fromisoformat(date_str))))
+
+def load_history(doc):
+    """user 문서에서 인증 기록을 읽음. 아직 옮기지 않은 예전 "history" 맵도 합쳐서 보여줌"""
+    packed = PackedHistory(doc.get("hist"))
+    legacy = doc.get("history")
+    if not legacy:
+        return packed
+    return {**legacy, **dict(packed.items())}
+
+def pack(history):
+    """{"YYYY-MM-DD": {"commits", "passed"}} → {"YYYY": 연도 묶음}"""
+    years = {}
+    for date_str, entry in history.items():
+        year = years.setdefault(date_str[:4], {k: bytearray(v) for k, v in empty_year().items()})
+        set_day(year, date.fromisoformat(date_str), entry)
+    for year in years.values():
+        year["counted"] = bytearray(guess_counted(year))
+    return {key: {k: bytes(v) for k, v in year.items()} for key, year in years.items()}
+
+def set_day(year, day, entry, counted=None):
+    """bytearray 로 된 연도 묶음에 하루치를 씀. entry 가 None 이면 기록을 지움.
+    counted 가 None 이면 그날의 counted 비트를 그대로 둠"""
+    index = day_of_year(day)
+    mask = 1 << (index & 7)
+    if entry is None:
+        year["rec"][index >> 3] &= ~mask
+        year["pass"][index >> 3] &= ~mask
+        year["counted"][index >> 3] &= ~mask
+        year["commits"][index] = 0
+        return
+    year["rec"][index >> 3] |= mask
+    if entry.get("passed"):
+        year["pass"][index >> 3] |= mask
+    else:
+        year["pass"][index >> 3] &= ~mask
+    if counted is not None:
+        if counted:
+            year["counted"][index >> 3] |= mask
+        else:
+            year["counted"][index >> 3] &= ~mask
+    year["commits"][index] = max(0, min(int(entry.get("commits", 0)), MAX_COMMITS))
+
+def unpack_year(year):
+    """쓰기용 bytearray 연도 묶음 (counted 비트가 없던 묶음은 추정해서 채움)"""
+    year = {"counted": year.get("counted") or guess_counted(year), **year}
+    return {k: bytearray(v) for k, v in year.items()}
+
+def history_write(doc, entries, counted=None):
+    """entries({"YYYY-MM-DD": 기록 또는 None}) 를 반영하는 update 딕셔너리. 바뀐 연도 묶음만 씀
+    counted({"YYYY-MM-DD": bool}) 로 그날을 기각 횟수에 센 날인지 표시함 (없는 날은 표시를 그대로 둠)
+
+    예전 "history" 맵이 남아 있는 문서는 이번 쓰기에서 전부 새 형식으로 옮기고 맵을 지움."""
+    from .storage import delete_field
+
+    counted = counted or {}
+    hist = doc.get("hist") or {}
+    legacy = doc.get("history")
+    if legacy:
+        packed = pack(dict(load_history(doc)))  # 같은 날이 양쪽에 있으면 새 형식이 최신 (옮기는 중 쓰인 기록)
+        for key, year in hist.items():
+            if key in packed:  # 새 형식으로 쓴 날은 추정 대신 원래 counted 비트를 씀
+                counted = year.get("counted") or guess_counted(year)
+                guessed = packed[key]["counted"]
+                packed[key]["counted"] = bytes((g & ~r | c) & 0xFF for g, r, c in zip(guessed, year["rec"], counted))
+        hist = packed
+    touched = {}
+    for date_str, entry in entries.items():
+        key = date_str[:4]
+        if key not in touched:
+            touched[key] = unpack_year(hist.get(key, empty_year()))
+        set_day(touched[key], date.fromisoformat(date_str), entry, counted.get(date_str))
+    update = {f"hist.{key}": {k: bytes(v) for k, v in year.items()} for key, year in touched.items()}
+    if legacy is not None:
+        update.update({f"hist.{key}": year for key, year in hist.items() if key not in touched})
+        update["history"] = delete_field()
+    return update
+
+def migrate_update(doc):
+    """예전 "history" 맵을 옮기는 update 딕셔너리. 옮길 것이 없으면 None"""
+    if "history" not in doc:
+        return None
+    return history_write(doc, {})
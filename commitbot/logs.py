@@ -0,0 +1,113 @@
+import contextlib
+import contextvars
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+import uuid
+from datetime import datetime, timezone
+
+from . import config
+
+# --- 로그 파이프라인 ---
+# 이벤트 루프(및 DB 스레드)에서는 레코드를 큐에 넣기만 하고, 포맷·출력은 QueueListener 스레드가 함.
+#   상관 ID   : 명령어·예약 작업마다 붙는 ID(cid). 그 안에서 찍힌 로그(GitHub/Firestore 포함)를 한 줄기로 묶어 볼 수 있음
+#   샘플링    : extra={"sample": "키"} 를 붙인 반복 성공 로그는 키마다 LOG_SAMPLE_EVERY 번에 한 번만 남김
+#   길이 제한 : 메시지가 LOG_MAX_CHARS 를 넘으면 잘라냄 (GitHub 오류 응답 본문 등)
+#   레벨      : LOG_LEVEL(전체) + LOG_LEVELS("commitbot.github=WARNING,discord=INFO" 처럼 모듈별)
+
+log_context = contextvars.ContextVar("log_context", default={})
+
+@contextlib.asynccontextmanager
+async def context(**fields):
+    """이 블록(과 그 안에서 만든 태스크, run_db 로 넘긴 DB 호출)에서 찍히는 로그에 cid 와 fields 를 붙임"""
+    token = log_context.set({"cid": uuid.uuid4().hex[:12], **fields})
+    try:
+        yield
+    finally:
+        log_context.reset(token)
+
+def truncate(text, limit=None):
+    limit = limit or config.LOG_MAX_CHARS
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}…(+{len(text) - limit}자)"
+
+class ContextFilter(logging.Filter):
+    """로그를 찍은 쪽(이벤트 루프)에서 상관 ID 를 붙이고 반복 로그를 걸러냄"""
+
+    def __init__(self, sample_every):
+        super().__init__()
+        self.sample_every = sample_every
+        self.counters = {}
+
+    def filter(self, record):
+        key = getattr(record, "sample", None)
+        if key is not None and self.sample_every > 1:
+            counter = self.counters.setdefault(key, itertools.count())
+            if next(counter) % self.sample_every:
+                return False
+            record.sampled = self.sample_every
+        record.context = log_context.get()
+        return True
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # 인자가 나중에 바뀌지 않도록 메시지만 여기서 확정하고, 예외 traceback 포맷은 출력 스레드에서 함
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": truncate(record.getMessage()),
+            **getattr(record, "context", {}),
+        }
+        if getattr(record, "sampled", None):
+            entry["sampled"] = record.sampled  # 이 한 줄이 대표하는 로그 수
+        if record.exc_info:
+            entry["exc"] = truncate(self.formatException(record.exc_info), config.LOG_MAX_CHARS * 4)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('[%(asctime)s] [%(levelname)s] %(message)s')
+
+    def formatMessage(self, record):
+        cid = getattr(record, "context", {}).get("cid")
+        record.message = truncate(record.message) + (f" (cid={cid})" if cid else "")
+        return super().formatMessage(record)
+
+def parse_levels(text):
+    """'commitbot.github=WARNING,discord=INFO' → {"commitbot.github": "WARNING", "discord": "INFO"}"""
+    levels = {}
+    for part in text.split(","):
+        if "=" in part:
+            name, level = part.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup():
+    """루트 로거를 큐 핸들러로 바꾸고 출력 스레드를 시작함. 종료 시 stop() 을 부르는 리스너를 돌려줌"""
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if config.LOG_FORMAT == "json" else TextFormatter())
+    records = queue.SimpleQueue()
+    handler = ContextQueueHandler(records)
+    handler.addFilter(ContextFilter(config.LOG_SAMPLE_EVERY))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(config.LOG_LEVEL.upper())
+    for name, level in parse_levels(config.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,64 @@
+import logging
+
+from .history import load_history, migrate_update
+from .stats import rebuild_stats
+
+logger = logging.getLogger(__name__)
+
+# --- 관리용 일괄 작업 (봇 명령어와 CLI 양쪽에서 사용, executor 스레드에서 동기로 실행) ---
+
+BATCH_LIMIT = 500  # Firestore WriteBatch 한 번에 넣을 수 있는 최대 쓰기 수
+HISTORY_FIELDS = ["hist", "history"]  # 압축 기록 + 아직 옮기지 않은 예전 맵
+
+def commit_in_batches(db, writes, op="update"):
+    """(ref, 데이터) 를 BATCH_LIMIT 개씩 묶어 커밋하고 쓴 개수를 돌려줌. op 는 update / set"""
+    batch, pending, written = db.batch(), 0, 0
+    for ref, data in writes:
+        getattr(batch, op)(ref, data)
+        pending += 1
+        if pending == BATCH_LIMIT:
+            batch.commit()
+            written += pending
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+        written += pending
+    return written
+
+def rebuild_all_stats(db, user_ids=None):
+    """history 로부터 stats 롤업을 다시 계산해 저장. user_ids 가 없으면 전체 유저"""
+    users = db.collection("users")
+    if user_ids:
+        snapshots = db.get_all([users.document(str(uid)) for uid in user_ids], field_paths=HISTORY_FIELDS)
+    else:
+        snapshots = users.select(HISTORY_FIELDS).stream()
+    writes = (
+        (snapshot.reference, {"stats": rebuild_stats(load_history(snapshot.to_dict()))})
+        for snapshot in snapshots if snapshot.exists
+    )
+    written = commit_in_batches(db, writes)
+    logger.info(f"📈 통계 롤업 재계산 완료: {written}명")
+    return written
+
+def migrate_history(db, user_ids=None):
+    """예전 history 맵을 압축 기록(hist)으로 옮김. 옮긴 유저 수를 돌려줌
+
+    봇이 켜져 있어도 되도록 유저마다 읽은 뒤 바뀌지 않았을 때만 씀."""
+    from .events import commit_guarded
+
+    users = db.collection("users")
+    if user_ids:
+        snapshots = db.get_all([users.document(str(uid)) for uid in user_ids], field_paths=HISTORY_FIELDS)
+    else:
+        snapshots = users.select(HISTORY_FIELDS).stream()
+    migrated = 0
+    for snapshot in snapshots:
+        if not snapshot.exists or "history" not in snapshot.to_dict():
+            continue
+        def build(doc):
+            update = migrate_update(doc)
+            return (update, None) if update else None
+        if commit_guarded(db, snapshot.reference, snapshot, build):
+            migrated += 1
+    logger.info(f"🗜️ 기록 압축 형식 변환 완료: {migrated}명")
+    return migrated
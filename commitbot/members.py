@@ -0,0 +1,45 @@
+import re
+from collections import OrderedDict
+
+import discord
+from discord.ext import commands
+
+from .config import MEMBER_LRU_SIZE
+
+# 멤버 캐시 없이도 명령어 인자의 멤버를 찾을 수 있도록 최근 조회한 멤버만 작은 LRU에 보관
+MEMBER_ID_PATTERN = re.compile(r"<@!?([0-9]{15,20})>$|([0-9]{15,20})$")
+member_lru = OrderedDict()  # (guild_id, user_id) -> discord.Member
+
+def remember_member(member):
+    key = (member.guild.id, member.id)
+    member_lru[key] = member
+    member_lru.move_to_end(key)
+    while len(member_lru) > MEMBER_LRU_SIZE:
+        member_lru.popitem(last=False)
+
+async def resolve_member(guild, user_id, message=None):
+    key = (guild.id, user_id)
+    if key in member_lru:
+        member_lru.move_to_end(key)
+        return member_lru[key]
+    # 1. 메시지 페이로드에 함께 온 멘션 → 2. 길드 캐시 → 3. REST 조회 순서
+    member = discord.utils.get(message.mentions, id=user_id) if message else None
+    if not isinstance(member, discord.Member):
+        member = guild.get_member(user_id)
+    if member is None:
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+    remember_member(member)
+    return member
+
+class LazyMember(commands.MemberConverter):
+    async def convert(self, ctx, argument):
+        match = MEMBER_ID_PATTERN.match(argument)
+        if not match or ctx.guild is None:
+            return await super().convert(ctx, argument)
+        member = await resolve_member(ctx.guild, int(match.group(1) or match.group(2)), ctx.message)
+        if member is None:
+            raise commands.MemberNotFound(argument)
+        return member
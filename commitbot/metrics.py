@@ -0,0 +1,112 @@
+import contextvars
+import math
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+# --- 핫패스 지연시간 계측 (히스토그램 + Prometheus 텍스트 출력) ---
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)  # 초
+RESERVOIR_SIZE = 1024  # 백분위수 계산용으로 보관하는 최근 샘플 수
+
+class Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds, error=False):
+        self.bucket_counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.errors += error
+        self.recent.append(seconds)
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# 명령어 하나가 GitHub / Firestore / Discord 를 기다린 시간 (초). 느린 명령어 추적에 사용
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+def add_wait(kind, seconds):
+    trace = current_trace.get()
+    if trace is not None:
+        trace[kind] = trace.get(kind, 0.0) + seconds
+
+# (종류, 라벨) -> Histogram. 종류: command / github / firestore / job
+histograms = {}
+gauges = {}  # 이름 -> 현재 값을 돌려주는 함수
+
+def observe(kind, label, seconds, error=False):
+    histogram = histograms.get((kind, label))
+    if histogram is None:
+        histogram = histograms[(kind, label)] = Histogram()
+    histogram.observe(seconds, error)
+    if kind in ("github", "firestore"):
+        add_wait(kind, seconds)
+
+@asynccontextmanager
+async def timed(kind, label):
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe(kind, label, time.perf_counter() - started, error)
+
+def register_gauge(name, func):
+    gauges[name] = func
+
+def github_endpoint(url):
+    """라벨 수가 폭발하지 않도록 URL의 사용자/레포 이름을 자리표시자로 바꿈"""
+    parts = urlsplit(url).path.strip("/").split("/")
+    if parts[0] == "repos" and len(parts) >= 3:
+        parts[1:3] = ["{owner}", "{repo}"]
+    elif parts[0] == "users" and len(parts) >= 2:
+        parts[1] = "{user}"
+    return "/" + "/".join(parts)
+
+def summary():
+    """(종류, 라벨, 횟수, p50, p95, p99, 오류율) 목록"""
+    rows = []
+    for (kind, label), h in sorted(histograms.items()):
+        rows.append((kind, label, h.count, h.percentile(0.5), h.percentile(0.95), h.percentile(0.99), h.errors / h.count))
+    return rows
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def render_prometheus():
+    lines = []
+    kinds = sorted({kind for kind, _ in histograms})
+    for kind in kinds:
+        name = f"commitbot_{kind}_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for (k, label), h in sorted(histograms.items()):
+            if k != kind:
+                continue
+            cumulative = 0
+            for upper, count in zip(BUCKETS, h.bucket_counts):
+                cumulative += count
+                le = "+Inf" if upper == math.inf else repr(upper)
+                lines.append(f'{name}_bucket{{name="{_escape(label)}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{name="{_escape(label)}"}} {h.total}')
+            lines.append(f'{name}_count{{name="{_escape(label)}"}} {h.count}')
+        lines.append(f"# TYPE commitbot_{kind}_errors_total counter")
+        for (k, label), h in sorted(histograms.items()):
+            if k == kind:
+                lines.append(f'commitbot_{kind}_errors_total{{name="{_escape(label)}"}} {h.errors}')
+    for name, func in sorted(gauges.items()):
+        lines.append(f"# TYPE commitbot_{name} gauge")
+        lines.append(f"commitbot_{name} {func()}")
+    return "\n".join(lines) + "\n"
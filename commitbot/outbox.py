@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import re
+from collections import deque
+from datetime import datetime
+
+import aiohttp
+import discord
+import pytz
+
+from . import storage
+from .storage import db_delete, db_set, db_stream, db_update
+
+logger = logging.getLogger(__name__)
+
+# 보고 메시지 발송 큐: 2,000자 제한에 맞춰 분할하고, 채널별 속도를 조절하며, 실패 시 재시도함
+MESSAGE_LIMIT = 2000
+SEND_BUCKET_SIZE = 5       # 채널당 SEND_BUCKET_WINDOW초 동안 보낼 수 있는 메시지 수
+SEND_BUCKET_WINDOW = 5.0
+SEND_MAX_ATTEMPTS = 6
+SEND_REQUEUE_DELAY = 60    # 재시도를 모두 실패한 보고를 다시 큐에 넣기까지 대기(초)
+LOAD_RETRY_MAX_DELAY = 60  # 시작할 때 남은 보고를 읽지 못하면 이 간격(초)까지 늘려 가며 다시 읽음
+
+def split_message(text, limit=MESSAGE_LIMIT):
+    """공백(멘션 사이, 줄바꿈) 경계에서 잘라 limit 이하 조각 목록으로 만듦"""
+    chunks, current = [], ""
+    for token in re.split(r"(\s+)", text):
+        if len(current) + len(token) <= limit:
+            current += token
+            continue
+        if current.strip():
+            chunks.append(current.rstrip())
+        current = "" if token.isspace() else token
+        while len(current) > limit:  # 공백 없이 긴 토큰은 강제로 자름
+            chunks.append(current[:limit])
+            current = current[limit:]
+    if current.strip():
+        chunks.append(current.rstrip())
+    return chunks
+
+def is_transient_send_error(error):
+    if isinstance(error, discord.HTTPException):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, discord.ConnectionClosed))
+
+class Outbox:
+    def __init__(self, bot):
+        self.bot = bot
+        self.queue = asyncio.Queue()
+        self.buckets = {}  # channel_id -> 최근 발송 시각(deque)
+        self.queued = set()  # 큐에 넣었고 아직 문서를 지우지 않은 보고 ID (load_pending 이 같은 보고를 두 번 넣지 않도록)
+        self.worker = None
+
+    def start(self):
+        if self.worker is None:
+            self.worker = asyncio.create_task(self.run())
+            self.worker.add_done_callback(self.worker_stopped)
+
+    def worker_stopped(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("❌ 보고 발송 워커가 멈췄습니다. 남은 보고는 다음 실행 때 발송됩니다.", exc_info=task.exception())
+
+    def enqueue(self, job_id, job):
+        self.queued.add(job_id)
+        self.queue.put_nowait((job_id, job))
+
+    async def announce(self, channel_id, text):
+        """보고를 먼저 Firestore 'outbox'에 저장한 뒤 큐에 넣음 (게이트웨이가 끊겨도 유실되지 않게)"""
+        ref = storage.get_db().collection("outbox").document()
+        job = {"channel_id": channel_id, "chunks": split_message(text), "sent": 0, "created_at": datetime.now(pytz.utc)}
+        await db_set(ref, job)
+        self.enqueue(ref.id, job)
+
+    async def load_pending(self):
+        pending = await db_stream(storage.get_db().collection("outbox").order_by("created_at"))
+        loaded = [snapshot for snapshot in pending if snapshot.id not in self.queued]
+        for snapshot in loaded:
+            self.enqueue(snapshot.id, snapshot.to_dict())
+        if loaded:
+            logger.info(f"📨 발송 대기 중이던 보고 {len(loaded)}건을 다시 불러왔습니다.")
+
+    async def run(self):
+        await self.bot.wait_until_ready()
+        # Firestore 가 아직 안 되면 워커가 죽지 않고 백오프하며 다시 읽음 (그동안 새 보고는 큐에 쌓임)
+        attempt = 0
+        while True:
+            try:
+                await self.load_pending()
+                break
+            except Exception as e:
+                delay = min(2 ** attempt, LOAD_RETRY_MAX_DELAY)
+                attempt += 1
+                logger.warning(f"⚠️ 발송 대기 보고를 불러오지 못해 {delay}초 후 다시 시도합니다 ({attempt}회): {e}")
+                await asyncio.sleep(delay)
+        while True:
+            job_id, job = await self.queue.get()
+            try:
+                await self.deliver(job_id, job)
+            except Exception:
+                logger.exception(f"❌ 보고 발송 중 오류 (outbox/{job_id})")
+            finally:
+                self.queue.task_done()
+
+    async def drain(self, timeout):
+        """큐가 빌 때까지 최대 timeout 초 기다린 뒤 워커를 멈춤. 다 보냈으면 True"""
+        if self.worker is None:
+            return self.queue.empty()
+        if self.worker.done():
+            return False  # 워커가 멈춰 큐를 비울 수 없음
+        done = True
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            done = False
+        self.worker.cancel()
+        return done
+
+    async def deliver(self, job_id, job):
+        ref = storage.get_db().collection("outbox").document(job_id)
+        chunks = job["chunks"]
+        while job["sent"] < len(chunks):
+            if not await self.send_with_retry(job["channel_id"], chunks[job["sent"]]):
+                # 나중에 다시 시도 (문서는 남아 있으므로 재시작해도 이어서 보냄)
+                self.bot.loop.call_later(SEND_REQUEUE_DELAY, self.enqueue, job_id, job)
+                return
+            job["sent"] += 1
+            if job["sent"] < len(chunks):
+                await db_update(ref, {"sent": job["sent"]})
+        await db_delete(ref)
+        self.queued.discard(job_id)
+
+    async def wait_for_bucket(self, channel_id):
+        bucket = self.buckets.setdefault(channel_id, deque())
+        now = self.bot.loop.time()
+        while bucket and now - bucket[0] >= SEND_BUCKET_WINDOW:
+            bucket.popleft()
+        if len(bucket) >= SEND_BUCKET_SIZE:
+            await asyncio.sleep(SEND_BUCKET_WINDOW - (now - bucket[0]))
+            bucket.popleft()
+        bucket.append(self.bot.loop.time())
+
+    async def send_with_retry(self, channel_id, content):
+        for attempt in range(SEND_MAX_ATTEMPTS):
+            await self.wait_for_bucket(channel_id)
+            try:
+                channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+                await channel.send(content)
+                return True
+            except Exception as e:
+                if not is_transient_send_error(e):
+                    logger.error(f"❌ 보고 발송 불가 (채널: {channel_id}): {e}")
+                    return True  # 재시도해도 소용없는 오류는 버림
+                delay = min(2 ** attempt, 60)
+                logger.warning(f"⚠️ 보고 발송 실패, {delay}초 후 재시도 ({attempt + 1}/{SEND_MAX_ATTEMPTS}): {e}")
+                await asyncio.sleep(delay)
+        return False
@@ -0,0 +1,105 @@
+import discord
+
+from .storage import db_stream
+
+# Firestore 커서(start_after/limit)로 필요한 페이지만 읽어오는 임베드 뷰
+PAGE_SIZE = 20
+PAGINATOR_TIMEOUT = 120  # 이 시간(초) 동안 버튼 입력이 없으면 만료
+
+class FirestorePaginator(discord.ui.View):
+    # query 는 format_line 이 쓰는 필드만 select 해서 넘김 (start_after 커서는 order_by 필드와 문서 ID 만 씀)
+    def __init__(self, author_id, query, title, color, format_line, page_size=PAGE_SIZE):
+        super().__init__(timeout=PAGINATOR_TIMEOUT)
+        self.author_id = author_id
+        self.query = query
+        self.title = title
+        self.color = color
+        self.format_line = format_line  # (순번, DocumentSnapshot) -> 한 줄 문자열
+        self.page_size = page_size
+        self.pages = []  # 이미 읽어온 페이지 캐시 (DocumentSnapshot 리스트)
+        self.has_more = True
+        self.index = 0
+        self.message = None
+        self.note = None  # 페이지 번호 옆에 붙일 안내 (스냅샷으로 답할 때 등)
+
+    async def fetch_page(self, index):
+        while len(self.pages) <= index and self.has_more:
+            query = self.query
+            if self.pages:
+                query = query.start_after(self.pages[-1][-1])
+            # 다음 페이지가 있는지 알기 위해 한 개 더 읽음
+            snapshots = await db_stream(query.limit(self.page_size + 1))
+            self.has_more = len(snapshots) > self.page_size
+            if not snapshots:
+                break
+            self.pages.append(snapshots[:self.page_size])
+        return self.pages[index] if index < len(self.pages) else None
+
+    def build_embed(self):
+        offset = self.index * self.page_size
+        lines = [self.format_line(offset + i, s) for i, s in enumerate(self.pages[self.index])]
+        embed = discord.Embed(title=self.title, description="\n".join(lines), color=self.color)
+        total = "" if self.has_more else f" / {len(self.pages)}"
+        note = f" · {self.note}" if self.note else ""
+        embed.set_footer(text=f"페이지 {self.index + 1}{total}{note}")
+        return embed
+
+    def update_buttons(self):
+        self.prev_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1 and not self.has_more
+
+    async def start(self, ctx, empty_message):
+        if await self.fetch_page(0) is None:
+            self.stop()
+            await ctx.send(empty_message)
+            return
+        self.update_buttons()
+        if self.next_page.disabled:
+            # 한 페이지로 끝나면 버튼 없이 보냄
+            self.stop()
+            await ctx.send(embed=self.build_embed())
+            return
+        self.message = await ctx.send(embed=self.build_embed(), view=self)
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("🙅 명령어를 실행한 사람만 페이지를 넘길 수 있어요.", ephemeral=True)
+            return False
+        return True
+
+    async def show(self, interaction, index):
+        await interaction.response.defer()
+        if await self.fetch_page(index) is not None:
+            self.index = index
+        self.update_buttons()
+        await interaction.edit_original_response(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="◀ 이전", style=discord.ButtonStyle.secondary)
+    async def prev_page(self, interaction, button):
+        await self.show(interaction, self.index - 1)
+
+    @discord.ui.button(label="다음 ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        await self.show(interaction, self.index + 1)
+
+    async def on_timeout(self):
+        self.pages.clear()
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+class SnapshotPaginator(FirestorePaginator):
+    """Firestore 대신 이미 가진 문서 목록(로컬 스냅샷)을 넘겨 보는 뷰"""
+
+    def __init__(self, author_id, documents, title, color, format_line, page_size=PAGE_SIZE, note=None):
+        super().__init__(author_id, None, title, color, format_line, page_size)
+        self.pages = [documents[i:i + page_size] for i in range(0, len(documents), page_size)]
+        self.has_more = False
+        self.note = note
+
+    async def fetch_page(self, index):
+        return self.pages[index] if index < len(self.pages) else None
@@ -0,0 +1,155 @@
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+
+from discord.ext import commands
+
+from .metrics import add_wait
+
+logger = logging.getLogger(__name__)
+
+# --- 운영 중 프로파일링 (이벤트 루프 샘플링 / cProfile / 느린 명령어 추적) ---
+
+MAX_PROFILE_SECONDS = 600
+SAMPLE_INTERVAL = 0.005  # 이벤트 루프 스택 샘플링 주기(초)
+PSTATS_LIMIT = 60        # cProfile 결과에서 보여줄 함수 수
+
+class TracedContext(commands.Context):
+    """ctx.send 에 걸린 시간을 Discord 대기 시간으로 기록하는 Context"""
+
+    async def send(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().send(*args, **kwargs)
+        finally:
+            add_wait("discord", time.perf_counter() - started)
+
+def format_trace(trace, elapsed):
+    waited = sum(trace.values())
+    parts = [f"{kind} {seconds:.2f}s" for kind, seconds in sorted(trace.items(), key=lambda x: -x[1])]
+    parts.append(f"기타(CPU/대기열) {max(0.0, elapsed - waited):.2f}s")
+    return ", ".join(parts)
+
+class SlowCommandReport:
+    """느린 명령어 추적을 모아 interval 초마다 한 번만 관리자 채널에 보냄 (마감 직전처럼 몰릴 때 outbox 쓰기가 폭증하지 않도록)"""
+
+    SHOW = 5  # 한 번에 자세히 보여줄 가장 느린 명령어 수
+
+    def __init__(self, outbox, channel_id, interval):
+        self.outbox = outbox
+        self.channel_id = channel_id
+        self.interval = interval
+        self.items = []  # [(걸린 시간, 명령어, 유저ID, 추적 내용)]
+        self.task = None
+
+    def add(self, name, user_id, elapsed, detail):
+        self.items.append((elapsed, name, user_id, detail))
+        if self.task is None:
+            self.task = asyncio.create_task(self.send_later())
+
+    async def send_later(self):
+        try:
+            await asyncio.sleep(self.interval)
+            items, self.items = sorted(self.items, reverse=True), []
+            lines = [f"🐢 **느린 명령어 {len(items)}건** (최근 {self.interval:.0f}초, 대기열 대기 제외 기준)"]
+            lines += [f"`!{name}` {elapsed:.2f}s (<@{user_id}>)\n{detail}" for elapsed, name, user_id, detail in items[:self.SHOW]]
+            if len(items) > self.SHOW:
+                lines.append(f"…외 {len(items) - self.SHOW}건")
+            try:
+                await self.outbox.announce(self.channel_id, "\n".join(lines))
+            except Exception as e:
+                logger.warning(f"⚠️ 느린 명령어 보고를 저장하지 못했습니다: {e}")
+        finally:
+            self.task = None
+
+class LoopSampler:
+    """별도 스레드에서 이벤트 루프 스레드의 스택을 주기적으로 떠서 접힌 스택(folded) 형식으로 모음"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="loop-sampler", daemon=True)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    async def collect(self, seconds):
+        self.thread.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.stop_event.set()
+            self.thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+class Profiler:
+    """관리자가 지정한 명령어/작업을 정해진 시간 동안 cProfile 로 감쌈"""
+
+    def __init__(self):
+        self.targets = set()
+        self.deadline = 0.0
+        self.profile = None
+        self.active = 0
+        self.calls = Counter()
+
+    def is_running(self):
+        return self.profile is not None
+
+    def start(self, targets, seconds):
+        self.targets = set(targets)
+        self.deadline = time.monotonic() + seconds
+        self.profile = cProfile.Profile()
+        self.calls.clear()
+
+    def finish(self):
+        """프로파일을 끝내고 pstats 텍스트를 돌려줌"""
+        profile, self.profile, self.targets = self.profile, None, set()
+        if self.active:
+            profile.disable()
+            self.active = 0
+        out = io.StringIO()
+        header = ", ".join(f"{name} {count}회" for name, count in self.calls.items()) or "호출 없음"
+        out.write(f"# 대상 호출: {header}\n")
+        if self.calls:
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(PSTATS_LIMIT)
+        return out.getvalue()
+
+    @asynccontextmanager
+    async def wrap(self, name):
+        # 같은 스레드에서 프로파일러는 하나만 켤 수 있으므로, 대상 호출이 겹치면 하나의 Profile 을 공유함
+        if self.profile is None or name not in self.targets or time.monotonic() > self.deadline:
+            yield
+            return
+        profile = self.profile
+        self.calls[name] += 1
+        self.active += 1
+        if self.active == 1:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if self.profile is profile:
+                self.active -= 1
+                if self.active == 0:
+                    profile.disable()
+
+profiler = Profiler()
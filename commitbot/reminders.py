@@ -0,0 +1,81 @@
+import asyncio
+import logging
+
+import discord
+
+from . import config
+from .storage import db_get_all, db_set, db_stream, delete_field, get_db, users
+
+logger = logging.getLogger(__name__)
+
+# --- 마감 전 리마인더 DM ---
+# 유저 문서를 전부 훑지 않고 작은 문서 두 개만 한 번에 읽어 "오늘 아직 통과하지 못한 유저"를 구함.
+#   meta/roster            {"users": {유저ID: 휴가 여부}}  등록·삭제·휴가·복귀 때 갱신, daily_check 가 매일 전체 목록으로 다시 씀 (어긋나도 하루 안에 맞춰짐)
+#   certified/YYYY-MM-DD   {"users": {유저ID: True}}      !인증 이 통과를 기록할 때 추가 (재시도 큐로 늦게 확인된 통과 포함)
+
+def roster_ref():
+    return get_db().collection("meta").document("roster")
+
+def certified_ref(date_str):
+    return get_db().collection("certified").document(date_str)
+
+async def update_roster(entries):
+    """entries: {유저ID: 휴가 여부 또는 None(삭제)}"""
+    users = {str(uid): delete_field() if on_vacation is None else on_vacation for uid, on_vacation in entries.items()}
+    await db_set(roster_ref(), {"users": users}, merge=True)
+
+async def write_roster(snapshots):
+    """user 문서 스냅샷 목록으로 roster 를 통째로 다시 씀"""
+    roster = {snapshot.id: snapshot.to_dict().get("on_vacation", False) for snapshot in snapshots}
+    await db_set(roster_ref(), {"users": roster})
+    return roster
+
+async def mark_certified(user_id, date_str):
+    await db_set(certified_ref(date_str), {"users": {str(user_id): True}}, merge=True)
+
+async def uncertified_users(date_str):
+    """휴가가 아니고 오늘 통과 기록이 없는 유저 ID 목록 (한 번의 배치 읽기)"""
+    refs = [roster_ref(), certified_ref(date_str)]
+    # get_all 은 넘긴 순서대로 돌려준다는 보장이 없으므로 경로로 짝을 맞춤
+    found = {snapshot.reference.path: snapshot for snapshot in await db_get_all(refs)}
+    roster_doc, certified = (found[ref.path] for ref in refs)
+    if roster_doc.exists:
+        roster = roster_doc.to_dict().get("users", {})
+    else:  # 처음 한 번만 전체 유저에서 만듦
+        roster = await write_roster(await db_stream(users().select(["on_vacation"])))
+    done = certified.to_dict().get("users", {}) if certified.exists else {}
+    return sorted(uid for uid, on_vacation in roster.items() if not on_vacation and uid not in done)
+
+def parse_times(text):
+    """'21:00,23:00' → {(21, 0), (23, 0)}"""
+    times = set()
+    for part in text.split(","):
+        if part.strip():
+            hour, minute = part.strip().split(":")
+            times.add((int(hour), int(minute)))
+    return times
+
+async def send_dm(bot, user_id, text):
+    try:
+        user = bot.get_user(int(user_id)) or await bot.fetch_user(int(user_id))
+        await user.send(text)
+        return True
+    except discord.Forbidden:
+        return False  # DM 을 막아 둔 유저
+    except discord.HTTPException as e:
+        logger.warning(f"⚠️ 리마인더 DM 실패 (<@{user_id}>): {e}")
+        return False
+
+async def send_reminders(bot, now):
+    date_str = now.strftime("%Y-%m-%d")
+    targets = await uncertified_users(date_str)
+    text = f"⏰ 아직 오늘({date_str}) 통과 기록이 없어요! 23:59 마감 전에 커밋하고 `!인증` 해주세요 ☕"
+    sent = 0
+    # 디스코드 rate limit 에 걸리지 않도록 나눠서 보냄
+    for start in range(0, len(targets), config.REMINDER_BATCH_SIZE):
+        if start:
+            await asyncio.sleep(config.REMINDER_BATCH_SECONDS)
+        batch = targets[start:start + config.REMINDER_BATCH_SIZE]
+        sent += sum(await asyncio.gather(*(send_dm(bot, uid, text) for uid in batch)))
+    logger.info(f"⏰ {now:%H:%M} 리마인더 DM: 대상 {len(targets)}명, 발송 {sent}명")
+    return sent
@@ -0,0 +1,182 @@
+import logging
+from datetime import datetime, time, timedelta
+
+import pytz
+
+from . import config, schedule
+from .clock import clock
+from .config import KST
+from .events import fail_write, new_event, record_guarded
+from .github import count_today_commits
+from .history import load_history
+from .reminders import mark_certified
+from .stats import history_update
+from .storage import db_delete, db_get, db_set, db_stream, db_update, field_filter, get_db, user_ref
+
+logger = logging.getLogger(__name__)
+
+# --- GitHub 조회 실패 재시도 큐 (Firestore "github_retry") ---
+# !인증 중 GitHub 조회가 실패하면 0커밋 기각으로 기록하지 않고 여기 넣어 둔 뒤, 백오프로 다시 조회해 결과를 기록함.
+# 문서 ID = "{유저ID}-{YYYY-MM-DD}" (같은 날 여러 번 실패해도 한 건)
+# {"user_id", "date", "channel_id", "attempts", "next_at", "state": "pending" | "dead", "created_at"}
+# daily_check 는 마감 직전에 그날 대기 중인 건을 먼저 처리하고, 그래도 남은 유저는 기각하지 않음.
+# 재시도를 모두 실패한 건은 "dead" 로 남기고 관리자 채널에 알림 (다시 !인증 하거나 관리자가 판단).
+# 그날 일일 체크(23:59)가 끝난 뒤에 실패로 확인되거나 dead 가 된 건은 일일 체크가 건너뛴 몫을 대신 처리함:
+# 기록이 없으면 기각으로 세고(fail 이벤트), 통과 기록이 없으면 보고 채널에 기각을 알림.
+
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 30 * 60
+RETRY_MAX_ATTEMPTS = 10
+
+# 대기 중인 건이 없으면 매분 Firestore 를 조회하지 않음
+known_pending = None  # 마지막 조회 후 남은 건 수 (None = 아직 모름, 시작 직후 한 번은 조회)
+enqueued = 0  # 그 조회 이후 새로 넣은 건 수
+
+def pending_count():
+    return (known_pending or 0) + enqueued
+
+def retry_queue():
+    return get_db().collection("github_retry")
+
+def retry_ref(user_id, date_str):
+    return retry_queue().document(f"{user_id}-{date_str}")
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** attempts, RETRY_MAX_SECONDS))
+
+judged_through = None  # 이 프로세스에서 일일 체크를 마친 마지막 날짜 ("YYYY-MM-DD")
+
+def mark_judged(date_str):
+    """일일 체크가 date_str 의 판정을 마쳤음을 기록 (그 뒤로 그날 건은 늦게 확인된 건으로 처리)"""
+    global judged_through
+    judged_through = max(judged_through or date_str, date_str)
+
+def judged(date_str, now):
+    """그날 일일 체크가 끝났는지. 23:59 에 재시도 작업이 일일 체크보다 먼저 돌아도 오늘 건을 늦은 건으로 보지 않음.
+    장애로 일일 체크가 밀렸으면 자정이 지나도 따라잡기 전까지는 늦은 건이 아님 (meta/jobs 기록).
+    (재시작 직후 등) 기록을 아직 못 읽었으면 날짜가 지났는지로 판단"""
+    if judged_through is not None and date_str <= judged_through:
+        return True
+    if schedule.last_done is not None and "daily_check" in schedule.last_done:
+        return date_str <= schedule.last_done["daily_check"]
+    return now.strftime("%Y-%m-%d") > date_str
+
+def day_end(date_str):
+    """지난 날짜를 다시 셀 때 기준 시각 (그날 23:59:59 KST)"""
+    return KST.localize(datetime.combine(datetime.strptime(date_str, "%Y-%m-%d").date(), time(23, 59, 59)))
+
+async def enqueue(user_id, date_str, channel_id, since=None):
+    """since: 처음 확인에 실패한 시각 (기본값은 지금). 백오프는 이 시각부터 셈"""
+    global enqueued
+    now = (since or clock.now()).astimezone(pytz.utc)
+    await db_set(retry_ref(user_id, date_str), {
+        "user_id": str(user_id), "date": date_str, "channel_id": channel_id, "attempts": 0,
+        "next_at": now + retry_delay(0), "state": "pending", "created_at": now,
+    })
+    enqueued += 1
+    logger.warning(f"⏳ <@{user_id}> {date_str} 인증 확인을 재시도 큐에 넣었습니다.")
+
+async def pending_jobs():
+    return await db_stream(retry_queue().where(filter=field_filter("state", "==", "pending")))
+
+async def fail_late(bot, ref, user_doc, job, commits=None, sync=None):
+    """일일 체크가 지난 날의 건을 그날 규칙대로 처리함. 통과 기록이 없어 기각이면 True
+    기록이 없으면 기각으로 세고, 실패한 !인증 기록이 있으면 (확인한 커밋 수가 있을 때) 기록만 고침"""
+    user_id, date_str = job["user_id"], job["date"]
+    failed = False
+
+    def build(current):
+        nonlocal failed
+        entry = load_history(current).get(date_str)
+        failed = not current.get("on_vacation", False) and not (entry and entry.get("passed"))
+        if not failed:
+            return None  # 그 사이 휴가로 바뀌었거나, 다시 !인증 해서 이미 통과
+        if entry is None:
+            return fail_write(current, date_str)
+        if commits is None:
+            return None
+        update = history_update(current, date_str, commits, False)
+        if sync is not None:
+            update["commit_sync"] = sync
+        return update, new_event("certify", date=date_str, commits=commits, passed=False)
+
+    await record_guarded(ref, user_doc, build)
+    if failed:
+        logger.info(f"-> <@{user_id}> {date_str} 확인 대기 건이 일일 체크 뒤에 기각 처리됩니다.")
+        await bot.outbox.announce(config.REPORT_CHANNEL_ID, f"📢 **[{date_str}] 추가 기각:** <@{user_id}> (마감 뒤 GitHub 확인으로 판정)")
+    return failed
+
+async def resolve(bot, snapshot, now, late=False):
+    """대기 중인 건을 한 번 다시 조회함. "done"(기록했거나 볼 필요 없음) / "pending" / "dead" 를 돌려줌
+    late 면 그날 일일 체크가 이미 지나 이 유저를 건너뛴 것이므로, 통과가 아니면 기각 규칙을 적용함"""
+    job = snapshot.to_dict()
+    user_id, date_str = job["user_id"], job["date"]
+    ref = user_ref(user_id)
+    user_doc = await db_get(ref)
+    if not user_doc.exists or user_doc.to_dict().get("on_vacation", False):
+        await db_delete(snapshot.reference)
+        return "done"
+
+    user_data = user_doc.to_dict()
+    when = now if now.strftime("%Y-%m-%d") == date_str else day_end(date_str)
+    commits, sync = await count_today_commits(bot.http_session, user_data, when)
+    if commits is None:
+        attempts = job["attempts"] + 1
+        if attempts >= RETRY_MAX_ATTEMPTS:
+            await db_update(snapshot.reference, {"attempts": attempts, "state": "dead"})
+            logger.error(f"💀 <@{user_id}> {date_str} 인증 확인 재시도 {attempts}회 모두 실패")
+            await bot.outbox.announce(job["channel_id"], f"⚠️ <@{user_id}> GitHub 확인이 계속 실패해 {date_str} 인증을 기록하지 못했습니다. 잠시 뒤 `!인증` 을 다시 해주세요.")
+            await bot.outbox.announce(config.ADMIN_CHANNEL_ID, f"💀 **인증 재시도 실패** <@{user_id}> {date_str} ({attempts}회) → `github_retry/{snapshot.id}`")
+            if late:
+                await fail_late(bot, ref, user_doc, job)
+            return "dead"
+        await db_update(snapshot.reference, {"attempts": attempts, "next_at": now.astimezone(pytz.utc) + retry_delay(attempts)})
+        return "pending"
+
+    goal = user_data.get("goal_per_day", 1)
+    passed = commits >= goal
+    if late and not passed:
+        failed = await fail_late(bot, ref, user_doc, job, commits, sync)
+        await db_delete(snapshot.reference)
+        if failed:
+            await bot.outbox.announce(job["channel_id"], f"<@{user_id}> {date_str} 인증 결과: **❌ 커피 한 잔 할래요옹~ 😢** (커밋 {commits} / 목표 {goal})")
+        return "done"
+
+    def build(current):
+        entry = load_history(current).get(date_str)
+        if current.get("on_vacation", False) or (entry and entry.get("passed")):
+            return None  # 그 사이 휴가로 바뀌었거나, 다시 !인증 해서 이미 통과
+        update = history_update(current, date_str, commits, passed)
+        if sync is not None:
+            update["commit_sync"] = sync
+        return update, new_event("certify", date=date_str, commits=commits, passed=passed)
+
+    written = await record_guarded(ref, user_doc, build)
+    if written is not None and passed:
+        await mark_certified(user_id, date_str)
+    await db_delete(snapshot.reference)
+    if written is not None:
+        result = "✅ 통과! 🎉" if passed else "❌ 커피 한 잔 할래요옹~ 😢"
+        await bot.outbox.announce(job["channel_id"], f"<@{user_id}> {date_str} 인증 결과: **{result}** (커밋 {commits} / 목표 {goal})")
+    return "done"
+
+async def process_due(bot, now, date_str=None):
+    """다시 조회할 때가 된 건을 처리함. date_str 를 주면 그날 건은 백오프와 상관없이 처리.
+    처리 후에도 date_str 날짜로 대기 중인 유저 ID 집합을 돌려줌 (dead 가 된 건은 평소처럼 기각 대상)"""
+    global known_pending, enqueued
+    still_pending, remaining = set(), 0
+    if pending_count() == 0 and known_pending is not None:
+        return still_pending
+    enqueued = 0
+    for snapshot in await pending_jobs():
+        job = snapshot.to_dict()
+        due = job["next_at"] <= now or job["date"] == date_str
+        # 일일 체크가 직접 부른 그날 건은 일일 체크가 이어서 판정함
+        late = job["date"] != date_str and judged(job["date"], now)
+        if due and await resolve(bot, snapshot, now, late) != "pending":
+            continue
+        remaining += 1
+        if job["date"] == date_str:
+            still_pending.add(job["user_id"])
+    known_pending = remaining
+    return still_pending
@@ -0,0 +1,52 @@
+from datetime import datetime, time, timedelta
+
+from .config import KST
+from .storage import db_get, db_set, get_db
+
+# --- 놓친 예약 작업 따라잡기 (Firestore "meta/jobs") ---
+# {"daily_check": "YYYY-MM-DD", "weekly_reset": "YYYY-MM-DD"}  작업을 마친 마지막 기준 날짜
+# 일일 체크(평일 23:59)와 주간 초기화(목요일 0:00)는 그 1분에만 돌므로, 그때 Firestore 장애 등으로 실패하면
+# 복구된 뒤 첫 주기에 원래 기준 시각으로 다시 실행함. 가장 최근 기준 시각 한 번만 따라잡음 (며칠 꺼져 있었으면 그 사이는 건너뜀)
+
+DAILY_CHECK_TIME = time(23, 59)
+RESET_WEEKDAY = 3  # 목요일
+ON_TIME = timedelta(minutes=1)
+
+last_done = None  # meta/jobs 사본 (처음 필요할 때 한 번 읽음)
+
+def jobs_ref():
+    return get_db().collection("meta").document("jobs")
+
+def daily_deadline(now):
+    """now 이전(포함)의 가장 최근 일일 체크 시각 (평일 23:59)"""
+    day = now.date() if now.time() >= DAILY_CHECK_TIME else now.date() - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return KST.localize(datetime.combine(day, DAILY_CHECK_TIME))
+
+def reset_time(now):
+    """now 이전(포함)의 가장 최근 주간 초기화 시각 (목요일 0:00)"""
+    day = now.date() - timedelta(days=(now.weekday() - RESET_WEEKDAY) % 7)
+    return KST.localize(datetime.combine(day, time(0, 0)))
+
+async def load():
+    global last_done
+    if last_done is None:
+        doc = await db_get(jobs_ref())
+        last_done = doc.to_dict() if doc.exists else {}
+    return last_done
+
+async def missed(job, when, now):
+    """기준 시각 when 의 job 을 아직 마치지 않았는지.
+    기록이 없으면(처음 실행) 제시간(when 부터 1분 안)일 때만 실행하고, 지난 기준 시각은 이미 처리한 것으로 봄"""
+    done = await load()
+    date_str = when.strftime("%Y-%m-%d")
+    if job not in done:
+        done[job] = "" if now - when < ON_TIME else date_str
+    return done[job] < date_str
+
+async def mark_done(job, when):
+    date_str = when.strftime("%Y-%m-%d")
+    done = await load()
+    done[job] = max(done.get(job, ""), date_str)
+    await db_set(jobs_ref(), {job: done[job]}, merge=True)
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from . import config, retry, storage
+from .clock import clock
+from .events import new_event, record_guarded
+from .history import load_history
+from .maintenance import HISTORY_FIELDS
+from .reminders import mark_certified
+from .stats import history_update
+from .storage import db_get, db_probe, db_stream, user_ref, users
+
+logger = logging.getLogger(__name__)
+
+# --- 로컬 스냅샷 (SNAPSHOT_DIR/snapshot.json) ---
+# {"saved_at": 저장 시각(KST ISO), "users": {유저ID: {SNAPSHOT_FIELDS..., "history": 최근 SNAPSHOT_HISTORY_DAYS일 기록}}}
+# 시작할 때 Firestore 보다 먼저 읽어 두고, SNAPSHOT_MINUTES 마다 전체 유저를 다시 읽어 저장함.
+# Firestore 클라이언트를 아직 만드는 중이거나 장애 중이면 !체크 / !유저목록 / !커피왕 은 이 사본으로 답하고
+# "최신이 아닐 수 있음" 을 함께 표시함.
+#
+# --- 장애 중 쓰기 대기열 (SNAPSHOT_DIR/pending_writes.json) ---
+# Firestore 에 쓸 수 없을 때 나온 !인증 결과를 [{"user_id", "date", "channel_id", "commits", "passed", "at"}] 로 보관했다가
+# 복구되면 순서대로 기록함. commits 가 None 이면 GitHub 도 확인하지 못한 건이라 재시도 큐(retry.py)로 넘김.
+# 장애가 아닌 이유로 FLUSH_MAX_ATTEMPTS 번 실패한 건은 SNAPSHOT_DIR/failed_writes.json 으로 옮겨 두고 다음 건으로 넘어감
+# (한 건 때문에 뒤의 기록과 !인증 이 계속 막히지 않게). 옮긴 건은 관리자가 보고 판단함.
+
+PROBE_SECONDS = 5  # 장애 중 복구 확인 읽기의 타임아웃
+FLUSH_MAX_ATTEMPTS = 3
+SNAPSHOT_FIELDS = ["github_id", "repo_name", "goal_per_day", "count_mode", "on_vacation", "weekly_fail", "total_fail", "commit_sync"]
+
+cached_users = {}  # 유저ID(str) -> 스냅샷에 담긴 user 문서
+saved_at = None  # 지금 들고 있는 스냅샷을 만든 시각 (None = 스냅샷 없음)
+pending = []  # 아직 Firestore 에 기록하지 못한 !인증 결과 (오래된 순)
+flush_lock = asyncio.Lock()
+
+def snapshot_path():
+    return os.path.join(config.SNAPSHOT_DIR, "snapshot.json")
+
+def pending_path():
+    return os.path.join(config.SNAPSHOT_DIR, "pending_writes.json")
+
+def failed_path():
+    return os.path.join(config.SNAPSHOT_DIR, "failed_writes.json")
+
+def write_json(path, data):
+    # 쓰는 도중 죽어도 이전 파일이 남도록 임시 파일에 쓴 뒤 바꿔치기
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp = f"{path}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+    os.replace(temp, path)
+
+def read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning(f"⚠️ {path} 파일이 손상되어 무시합니다: {e}")
+        return None
+
+class CachedDocument:
+    """스냅샷에 담긴 user 문서 (DocumentSnapshot 처럼 id / exists / to_dict / get 을 제공)"""
+
+    def __init__(self, user_id, data):
+        self.id = str(user_id)
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return self._data
+
+    def get(self, field, default=None):
+        return self._data.get(field, default)
+
+def compact(doc, today):
+    """user 문서에서 스냅샷에 담을 필드와 최근 기록만 남김 (압축 기록은 일반 history 맵으로 풀어 둠)"""
+    data = {field: doc[field] for field in SNAPSHOT_FIELDS if field in doc}
+    history = load_history(doc)
+    recent = {}
+    for days_ago in range(config.SNAPSHOT_HISTORY_DAYS):
+        date_str = (today - timedelta(days=days_ago)).isoformat()
+        entry = history.get(date_str)
+        if entry is not None:
+            recent[date_str] = {"commits": entry["commits"], "passed": entry["passed"]}
+    data["history"] = recent
+    return data
+
+def load():
+    """저장해 둔 스냅샷과 쓰기 대기열을 읽음. 시작할 때 Firestore 에 닿기 전에 executor 에서 부름"""
+    global cached_users, saved_at, pending
+    data = read_json(snapshot_path())
+    if data is not None:
+        cached_users, saved_at = data["users"], datetime.fromisoformat(data["saved_at"])
+        logger.info(f"💾 로컬 스냅샷을 불러왔습니다: 유저 {len(cached_users)}명, {saved_at:%m/%d %H:%M} 기준")
+    pending = read_json(pending_path()) or []
+    if pending:
+        logger.warning(f"💾 Firestore 에 기록하지 못한 인증 결과 {len(pending)}건이 남아 있습니다.")
+
+async def refresh(now):
+    """전체 유저를 읽어 스냅샷을 새로 저장함"""
+    global cached_users, saved_at
+    snapshots = await db_stream(users().select(SNAPSHOT_FIELDS + HISTORY_FIELDS))
+    fresh = {snapshot.id: compact(snapshot.to_dict(), now.date()) for snapshot in snapshots}
+    data = {"saved_at": now.isoformat(), "users": fresh}
+    await asyncio.get_running_loop().run_in_executor(None, write_json, snapshot_path(), data)
+    cached_users, saved_at = fresh, now
+
+def due(now):
+    return saved_at is None or now - saved_at >= timedelta(minutes=config.SNAPSHOT_MINUTES)
+
+def needs_sync(now):
+    if not storage.initialized():
+        return False  # 클라이언트를 만드는 중 (이벤트 루프에서 get_db() 를 부르지 않음)
+    return storage.outage_since is not None or bool(pending) or due(now)
+
+async def sync(now):
+    """장애 중이면 복구됐는지 확인하고, 복구됐으면 쓰기 대기열을 비운 뒤 때가 되면 스냅샷을 새로 저장함"""
+    try:
+        if storage.outage_since is not None:
+            await db_probe(PROBE_SECONDS)
+        await flush()
+        if due(now):
+            await refresh(now)
+    except Exception as e:
+        if not storage.is_unavailable(e):
+            raise
+        # 아직 장애 중 (다음 주기에 다시 확인)
+
+# --- 스냅샷으로 읽기 ---
+
+def serving(warm_start=True):
+    """Firestore 대신 스냅샷으로 답할지. warm_start 면 클라이언트를 아직 만드는 중일 때도 스냅샷을 씀"""
+    if saved_at is None:
+        return False
+    if storage.outage_since is not None:
+        return True
+    return warm_start and not storage.ready()
+
+def can_fall_back(error):
+    """Firestore 호출이 error 로 실패했을 때 스냅샷으로 대신 답할 수 있는지"""
+    return saved_at is not None and storage.is_unavailable(error)
+
+def stale_note():
+    return f"⚠️ {saved_at:%m/%d %H:%M} 기준 저장본이라 최신이 아닐 수 있어요. (DB 연결 대기 중)"
+
+async def read_user(user_id, field_paths=None, warm_start=True):
+    """(user 문서, 스냅샷 사본인지). Firestore 에서 읽을 수 없으면 스냅샷 사본을 돌려줌"""
+    if not serving(warm_start):
+        try:
+            return await db_get(user_ref(user_id), field_paths), False
+        except Exception as e:
+            if not can_fall_back(e):
+                raise
+    return CachedDocument(user_id, cached_users.get(str(user_id))), True
+
+def documents():
+    """스냅샷의 user 문서 전체 (Firestore 처럼 문서 ID 순)"""
+    return [CachedDocument(user_id, data) for user_id, data in sorted(cached_users.items())]
+
+# --- 장애 중 쓰기 대기열 ---
+
+def save_pending():
+    # 장애 중에만 몇 건씩 생기는 작은 파일이라 순서가 뒤바뀌지 않도록 이벤트 루프에서 바로 씀
+    write_json(pending_path(), pending)
+
+def queue_certify(user_id, date_str, channel_id, commits, passed):
+    pending.append({"user_id": str(user_id), "date": date_str, "channel_id": channel_id,
+                    "commits": commits, "passed": passed, "at": clock.now().isoformat()})
+    save_pending()
+    logger.warning(f"💾 Firestore 장애로 <@{user_id}> {date_str} 인증 결과를 쓰기 대기열에 넣었습니다. (대기 {len(pending)}건)")
+
+def has_pending(user_id):
+    """이 유저의 결과가 쓰기 대기열에 남아 있는지 (새 결과도 그 뒤에 써야 순서가 맞음)"""
+    return any(write["user_id"] == str(user_id) for write in pending)
+
+async def apply_certify(write):
+    user_id, date_str, commits, passed = write["user_id"], write["date"], write["commits"], write["passed"]
+    ref = user_ref(user_id)
+    user_doc = await db_get(ref)
+    if not user_doc.exists:
+        return
+
+    def build(current):
+        if current.get("on_vacation", False):
+            return None  # 장애 중에 휴가로 바뀜
+        return history_update(current, date_str, commits, passed), new_event("certify", date=date_str, commits=commits, passed=passed)
+
+    if await record_guarded(ref, user_doc, build) is not None and passed:
+        await mark_certified(user_id, date_str)
+
+def set_aside(write, error):
+    failed = read_json(failed_path()) or []
+    failed.append({**write, "error": f"{type(error).__name__}: {error}"[:500]})
+    write_json(failed_path(), failed)
+    logger.error(f"💾 <@{write['user_id']}> {write['date']} 인증 결과를 {write['attempts']}번 기록하지 못해 {failed_path()} 로 옮겼습니다: {error!r}")
+
+async def flush():
+    """쌓인 !인증 결과를 순서대로 Firestore 에 기록함. 도중에 다시 실패하면 남은 건은 다음에 이어서 씀"""
+    async with flush_lock:
+        if not pending:
+            return
+        count = len(pending)
+        while pending:
+            write = pending[0]
+            try:
+                if write["commits"] is None:
+                    await retry.enqueue(write["user_id"], write["date"], write["channel_id"], since=datetime.fromisoformat(write["at"]))
+                else:
+                    await apply_certify(write)
+            except Exception as e:
+                if storage.is_unavailable(e):
+                    raise
+                write["attempts"] = write.get("attempts", 0) + 1
+                if write["attempts"] < FLUSH_MAX_ATTEMPTS:
+                    save_pending()
+                    raise
+                set_aside(write, e)
+                count -= 1
+            pending.pop(0)
+            save_pending()
+        logger.info(f"💾 쓰기 대기열에 있던 인증 결과 {count}건을 기록했습니다.")
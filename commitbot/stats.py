@@ -0,0 +1,64 @@
+import copy
+
+from .history import history_write, load_history
+
+# --- 유저별 통계 롤업 (연속 통과, 최장 연속, 월별 통과/실패 수) ---
+# history 에 하루치 기록이 써질 때마다 함께 갱신해서, 통계 조회 때 history 전체를 훑지 않게 함.
+# 연속 통과(streak)는 "기록된 날" 기준으로 셈. 휴가처럼 기록이 없는 날은 끊지 않음.
+#
+# stats = {
+#     "current_streak": 3, "longest_streak": 10,
+#     "last_date": "2025-06-12", "streak_before_last": 2, "longest_before_last": 10,
+#     "monthly": {"2025-06": {"passed": 8, "failed": 1}},
+# }
+
+def empty_stats():
+    return {
+        "current_streak": 0, "longest_streak": 0,
+        "last_date": None, "streak_before_last": 0, "longest_before_last": 0,
+        "monthly": {},
+    }
+
+def apply_entry(stats, date_str, passed, previous=None):
+    """하루치 기록을 반영한 새 stats 를 돌려줌. 마지막 기록보다 과거 날짜를 고친 경우에는 None (전체 재계산 필요)"""
+    stats = copy.deepcopy(stats) if stats else empty_stats()
+    last_date = stats["last_date"]
+    if last_date is None or date_str > last_date:
+        stats["streak_before_last"] = stats["current_streak"]
+        stats["longest_before_last"] = stats["longest_streak"]
+    elif date_str < last_date:
+        return None
+    # date_str == last_date 이면 같은 날 재인증 → 그날 반영 전 값에서 다시 계산
+
+    month = stats["monthly"].setdefault(date_str[:7], {"passed": 0, "failed": 0})
+    if previous is not None:
+        month["passed" if previous.get("passed") else "failed"] -= 1
+    month["passed" if passed else "failed"] += 1
+
+    stats["current_streak"] = stats["streak_before_last"] + 1 if passed else 0
+    stats["longest_streak"] = max(stats["longest_before_last"], stats["current_streak"])
+    stats["last_date"] = date_str
+    return stats
+
+def rebuild_stats(history):
+    """history 전체로부터 stats 를 다시 계산"""
+    stats = empty_stats()
+    for date_str in sorted(history):
+        stats = apply_entry(stats, date_str, bool(history[date_str].get("passed")))
+    return stats
+
+def history_update(user_data, date_str, commits, passed, counted=None):
+    """하루치 기록과 stats 롤업을 한 번에 쓰기 위한 update 딕셔너리. counted 는 history_write 참고"""
+    history = load_history(user_data)
+    entry = {"commits": commits, "passed": passed}
+    stats = None
+    if "stats" in user_data:
+        stats = apply_entry(user_data["stats"], date_str, passed, history.get(date_str))
+    if stats is None:
+        stats = rebuild_stats({**history, date_str: entry})
+    counted = None if counted is None else {date_str: counted}
+    return {**history_write(user_data, {date_str: entry}, counted), "stats": stats}
+
+def pass_rate(month):
+    total = month["passed"] + month["failed"]
+    return month["passed"] / total if total else None
@@ -0,0 +1,115 @@
+import asyncio
+import base64
+import contextvars
+import json
+import logging
+import threading
+import time
+
+from . import config, metrics
+
+logger = logging.getLogger(__name__)
+
+# --- Firestore 클라이언트 (첫 사용 시 생성) ---
+# firebase_admin / grpc / google-cloud 는 import 비용이 커서 디스코드 접속 전에 불러오지 않음
+
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                import firebase_admin
+                from firebase_admin import credentials, firestore
+                cred_dict = json.loads(base64.b64decode(config.FIREBASE_KEY_BASE64).decode("utf-8"))
+                firebase_admin.initialize_app(credentials.Certificate(cred_dict))
+                _db = firestore.client()
+                logger.info("🔥 Firestore 클라이언트 초기화 완료")
+    return _db
+
+async def warm_up():
+    """이벤트 루프를 막지 않도록 executor에서 Firestore 클라이언트를 미리 만들어 둠"""
+    await asyncio.get_running_loop().run_in_executor(None, get_db)
+
+def users():
+    return get_db().collection("users")
+
+def user_ref(user_id):
+    return users().document(str(user_id))
+
+def increment(amount):
+    from google.cloud.firestore import Increment
+    return Increment(amount)
+
+def delete_field():
+    from google.cloud.firestore import DELETE_FIELD
+    return DELETE_FIELD
+
+def field_filter(field, op, value):
+    from google.cloud.firestore import FieldFilter
+    return FieldFilter(field, op, value)
+
+DESCENDING = "DESCENDING"
+
+# --- Firestore 장애 감지 ---
+# 연결 오류(UNAVAILABLE, 타임아웃 등)가 나면 outage_since 를 기록하고, 다음에 성공한 호출이 지움.
+# 장애 중에는 읽기 전용 명령어가 Firestore 를 기다리지 않고 로컬 스냅샷(snapshot.py)으로 답함.
+
+outage_since = None  # 장애를 처음 감지한 시각 (time.time(), None = 정상)
+
+def is_unavailable(error):
+    """Firestore 에 닿지 못해 난 오류인지 (권한·조건 불일치 같은 요청 오류는 제외)"""
+    from google.api_core import exceptions
+    from google.auth.exceptions import TransportError
+    return isinstance(error, (exceptions.ServiceUnavailable, exceptions.DeadlineExceeded, exceptions.RetryError, TransportError))
+
+def initialized():
+    return _db is not None
+
+def ready():
+    """클라이언트를 만들었고 장애가 감지되지 않은 상태"""
+    return initialized() and outage_since is None
+
+# --- 비동기 도우미 함수 (I/O 작업을 멈추지 않게 함) ---
+
+async def run_db(func, *args):
+    global outage_since
+    # executor 스레드에서도 같은 로그 상관 ID 가 붙도록 contextvars 를 넘김
+    context = contextvars.copy_context()
+    try:
+        async with metrics.timed("firestore", func.__name__.lstrip("_")):
+            result = await asyncio.get_running_loop().run_in_executor(None, context.run, func, *args)
+    except Exception as e:
+        if outage_since is None and is_unavailable(e):
+            outage_since = time.time()
+            logger.error(f"🔌 Firestore 연결 장애 감지: {type(e).__name__}: {e}")
+        raise
+    if outage_since is not None:
+        logger.info(f"🔌 Firestore 연결 복구 ({time.time() - outage_since:.0f}초 만)")
+        outage_since = None
+    return result
+
+def _db_get(ref, field_paths=None): return ref.get(field_paths=field_paths)
+async def db_get(ref, field_paths=None): return await run_db(_db_get, ref, field_paths)
+
+def _db_set(ref, data, merge=False): ref.set(data, merge=merge)
+async def db_set(ref, data, merge=False): await run_db(_db_set, ref, data, merge)
+
+def _db_update(ref, data): ref.update(data)
+async def db_update(ref, data): await run_db(_db_update, ref, data)
+
+def _db_delete(ref): ref.delete()
+async def db_delete(ref): await run_db(_db_delete, ref)
+
+def _db_get_all(refs, field_paths=None): return list(get_db().get_all(refs, field_paths=field_paths))
+async def db_get_all(refs, field_paths=None): return await run_db(_db_get_all, refs, field_paths)
+
+def _db_stream(collection_ref): return list(collection_ref.stream())
+async def db_stream(collection_ref): return await run_db(_db_stream, collection_ref)
+
+def _db_probe(query, timeout): return list(query.stream(timeout=timeout))
+async def db_probe(timeout):
+    """문서 하나를 읽어 Firestore 에 닿는지 확인 (executor 스레드가 오래 붙잡히지 않도록 RPC 타임아웃을 줌)"""
+    await run_db(_db_probe, users().limit(1), timeout)
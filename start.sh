@@ -2,9 +2,7 @@
 set -e
 echo "▶️ start.sh 시작됨"
 
-echo "▶️ ping_server.py 실행 중..."
-python3 ping_server.py &
-
+# 헬스체크(/healthz, /readyz)는 봇 프로세스 안에서 HEALTH_PORT(기본 8080)로 함께 뜸
 echo "▶️ main.py 실행 시작"
 python3 main.py
 